@@ -0,0 +1,156 @@
+"""Verificacion de tokens contra la tabla de sesiones (usuarios_sessions).
+
+La tabla vive en otra base (la del backend de usuarios), por eso se usa un
+engine propio con un pool chico, separado del pool del catalogo.
+
+Para soportar carga, las consultas pasan por SessionLookupBatcher:
+- single-flight: requests concurrentes con el mismo token esperan la misma consulta
+- micro-batching: tokens distintos que llegan dentro de la misma ventana se
+  resuelven juntos con un unico WHERE token IN (...)
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Optional, Sequence
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, create_engine, select
+
+from app.config.config import config
+from app.api.v1.schemas.generic import TokenInfo
+
+logger = logging.getLogger(__name__)
+
+TokenKey = tuple[str, str]
+
+metadata = MetaData()
+
+usuarios_sessions = Table(
+    config.SESSIONS_TABLE,
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("token", String(255), index=True, nullable=False),
+    Column("client_key", String(255), nullable=False),
+    Column("usuario_id", Integer, nullable=False),
+    Column("usuario_email", String(255), nullable=False),
+    Column("expires_at", DateTime, nullable=True),
+)
+
+
+class SessionStore:
+    def __init__(self, database_url: str, pool_size: int = 3):
+        options = {"pool_pre_ping": True}
+        if not database_url.startswith("sqlite"):
+            options.update(pool_size=pool_size, max_overflow=0, pool_recycle=3600, pool_timeout=5)
+        self.engine = create_engine(database_url, **options)
+
+    def lookup_many(self, keys: Sequence[TokenKey]) -> dict[TokenKey, TokenInfo]:
+        """Busca todos los tokens en una sola consulta y devuelve solo los
+        vigentes que coinciden con su client key."""
+        wanted = set(keys)
+        tokens = {token for token, _ in wanted}
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        stmt = (
+            select(
+                usuarios_sessions.c.token,
+                usuarios_sessions.c.client_key,
+                usuarios_sessions.c.usuario_id,
+                usuarios_sessions.c.usuario_email,
+                usuarios_sessions.c.expires_at,
+            )
+            .where(usuarios_sessions.c.token.in_(tokens))
+        )
+        found: dict[TokenKey, TokenInfo] = {}
+        with self.engine.connect() as connection:
+            for token, client_key, usuario_id, email, expires_at in connection.execute(stmt):
+                if (token, client_key) not in wanted:
+                    continue
+                if expires_at is not None and expires_at <= now:
+                    continue
+                found[(token, client_key)] = {"time": time.time(), "id": usuario_id, "email": email}
+        return found
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+class SessionLookupBatcher:
+    """Agrupa las busquedas de tokens de varios hilos en una sola consulta.
+
+    El primer hilo que encuentra el lote vacio queda como lider: espera la
+    ventana (o a que el lote se llene), ejecuta la consulta y resuelve los
+    futures de todos. Los demas hilos solo esperan su future.
+    """
+
+    def __init__(self, store: SessionStore, window: float = 0.002, max_batch: int = 100, timeout: float = 5.0):
+        self.store = store
+        self.window = window
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._batch_full = threading.Condition(self._lock)
+        self._pending: dict[TokenKey, Future] = {}
+        self._in_flight: dict[TokenKey, Future] = {}
+        self.queries = 0
+        self.lookups = 0
+        self.coalesced = 0
+
+    def lookup(self, token: str, client_key: str) -> Optional[TokenInfo]:
+        key = (token, client_key)
+        with self._lock:
+            self.lookups += 1
+            future = self._in_flight.get(key) or self._pending.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                leader = not self._pending
+                self._pending[key] = future
+                self._in_flight[key] = future
+                if len(self._pending) >= self.max_batch:
+                    self._batch_full.notify()
+
+        if leader:
+            self._run_batch()
+        return future.result(timeout=self.timeout)
+
+    def _run_batch(self) -> None:
+        with self._lock:
+            if len(self._pending) < self.max_batch:
+                self._batch_full.wait(self.window)
+            batch, self._pending = self._pending, {}
+
+        try:
+            self.queries += 1
+            found = self.store.lookup_many(list(batch))
+            for key, future in batch.items():
+                future.set_result(found.get(key))
+        except Exception as e:
+            for future in batch.values():
+                future.set_exception(e)
+        finally:
+            with self._lock:
+                for key in batch:
+                    self._in_flight.pop(key, None)
+
+    def info(self) -> dict:
+        return {
+            "lookups": self.lookups,
+            "queries": self.queries,
+            "coalesced": self.coalesced,
+        }
+
+
+def build_session_batcher() -> Optional[SessionLookupBatcher]:
+    if not config.SESSIONS_DB_URL:
+        return None
+    store = SessionStore(config.SESSIONS_DB_URL, pool_size=config.SESSIONS_DB_POOL_SIZE)
+    return SessionLookupBatcher(
+        store,
+        window=config.SESSIONS_BATCH_WINDOW_MS / 1000,
+        max_batch=config.SESSIONS_BATCH_MAX_SIZE,
+    )
+
+session_batcher = build_session_batcher()
@@ -0,0 +1,114 @@
+import logging
+import threading
+import zlib
+from typing import Optional
+
+from app.config.config import config
+from app.core.cache.backends import InMemoryLRUCache
+from app.api.v1.schemas.generic import TokenInfo
+
+logger = logging.getLogger(__name__)
+
+# marca de token invalido en el cache negativo
+INVALID_TOKEN = False
+
+
+class TokenCache:
+    """Cache de tokens verificados, acotado y con TTL.
+
+    Las entradas se reparten en varios shards LRU, cada uno con su propio lock,
+    para que los workers del threadpool no compitan por un unico lock. Los
+    tokens invalidos tambien se guardan (cache negativo) con un TTL corto, asi
+    un cliente que reintenta con un token vencido no consulta la base en cada
+    request. Un hilo en segundo plano descarta periodicamente los vencidos.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl: float = 1200.0,
+        negative_ttl: float = 30.0,
+        shards: int = 16,
+    ):
+        shards = max(1, shards)
+        per_shard = max(1, max_entries // shards)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._shards = [InMemoryLRUCache(max_entries=per_shard, default_ttl=ttl) for _ in range(shards)]
+        self.negative_hits = 0
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _shard(self, key: str) -> InMemoryLRUCache:
+        return self._shards[zlib.crc32(key.encode()) % len(self._shards)]
+
+    def get(self, key: str) -> Optional[TokenInfo | bool]:
+        """Devuelve los datos del token, INVALID_TOKEN si esta en el cache
+        negativo, o None si no hay entrada vigente."""
+        value = self._shard(key).get(key)
+        if value is INVALID_TOKEN:
+            self.negative_hits += 1
+        return value
+
+    def set(self, key: str, payload: TokenInfo) -> None:
+        self._shard(key).set(key, payload, self.ttl)
+
+    def set_invalid(self, key: str) -> None:
+        self._shard(key).set(key, INVALID_TOKEN, self.negative_ttl)
+
+    def delete(self, key: str) -> None:
+        self._shard(key).delete(key)
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            shard.clear()
+
+    def sweep(self) -> int:
+        return sum(shard.purge_expired() for shard in self._shards)
+
+    def start_sweeper(self, interval: float) -> None:
+        if interval <= 0 or (self._sweeper is not None and self._sweeper.is_alive()):
+            return
+        self._stop.clear()
+        self._sweeper = threading.Thread(
+            target=self._sweep_loop, args=(interval,), name="token-cache-sweeper", daemon=True
+        )
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=5)
+            self._sweeper = None
+
+    def _sweep_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                removed = self.sweep()
+                if removed:
+                    logger.debug("Token cache: %d entradas vencidas descartadas", removed)
+            except Exception as e:
+                logger.error(f"Error al limpiar el cache de tokens: {e}")
+
+    def info(self) -> dict:
+        hits = sum(s.stats.hits for s in self._shards)
+        misses = sum(s.stats.misses for s in self._shards)
+        lookups = hits + misses
+        return {
+            "size": sum(s.size() for s in self._shards),
+            "max_entries": sum(s.max_entries for s in self._shards),
+            "hits": hits,
+            "negative_hits": self.negative_hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "evictions": sum(s.stats.evictions for s in self._shards),
+            "expirations": sum(s.stats.expirations for s in self._shards),
+        }
+
+
+token_cache = TokenCache(
+    max_entries=config.TOKEN_CACHE_MAX_ENTRIES,
+    ttl=config.TOKEN_CACHE_TTL_SECONDS,
+    negative_ttl=config.TOKEN_CACHE_NEGATIVE_TTL_SECONDS,
+    shards=config.TOKEN_CACHE_SHARDS,
+)
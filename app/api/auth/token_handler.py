@@ -1,25 +1,30 @@
 
 import logging
 import time
+from typing import Optional
 
 
-from app.core.database.connection import db_connection
 from app.config.config import config
 from app.api.v1.schemas.generic import TokenInfo
+from app.api.auth.token_cache import INVALID_TOKEN, TokenCache, token_cache
+from app.api.auth.session_store import SessionLookupBatcher, session_batcher
 
 logger = logging.getLogger(__name__)
 
 
 
 class TokenHandler:
-    def __init__ (self):
-        self.active_tokens: dict[str, TokenInfo] = {}
+    def __init__ (self, cache: Optional[TokenCache] = None, batcher: Optional[SessionLookupBatcher] = None):
+        self.cache = cache or token_cache
+        self.batcher = batcher or session_batcher
+        if self.batcher is None:
+            logger.warning("SESSIONS_DB_URL no configurado: los tokens no se verifican contra usuarios_sessions")
 
     def is_token_forced_valid(self, token: str, client_key: str) -> bool:
         """
             Toma el token y el clientKey y se fija si existe en las variables de entorno, con el fin de permitir
             Acceso sin autenticación desde el otro backend en laravel
-        """        
+        """
         return (
             config.FORCED_VALID_TOKEN is not None and
             config.FORCED_CLIENT_KEY is not None and
@@ -28,25 +33,61 @@ class TokenHandler:
         )
 
 
-    def verify_token(self, token:str, client_key: str) -> bool:
+    def authenticate_cached(self, token: str, client_key: str) -> tuple[bool, Optional[TokenInfo]]:
+        """Resuelve el token sin acceder a la base (variables de entorno o cache).
+
+        Returns:
+            tuple: (resuelto, datos del token o None si es invalido)
         """
-            Toma el token y el clientKey y se fija si existe en la base de datos si el token es uno vigente    
-            TODO: hay que acceder a la base de datos y verificar estos datos contra la DB de charcot usuarios_sessions
-        """        
+        if not token or not client_key:
+            return True, None
         if self.is_token_forced_valid(token, client_key):
-            return True
-        if self.is_token_cached(token, client_key):
-            logger.info(f"Token found in cache: {self.active_tokens[f'{token}:{client_key}']}")
-            return True
+            return True, {"time": time.time(), "id": config.FORCED_VALID_TOKEN, "email": config.FORCED_CLIENT_KEY}
+
+        cached = self.cache.get(f"{token}:{client_key}")
+        if cached is INVALID_TOKEN:
+            return True, None
+        if cached is not None:
+            return True, cached
+        return False, None
+
+    def authenticate(self, token: str, client_key: str) -> Optional[TokenInfo]:
+        """Verifica el token y devuelve sus datos en una sola busqueda
+        (cache, variables de entorno o base de sesiones), o None si no es valido."""
+        resolved, payload = self.authenticate_cached(token, client_key)
+        if resolved:
+            return payload
+
+        cache_key = f"{token}:{client_key}"
         try:
-            self.active_tokens[f"{token}:{client_key}"] = {"time": time.time(), "id":1, "email":'xxx@sss.com'}
-            return True
+            payload = self._lookup_token(token, client_key)
         except Exception as e:
-            logger.error(f"Error verify_token al intentar verificar el token en la base de datos: {e}")
-        return False
-    
+            logger.error(f"Error authenticate al intentar verificar el token en la base de datos: {e}")
+            return None
+
+        if payload is None:
+            self.cache.set_invalid(cache_key)
+            return None
+        self.cache.set(cache_key, payload)
+        logger.info(f"Token verificado y guardado en cache: {payload}")
+        return payload
+
+    def _lookup_token(self, token: str, client_key: str) -> Optional[TokenInfo]:
+        """Verifica el token contra usuarios_sessions a traves del batcher
+        (una consulta por lote, compartida entre requests concurrentes)."""
+        if self.batcher is None:
+            # sin base de sesiones configurada se mantiene el comportamiento de desarrollo
+            return {"time": time.time(), "id": 1, "email": 'xxx@sss.com'}
+        return self.batcher.lookup(token, client_key)
+
+    def verify_token(self, token:str, client_key: str) -> bool:
+        """
+            Toma el token y el clientKey y se fija si existe en la base de datos si el token es uno vigente
+        """
+        return self.authenticate(token, client_key) is not None
+
     def decode_token(self, token: str, client_key: str) -> dict:
-        """El decodifica el token desde el X-Authorization, tambien contampla el hecho de que el 
+        """El decodifica el token desde el X-Authorization, tambien contampla el hecho de que el
         el token y el client-key sean validos por variables de entorno
 
         Args:
@@ -56,31 +97,8 @@ class TokenHandler:
         Returns:
             dict: devuelve el token decodificado
         """
-        logger.info(f"Decoding token: {token}")
-        try:
-            if self.is_token_forced_valid(token, client_key):
-                # el token es valido por variables de entorno
-                self.active_tokens[f"{token}:{client_key}"] = {"time": time.time(), "id":config.FORCED_VALID_TOKEN, "email":config.FORCED_CLIENT_KEY}
-                logger.info(f"Token decoded: {self.active_tokens[f'{token}:{client_key}']} and saved in cache")
-                return self.active_tokens[f"{token}:{client_key}"]
-            if self.is_token_cached(token, client_key):
-                logger.info(f"Token found in cache: {self.active_tokens[f'{token}:{client_key}']}")
-                return self.active_tokens[f"{token}:{client_key}"]
-
-            self.active_tokens[f"{token}:{client_key}"] = {"time": time.time(), "id":1, "email":'xxx@sss.com'}
-            logger.info(f"Token decoded: {self.active_tokens[f"{token}:{client_key}"]} and saved in cache")
-            return self.active_tokens[f"{token}:{client_key}"]
-        except Exception as e:
-            logger.error(f"Error decode_token al intentar verificar el token en la base de datos: {e}")
-        return False
-    
-    def is_token_cached(self, token: str, client_key: str) -> bool:
-        cache_key = f"{token}:{client_key}"
-        if(cache_key in self.active_tokens):
-            # se verifica si el token está en caché, se considera valido en cache durante 20 minutos (1200 segundos)
-            if(time.time() - self.active_tokens[cache_key]["time"] < 1200):
-                return True
-            else:
-                del self.active_tokens[cache_key]    
-        return False
+        return self.authenticate(token, client_key) or False
 
+    def is_token_cached(self, token: str, client_key: str) -> bool:
+        cached = self.cache.get(f"{token}:{client_key}")
+        return cached is not None and cached is not INVALID_TOKEN
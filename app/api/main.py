@@ -1,16 +1,29 @@
 from fastapi import APIRouter, FastAPI, Request, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.openapi.utils import get_openapi
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
 from time import time
 
-from app.api.v1.endpoints.movies import router as api_router_movies
+from app.config.config import config
+if config.DB_ASYNC:
+    from app.api.v1.endpoints.movies_async import router as api_router_movies
+    from app.core.database.async_connection import async_db_connection
+else:
+    from app.api.v1.endpoints.movies import router as api_router_movies
 from app.api.middleware.auth_middleware import AuthMiddleware
+from app.api.middleware.metrics_middleware import MetricsMiddleware
+from app.api.middleware.read_your_writes_middleware import ReadYourWritesMiddleware
 from app.core.database.connection import db_connection
-from app.config.config import config
-from app.core.database.repositories.base_repository import EntityNotFoundError
+from app.core.cache import cache_backend
+from app.core.search import title_autocomplete
+from app.core.stats import catalog_stats
+from app.api.auth.token_cache import token_cache
+from app.api.auth.session_store import session_batcher
+from app.core.database.repositories.movie_repository import MovieRepository, movie_async_flights, movie_flights
+from app.core.metrics import registry, http_requests_total, http_requests_in_flight, db_queries_total
+from app.core.database.repositories.base_repository import EntityNotFoundError, InvalidCursorError, ConcurrentModificationError
 
 from app.api.v1.schemas.generic import ApiResponse
 
@@ -19,12 +32,40 @@ import logging
 logging.basicConfig(level=config.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
+STARTED_AT = time()
+
+
+def load_autocomplete() -> None:
+    try:
+        with db_connection.get_session() as session:
+            title_autocomplete.load(MovieRepository(session).iter_titles())
+    except Exception as e:
+        # sin indice la API funciona igual, /suggest devuelve listas vacias
+        logger.error(f"No se pudo construir el indice de autocompletado: {e}")
+
+
+def load_catalog_stats() -> None:
+    try:
+        with db_connection.get_session() as session:
+            MovieRepository(session).catalog_stats()
+    except Exception as e:
+        # se vuelve a intentar en el primer GET /movies/stats
+        logger.error(f"No se pudieron calcular las estadisticas del catalogo: {e}")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Código de STARTUP - se ejecuta antes de que la app reciba requests
     logger.info(f"Starting {config.APP_NAME}...")
     logger.info(f"Environment: {config.ENVIRONMENT}")
+    token_cache.start_sweeper(config.TOKEN_CACHE_SWEEP_INTERVAL_SECONDS)
+    if config.DB_ASYNC:
+        db_connection.readiness.watch_pool("async", async_db_connection.engine.sync_engine)
+    await run_in_threadpool(db_connection.start_health_checks)
+    if title_autocomplete is not None:
+        await run_in_threadpool(load_autocomplete)
+    if catalog_stats is not None:
+        await run_in_threadpool(load_catalog_stats)
     logger.info(f"API is ready !")
     
     # Aqui inicializar cualquier recurso que se necesite:
@@ -36,7 +77,12 @@ async def lifespan(app: FastAPI):
     yield  # Este yield separa startup de shutdown
 
     
+    token_cache.stop_sweeper()
+    if session_batcher is not None:
+        session_batcher.store.close()
     db_connection.close_connection()
+    if config.DB_ASYNC:
+        await async_db_connection.close_connection()
     # Código de SHUTDOWN - se ejecuta cuando la app se cierra
     logger.info(f"Shutting down {config.APP_NAME}...")
     logger.info("Conexiones cerradas correctamente")
@@ -58,6 +104,20 @@ def create_app() -> FastAPI:
             content={"detail": str(exc)}
         )    
 
+    @app.exception_handler(ConcurrentModificationError)
+    def concurrent_modification_handler(request: Request, exc: ConcurrentModificationError):
+        return JSONResponse(
+            status_code=412,
+            content={"detail": str(exc)}
+        )
+
+    @app.exception_handler(InvalidCursorError)
+    def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+        return JSONResponse(
+            status_code=400,
+            content={"detail": str(exc)}
+        )
+
     def custom_openapi():
         if app.openapi_schema:
             return app.openapi_schema
@@ -79,6 +139,7 @@ def create_app() -> FastAPI:
         "/redoc",
         "/openapi.json",
         "/health",
+        "/metrics",
         "/favicon.ico",
     ]      
 
@@ -100,6 +161,16 @@ def create_app() -> FastAPI:
 
     logger.info("Auth Middleware configurated")
 
+    if db_connection.replicas is not None:
+        app.add_middleware(
+            ReadYourWritesMiddleware,
+            cookie_name=config.DB_WRITE_COOKIE,
+            max_lag_seconds=config.DB_REPLICA_MAX_LAG_SECONDS,
+        )
+
+    # se agrega al final para quedar por fuera de auth y CORS y medir el request completo
+    app.add_middleware(MetricsMiddleware, excluded_paths=["/metrics"])
+
     v1_router = APIRouter()
     v1_router.include_router(api_router_movies, tags=["MOVIES"], prefix="/movies")
     app.include_router(v1_router, prefix="/api/v1")
@@ -117,64 +188,66 @@ def create_app() -> FastAPI:
                     "rag_queries": "/api/v1/rag/",
                     "agent_queries": "/api/v1/agent/",
                     "health": "/health",
+                    "liveness": "/health/live",
+                    "readiness": "/health/ready",
                     "status": "/status"
                 }
             }
     )
-    @app.get("/health")
-    async def health_check():
-        try:
-            # Verificar conexión a base de datos
-            with db_connection.get_session() as session:
-                # Simple query para verificar conectividad
-                result = session.execute(text("SELECT 1 as health_check")).fetchone()
-                db_status = "healthy" if result and result[0] == 1 else "unhealthy"                
-            
-            health_data = {
-                "status": "healthy",
-                "timestamp": time(),
-                "version": config.APP_VERSION,
-                "database": db_status,
-                "components": {
-                    "api": "healthy",
-                    "database": db_status,
-                    "authentication": "healthy"
-                }
-            }
-            
-            return health_data
-            
-        except Exception as e:
-            logger.error(f"Health check failed: {e}")
-            return JSONResponse(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                content={
-                    "status": "unhealthy",
-                    "timestamp": time(),
-                    "version": config.APP_VERSION,
-                    "error": str(e),
-                    "components": {
-                        "api": "healthy",
-                        "database": "unhealthy",
-                        "authentication": "unknown"
-                    }
-                }
-            )
-        
+    # ninguno de los chequeos toca la base: /health/ready devuelve el ultimo
+    # resultado de db_connection.readiness, que se calcula en segundo plano
+    @app.get("/health/live")
+    async def liveness_check():
+        return {"status": "alive", "version": config.APP_VERSION, "uptime_seconds": round(time() - STARTED_AT, 1)}
+
+    @app.get("/health/ready")
+    async def readiness_check():
+        snapshot = db_connection.readiness.snapshot()
+        if snapshot["status"] == "not_ready":
+            return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=snapshot)
+        return snapshot
+
+    # se mantiene para los balanceadores ya configurados contra /health
+    app.add_api_route("/health", readiness_check, methods=["GET"])
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
     @app.get("/status")
-    async def api_status():
+    def api_status():
         try:
-            total_users = 111
-            active_users = 222
+            database_status = "connected"
+            total_movies = None
+            try:
+                with db_connection.get_session() as session:
+                    total_movies = MovieRepository(session).count()
+            except Exception as e:
+                logger.error(f"Error consultando la base en /status: {e}")
+                database_status = "disconnected"
 
-            
             return {
                 "api_name": config.APP_NAME,
                 "api_version": config.APP_VERSION,
-                "database_status": "connected",
+                "database_status": database_status,
                 "statistics": {
-                    "total_users": total_users,
-                    "active_users": active_users,
+                    "total_movies": total_movies,
+                    "requests_total": int(http_requests_total.total()),
+                    "requests_in_flight": int(http_requests_in_flight.value()),
+                    "db_queries_total": int(db_queries_total.value()),
+                    "uptime_seconds": round(time() - STARTED_AT, 1),
+                },
+                "database_pool": db_connection.pool_stats(),
+                "async_database_pool": async_db_connection.pool_stats() if config.DB_ASYNC else None,
+                "cache": cache_backend.info(),
+                "token_cache": token_cache.info(),
+                "session_lookups": session_batcher.info() if session_batcher is not None else None,
+                "autocomplete": title_autocomplete.info() if title_autocomplete is not None else None,
+                "catalog_stats": catalog_stats.info() if catalog_stats is not None else None,
+                "single_flight": {
+                    flights.name: flights.info()
+                    for flights in (movie_flights, movie_async_flights if config.DB_ASYNC else None)
+                    if flights is not None
                 },
                 "configuration": {
                     "debug_mode": config.DEBUG,
@@ -188,8 +261,6 @@ def create_app() -> FastAPI:
                 detail="Error al obtener estado de la API"
             )          
 
-          
-
 
     return app
 
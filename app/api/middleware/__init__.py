@@ -1,4 +1,5 @@
 from .auth_middleware import AuthMiddleware
+from .metrics_middleware import MetricsMiddleware
 
 
-__all__ = ["AuthMiddleware"]
\ No newline at end of file
+__all__ = ["AuthMiddleware", "MetricsMiddleware"]
\ No newline at end of file
@@ -1,8 +1,9 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi import HTTPException, Request, Response, status
+from fastapi import HTTPException, status
 from fastapi.responses import JSONResponse
-from typing import Callable
-import json, logging
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import Callable, Iterable, Optional
+import json, logging, re
 
 
 
@@ -12,10 +13,26 @@ from app.config.config import config
 
 logger = logging.getLogger(__name__)
 
-class AuthMiddleware(BaseHTTPMiddleware):
+AUTH_HEADER = b"x-authorization"
 
-    def __init__(self, app, excluded_paths: list, protected_paths: list):
-        super().__init__(app)
+
+def compile_prefix_matcher(prefixes: Iterable[str]) -> Callable[[str], bool]:
+    """Compila la lista de prefijos en una sola expresion regular anclada al
+    inicio, para no recorrer la lista con startswith en cada request."""
+    prefixes = [p for p in prefixes if p]
+    if not prefixes:
+        return lambda path: False
+    pattern = re.compile("|".join(re.escape(p) for p in sorted(prefixes, key=len, reverse=True)))
+    return lambda path: pattern.match(path) is not None
+
+
+class AuthMiddleware:
+    """Middleware ASGI puro (sin BaseHTTPMiddleware): no envuelve el request en
+    tareas ni re-empaqueta el body de la respuesta, por lo que no agrega
+    overhead por request y no interfiere con respuestas en streaming."""
+
+    def __init__(self, app: ASGIApp, excluded_paths: list, protected_paths: list):
+        self.app = app
 
         self.token_handler = TokenHandler()
 
@@ -32,76 +49,85 @@ class AuthMiddleware(BaseHTTPMiddleware):
             "/api/v1/ask",
             "/api/v1/users"
         ]
+        self._is_excluded_path = compile_prefix_matcher(self.excluded_paths)
+        self._is_protected_path = compile_prefix_matcher(self.protected_paths)
         logger.info(f"AuthMiddleware inicializado con {len(self.excluded_paths)} rutas excluidas y {len(self.protected_paths)} rutas protegidas")
-    
 
-    async def dispatch(self, request: Request, call_next: Callable[[Request], Response]) -> Response:
-        path = request.url.path
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
 
         if self._is_excluded_path(path):
-            logger.debug(f"Ruta excluida de autenticación: {request.url.path}")
-            return await call_next(request)
-        
+            logger.debug("Ruta excluida de autenticación: %s", path)
+            await self.app(scope, receive, send)
+            return
+
         user = None
         try:
-            user = self._authenticate_request(request)
+            user = await self._authenticate_request(scope)
         except HTTPException as e:
-            return self._create_unauthorized_response(e.detail)
+            await self._create_unauthorized_response(e.detail)(scope, receive, send)
+            return
         except Exception as ex:
-            return self._create_unauthorized_response(f"Error interno en la autenticación: {ex}")
+            await self._create_unauthorized_response(f"Error interno en la autenticación: {ex}")(scope, receive, send)
+            return
 
         if self._is_protected_path(path) and not user:
-            logger.warning(f"Acceso denegado a ruta protegida: {request.url.path}")
-            return self._create_unauthorized_response(
-                "Acceso denegado a ruta protegida" 
-            )
+            logger.warning(f"Acceso denegado a ruta protegida: {path}")
+            await self._create_unauthorized_response(
+                "Acceso denegado a ruta protegida"
+            )(scope, receive, send)
+            return
 
         # Log del estado de autenticación
         if user:
-            logger.debug(f"Usuario autenticado: {user['email']} para ruta: {request.url.path}")
+            logger.debug("Usuario autenticado: %s para ruta: %s", user["email"], path)
         else:
-            logger.debug(f"Acceso sin autenticación a ruta: {request.url.path}")
-        
-        # Continuar con el request
-        return await call_next(request)
-    
-    def _authenticate_request(self, request: Request):
-        authorization = request.headers.get("X-Authorization")
-        if not authorization or not self._is_token_valid(*self._extract_token(request)):
-            return None
-
-        payload = self.token_handler.decode_token(*self._extract_token(request))
-        logger.info(f"Token decodificado: {payload}")
-        request.state.user_id = payload["id"]
-        request.state.username = payload["email"]
-        request.state.payload = payload
-        return payload
+            logger.debug("Acceso sin autenticación a ruta: %s", path)
 
+        # Continuar con el request
+        await self.app(scope, receive, send)
 
-    def _is_excluded_path(self, path: str) -> bool:
-        return any(path.startswith(excluded) for excluded in self.excluded_paths)
+    async def _authenticate_request(self, scope: Scope) -> Optional[dict]:
+        token, client_key = self._extract_token(scope)
+        if token is None and client_key is None:
+            return None
 
-    def _is_protected_path(self, path: str) -> bool:
-        return any(path.startswith(protected) for protected in self.protected_paths)
-    
-    def _extract_token(self, request: Request) -> str:
-        auth_header = request.headers.get("X-Authorization")
-        auth_header_json = json.loads(auth_header) if auth_header else {}
+        resolved, payload = self.token_handler.authenticate_cached(token, client_key)
+        if not resolved:
+            # la verificacion contra la base de sesiones es bloqueante, no se corre en el event loop
+            payload = await run_in_threadpool(self.token_handler.authenticate, token, client_key)
+        if not payload:
+            return None
 
-        return auth_header_json.get("token"), auth_header_json.get("clientKey")
+        logger.debug("Token decodificado: %s", payload)
+        # request.state lee de scope["state"]
+        state = scope.setdefault("state", {})
+        state["user_id"] = payload["id"]
+        state["username"] = payload["email"]
+        state["payload"] = payload
+        return payload
 
-    def _is_token_valid(self, token, client_key: str) -> bool:
-        return self.token_handler.verify_token(token, client_key)
+    def _extract_token(self, scope: Scope) -> tuple[Optional[str], Optional[str]]:
+        for name, value in scope["headers"]:
+            if name == AUTH_HEADER:
+                auth_header_json = json.loads(value.decode("latin-1")) if value else {}
+                return auth_header_json.get("token"), auth_header_json.get("clientKey")
+        return None, None
 
-    def _create_unauthorized_response(self, message: str) -> Response:
+    def _create_unauthorized_response(self, message: str) -> JSONResponse:
         return JSONResponse(
             status_code=status.HTTP_401_UNAUTHORIZED,
             content={
                 "detail": message,
                 "type": "authentication_error"
-            }, 
+            },
             headers={"WWW-Authenticate": "X-Authorization"}
         )
-    
+
 def verify_active_user() -> bool:
     return True
@@ -0,0 +1,89 @@
+import time
+
+from starlette.routing import NoMatchFound
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (
+    db_queries_per_request,
+    db_time_per_request_seconds,
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    http_requests_total,
+    http_response_size_bytes,
+)
+from app.core.metrics.request_context import end_request_stats, start_request_stats
+
+
+def _route_label(scope: Scope, labels: dict[int, str]) -> str:
+    # se usa la plantilla de la ruta (/api/v1/movies/{movie_id}) y no el path
+    # real, para no generar una serie por cada id
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    label = labels.get(id(route))
+    if label is None:
+        label = labels[id(route)] = _mounted_template(scope, route)
+    return label
+
+
+def _mounted_template(scope: Scope, route) -> str:
+    """Plantilla completa de la ruta. Con include_router la ruta puede tener
+    solo la relativa a su router (/{movie_id}): el prefijo montado sale de
+    comparar su URL resuelta desde el router de la app con la de la ruta sola."""
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    root_path = scope.get("root_path", "")
+    params = scope.get("path_params", {})
+    try:
+        full = scope["router"].url_path_for(route.name, **params)
+        own = route.url_path_for(route.name, **params)
+    except (KeyError, AttributeError, NoMatchFound):
+        return root_path + template
+    prefix = full[: len(full) - len(own)] if full.endswith(own) else ""
+    return root_path + prefix + template
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mide latencia, requests en curso, tamaño de
+    respuesta y cantidad/tiempo de SQL por request."""
+
+    def __init__(self, app: ASGIApp, excluded_paths: list = None):
+        self.app = app
+        self.excluded_paths = set(excluded_paths or [])
+        # id de la ruta -> etiqueta, se resuelve una vez por ruta
+        self._labels: dict[int, str] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        response_size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        stats, token = start_request_stats(scope["method"], scope["path"])
+        http_requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_flight.dec()
+            end_request_stats(token)
+
+            route = _route_label(scope, self._labels)
+            method = scope["method"]
+            http_requests_total.inc(method=method, route=route, status=status_code)
+            http_request_duration_seconds.observe(elapsed, method=method, route=route)
+            http_response_size_bytes.observe(response_size, route=route)
+            db_queries_per_request.observe(stats.queries, route=route)
+            db_time_per_request_seconds.observe(stats.db_time, route=route)
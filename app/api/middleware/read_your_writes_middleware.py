@@ -0,0 +1,39 @@
+import math
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.database.replicas import end_request_writes, start_request_writes
+
+
+class ReadYourWritesMiddleware:
+    """Middleware ASGI que devuelve en una cookie el momento de la ultima
+    escritura del request en el primario (la anota RoutingSession). Mientras
+    la cookie tenga menos de max_lag_seconds, get_db manda las lecturas de ese
+    cliente al primario; el resto sigue leyendo de las replicas."""
+
+    def __init__(self, app: ASGIApp, cookie_name: str, max_lag_seconds: float):
+        self.app = app
+        self.cookie_name = cookie_name
+        self.max_age = max(1, math.ceil(max_lag_seconds))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        writes, token = start_request_writes()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and writes.last_write is not None:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{self.cookie_name}={writes.last_write:.3f}; Max-Age={self.max_age}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_request_writes(token)
@@ -1,10 +1,28 @@
-from app.api.v1.schemas.movies import MovieCreate, MovieResponse, MovieUpdate, DeleteMovieResponse
-from app.api.v1.schemas.generic import ApiResponse
-from fastapi import status, APIRouter
+from app.api.v1.schemas.movies import (
+    MovieCreate, MovieResponse, MovieUpdate, DeleteMovieResponse, MovieListQuery,
+    MovieBulkUpdate, MovieBulkDelete, BulkItemResult, BulkOperationResponse, MovieExportQuery,
+    ImportResponse, MovieSearchQuery, MovieSuggestion, MovieStats, MovieBatchGet, MovieBatchResponse,
+)
+from app.api.v1.services.conditional import (
+    collection_etag, entity_etag, has_conditional_headers, if_match_version,
+    is_not_modified, not_modified_response, set_validators,
+)
+from app.api.v1.services.movie_import import MovieImporter, iter_csv_rows, iter_ndjson_rows
+from app.api.v1.schemas.generic import ApiResponse, PagedApiResponse
+from app.api.v1.services.serialization import movie_batch_response, movie_list_response
+from fastapi import status, APIRouter, Query, Request, Response, Body, HTTPException, UploadFile, File
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from app.core.database.connection import db_connection
 from app.core.database.repositories.movie_repository import MovieRepository
+from app.core.database.models.models import Movie
+from app.core.search import title_autocomplete
 from sqlalchemy.orm import Session
 from fastapi import Depends
+from typing import Annotated, Any, Iterator, Literal, Optional, Union
+from decimal import Decimal
+from datetime import datetime
+import csv, io, json
 
 
 from app.config.config import config
@@ -35,28 +53,319 @@ def create_movie(
         data=MovieResponse.model_validate(movie)
     )
 
-@router.get("/", response_model=ApiResponse[list[MovieResponse]])
-def get_movies(
+def _validation_messages(exc: ValidationError) -> list[str]:
+    return [
+        f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    ]
+
+def _check_bulk_size(size: int) -> None:
+    if size > config.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Se permiten como maximo {config.BULK_MAX_ITEMS} elementos por operacion masiva"
+        )
+
+def _batch_ids(ids: list[int]) -> list[int]:
+    if len(ids) > config.BATCH_GET_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Se permiten como maximo {config.BATCH_GET_MAX_IDS} ids por consulta"
+        )
+    return ids
+
+def _batch_response(http_request: Request, rows: list[dict], missing: list[int]) -> Response:
+    # el ETag cambia si cambia alguna de las peliculas o si aparece una faltante
+    etag = collection_etag("movies", [(row["id"], row["version"]) for row in rows], None)
+    if is_not_modified(http_request, etag, None):
+        return not_modified_response(etag, None)
+    response = movie_batch_response(rows, missing, "Consulta por ids realizada correctamente")
+    set_validators(response, etag, None)
+    return response
+
+def _bulk_response(message: str, items: list[BulkItemResult]) -> ApiResponse[BulkOperationResponse]:
+    succeeded = sum(1 for item in items if not item.errors)
+    return ApiResponse(
+        status="success",
+        message=message,
+        errors=[],
+        data=BulkOperationResponse(
+            processed=len(items),
+            succeeded=succeeded,
+            failed=len(items) - succeeded,
+            items=items,
+        )
+    )
+
+@router.post("/bulk", response_model=ApiResponse[BulkOperationResponse])
+def bulk_create_movies(
+    items: list[dict[str, Any]] = Body(..., min_length=1),
+    chunk_size: Optional[int] = Query(None, ge=1, le=5000),
+    db: Session = Depends(db_connection.get_db),
+):
+    _check_bulk_size(len(items))
+    results: list[BulkItemResult] = []
+    rows, positions = [], []
+    for index, item in enumerate(items):
+        try:
+            rows.append(MovieCreate.model_validate(item).model_dump())
+            positions.append(index)
+            results.append(BulkItemResult(index=index, status="created"))
+        except ValidationError as e:
+            results.append(BulkItemResult(index=index, status="invalid", errors=_validation_messages(e)))
+
+    if rows:
+        repo = MovieRepository(db)
+        ids = repo.bulk_create(rows, chunk_size=chunk_size or config.BULK_CHUNK_SIZE)
+        for index, movie_id in zip(positions, ids):
+            results[index].id = movie_id
+
+    return _bulk_response("Alta masiva procesada", results)
+
+@router.patch("/bulk", response_model=ApiResponse[BulkOperationResponse])
+def bulk_update_movies(
+    items: list[dict[str, Any]] = Body(..., min_length=1),
+    chunk_size: Optional[int] = Query(None, ge=1, le=5000),
+    db: Session = Depends(db_connection.get_db),
+):
+    _check_bulk_size(len(items))
+    results: list[BulkItemResult] = []
+    rows, positions = [], []
+    for index, item in enumerate(items):
+        try:
+            row = MovieBulkUpdate.model_validate(item).model_dump(exclude_unset=True)
+            rows.append(row)
+            positions.append(index)
+            results.append(BulkItemResult(index=index, id=row["id"], status="updated"))
+        except ValidationError as e:
+            results.append(BulkItemResult(
+                index=index, id=item.get("id"), status="invalid", errors=_validation_messages(e)
+            ))
+
+    if rows:
+        repo = MovieRepository(db)
+        updated, invalid = repo.bulk_update(rows, chunk_size=chunk_size or config.BULK_CHUNK_SIZE)
+        for position, error in invalid.items():
+            results[positions[position]].status = "invalid"
+            results[positions[position]].errors = [error]
+        for result in results:
+            if result.status == "updated" and result.id not in updated:
+                result.status = "not_found"
+                result.errors = [f"Movie con id={result.id} no encontrado"]
+
+    return _bulk_response("Actualizacion masiva procesada", results)
+
+@router.delete("/bulk", response_model=ApiResponse[BulkOperationResponse])
+def bulk_delete_movies(
+    request: MovieBulkDelete,
+    chunk_size: Optional[int] = Query(None, ge=1, le=5000),
+    db: Session = Depends(db_connection.get_db),
+):
+    _check_bulk_size(len(request.ids))
+    repo = MovieRepository(db)
+    deleted = repo.bulk_delete(request.ids, chunk_size=chunk_size or config.BULK_CHUNK_SIZE)
+
+    results = [
+        BulkItemResult(index=index, id=movie_id, status="deleted")
+        if movie_id in deleted
+        else BulkItemResult(
+            index=index, id=movie_id, status="not_found",
+            errors=[f"Movie con id={movie_id} no encontrado"]
+        )
+        for index, movie_id in enumerate(request.ids)
+    ]
+    return _bulk_response("Baja masiva procesada", results)
+
+@router.post("/import", response_model=ApiResponse[ImportResponse])
+def import_movies(
+    file: UploadFile = File(..., description="Archivo CSV (con encabezado) o NDJSON"),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Si no se indica se infiere de la extension"),
+    upsert: bool = Query(False, description="Actualiza las peliculas existentes con el mismo title, year y director"),
+    chunk_size: Optional[int] = Query(None, ge=1, le=5000),
+    db: Session = Depends(db_connection.get_db),
+):
+    import_format = format or ("csv" if (file.filename or "").lower().endswith(".csv") else "ndjson")
+    # UploadFile guarda el contenido en un archivo temporal, aca se lee por lineas
+    rows = iter_csv_rows(file.file) if import_format == "csv" else iter_ndjson_rows(file.file)
+
+    importer = MovieImporter(
+        db,
+        chunk_size=chunk_size or config.BULK_CHUNK_SIZE,
+        upsert=upsert,
+        max_errors=config.IMPORT_MAX_ERRORS,
+    )
+    result = importer.run(rows)
+
+    return ApiResponse(
+        status="success",
+        message="Importacion procesada",
+        errors=[],
+        data=ImportResponse(**result)
+    )
+
+EXPORT_COLUMNS = [column.name for column in Movie.__table__.columns]
+
+def _json_default(value: Any):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+def _export_ndjson(batches) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(
+            json.dumps(dict(row), default=_json_default, ensure_ascii=False) + "\n"
+            for row in batch
+        ).encode()
+
+def _export_csv(batches) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in batches:
+        writer.writerows([row[column] for column in EXPORT_COLUMNS] for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+def _stream_export(export_format: str, filters: dict) -> Iterator[bytes]:
+    # la sesion vive lo que dura el streaming, no lo que dura el endpoint
+    with db_connection.get_session() as db:
+        repo = MovieRepository(db)
+        batches = repo.stream_batches(
+            batch_size=config.EXPORT_BATCH_SIZE,
+            criteria=repo.build_criteria(**filters),
+        )
+        encoder = _export_csv if export_format == "csv" else _export_ndjson
+        yield from encoder(batches)
+
+@router.get("/export")
+def export_movies(query: Annotated[MovieExportQuery, Query()]):
+    if query.format == "csv":
+        media_type, extension = "text/csv", "csv"
+    else:
+        media_type, extension = "application/x-ndjson", "ndjson"
+
+    return StreamingResponse(
+        _stream_export(query.format, query.filters()),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="movies.{extension}"'}
+    )
+
+@router.get("/search", response_model=PagedApiResponse[list[MovieResponse]])
+def search_movies(
+    query: Annotated[MovieSearchQuery, Query()],
     db: Session = Depends(db_connection.get_db),
 ):
+    """Busqueda por palabras (y prefijos) en titulo, director y descripcion,
+    ordenada por relevancia."""
     repo = MovieRepository(db)
-    movies = repo.get_all()
+    rows, next_cursor = repo.search_text(
+        query.q, query.filters(), cursor=query.cursor, limit=query.limit
+    )
+    return movie_list_response(rows, "Busqueda realizada correctamente", next_cursor)
+
+@router.get("/suggest", response_model=ApiResponse[list[MovieSuggestion]])
+def suggest_movies(
+    q: str = Query(..., min_length=1, max_length=100, description='Texto tipeado hasta el momento'),
+    limit: int = Query(10, ge=1, le=50, description='Cantidad maxima de sugerencias'),
+):
+    """Sugerencias de titulos para busqueda mientras se escribe, resueltas
+    desde el indice en memoria (sin consultar la base)."""
+    if title_autocomplete is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="El autocompletado esta deshabilitado"
+        )
+    suggestions = title_autocomplete.suggest(q, limit=limit)
     return ApiResponse(
         status="success",
-        message="Listado obtenido correctamente",
+        message="Sugerencias obtenidas correctamente",
         errors=[],
-        data=[MovieResponse.model_validate(m) for m in movies]
+        data=[MovieSuggestion(id=id, title=title) for id, title in suggestions]
     )
 
+@router.get("/stats", response_model=ApiResponse[MovieStats])
+def get_movie_stats(db: Session = Depends(db_connection.get_db)):
+    """Conteos por genero, decada, calificacion y visto/no visto, y promedios
+    de precio, calificacion y duracion. Salen de los agregados en memoria
+    que se actualizan en cada escritura, sin GROUP BY sobre la tabla."""
+    stats = MovieRepository(db).catalog_stats()
+    if stats is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Las estadisticas del catalogo estan deshabilitadas"
+        )
+    return ApiResponse(
+        status="success",
+        message="Estadisticas obtenidas correctamente",
+        errors=[],
+        data=MovieStats(**stats)
+    )
+
+@router.post("/batch-get", response_model=ApiResponse[MovieBatchResponse])
+def batch_get_movies(
+    request: MovieBatchGet,
+    http_request: Request,
+    db: Session = Depends(db_connection.get_db),
+):
+    """Varias peliculas por id en una sola consulta (p.ej. una watchlist), en
+    el orden pedido y con los ids inexistentes en missing. Los ids cacheados
+    no van a la base. Como todo POST se lee del primario; GET /?ids= es la
+    variante que puede ir a las replicas."""
+    rows, missing = MovieRepository(db).get_many_rows(_batch_ids(request.ids), chunk_size=config.BULK_CHUNK_SIZE)
+    return _batch_response(http_request, rows, missing)
+
+# con ?ids= la respuesta tiene la forma de POST /batch-get
+@router.get("/", response_model=Union[PagedApiResponse[list[MovieResponse]], ApiResponse[MovieBatchResponse]])
+def get_movies(
+    query: Annotated[MovieListQuery, Query()],
+    http_request: Request,
+    db: Session = Depends(db_connection.get_db),
+):
+    repo = MovieRepository(db)
+    if query.ids:
+        ids = _batch_ids([int(id) for id in query.ids.split(",")])
+        rows, missing = repo.get_many_rows(ids, chunk_size=config.BULK_CHUNK_SIZE)
+        return _batch_response(http_request, rows, missing)
+
+    rows, next_cursor = repo.search_rows(
+        query.filters(), cursor=query.cursor, limit=query.limit, order_by=query.order_by
+    )
+
+    # en listados solo se usa ETag: una baja no cambia la fecha maxima de la pagina
+    etag = collection_etag("movies", [(row["id"], row["version"]) for row in rows], next_cursor)
+    if is_not_modified(http_request, etag, None):
+        return not_modified_response(etag, None)
+
+    # filas planas serializadas una sola vez, sin pasar por response_model
+    response = movie_list_response(rows, "Listado obtenido correctamente", next_cursor)
+    set_validators(response, etag, None)
+    return response
+
 @router.get("/{movie_id}", response_model=ApiResponse[MovieResponse])
 def get_movie_by_id(
     movie_id: int,
+    http_request: Request,
+    response: Response,
     db: Session = Depends(db_connection.get_db),
 ):
     repo = MovieRepository(db)
 
-    movie = repo.get_by_id_or_fail(movie_id)
+    if has_conditional_headers(http_request):
+        # consulta liviana de version antes de traer la fila completa
+        current = repo.read_version(movie_id)
+        if current is not None:
+            version, updated_at = current
+            etag = entity_etag("movies", movie_id, version)
+            if is_not_modified(http_request, etag, updated_at):
+                return not_modified_response(etag, updated_at)
 
+    movie = repo.read_by_id_or_fail(movie_id)
+    set_validators(response, entity_etag("movies", movie.id, movie.version), movie.updated_at)
 
     return ApiResponse(
         status="success",
@@ -69,21 +378,25 @@ def get_movie_by_id(
 def update_movie_by_id(
     movie_id: int,
     request: MovieUpdate,
+    http_request: Request,
+    response: Response,
     db: Session = Depends(db_connection.get_db),
 ):
     repo = MovieRepository(db)
 
-    movie = repo.get_by_id_or_fail(movie_id)
-    update_data = request.model_dump(exclude_unset=True)
+    expected_version = None
+    if "if-match" in http_request.headers:
+        current = repo.read_version(movie_id)
+        expected_version = if_match_version(http_request, "movies", movie_id, current[0] if current else None)
 
-    for field, value in update_data.items():
-        setattr(movie, field, value)
+    movie = repo.update_by_id(movie_id, request.model_dump(exclude_unset=True), expected_version)
+    set_validators(response, entity_etag("movies", movie.id, movie.version), movie.updated_at)
 
     return ApiResponse(
         status="success",
         message="La consulta fue realizada exitosamente",
         errors=[],
-        data=MovieResponse.model_validate(repo.update(movie))
+        data=MovieResponse.model_validate(movie)
     )
 
 @router.delete(
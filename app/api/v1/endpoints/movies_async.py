@@ -0,0 +1,174 @@
+"""Version async de los endpoints de lectura/escritura de peliculas, activada
+con DB_ASYNC. Las operaciones masivas, import y export se siguen atendiendo con
+los handlers sync de movies.py."""
+from app.api.v1.schemas.movies import (
+    MovieCreate, MovieResponse, MovieUpdate, DeleteMovieResponse, MovieListQuery, MovieSearchQuery,
+    MovieBatchGet, MovieBatchResponse,
+)
+from app.api.v1.schemas.generic import ApiResponse, PagedApiResponse
+from app.api.v1.services.serialization import movie_list_response
+from app.api.v1.endpoints import movies as sync_movies
+from app.api.v1.services.conditional import (
+    collection_etag, entity_etag, has_conditional_headers, if_match_version,
+    is_not_modified, not_modified_response, set_validators,
+)
+from fastapi import status, APIRouter, Query, Request, Response
+from app.core.database.async_connection import async_db_connection
+from app.core.database.repositories.async_movie_repository import AsyncMovieRepository
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends
+from typing import Annotated, Union
+from app.config.config import config
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+ASYNC_ROUTES = {
+    "create_movie", "get_movies", "search_movies", "get_movie_by_id", "update_movie_by_id", "delete_movie_by_id",
+    "batch_get_movies",
+}
+
+# primero las rutas sync que no tienen version async (/bulk, /import, /export...)
+# para que se resuelvan antes que /{movie_id}
+router.routes.extend(
+    route for route in sync_movies.router.routes if route.name not in ASYNC_ROUTES
+)
+
+@router.post("/", response_model=ApiResponse[MovieResponse])
+async def create_movie(
+    request: MovieCreate,
+    db: AsyncSession = Depends(async_db_connection.get_db),
+):
+    repo = AsyncMovieRepository(db)
+    movie = await repo.create(request.model_dump())
+
+    return ApiResponse(
+        status="success",
+        message="Película creada correctamente",
+        errors=[],
+        data=MovieResponse.model_validate(movie)
+    )
+
+@router.get("/search", response_model=PagedApiResponse[list[MovieResponse]])
+async def search_movies(
+    query: Annotated[MovieSearchQuery, Query()],
+    db: AsyncSession = Depends(async_db_connection.get_db),
+):
+    repo = AsyncMovieRepository(db)
+    rows, next_cursor = await repo.search_text(
+        query.q, query.filters(), cursor=query.cursor, limit=query.limit
+    )
+    return movie_list_response(rows, "Busqueda realizada correctamente", next_cursor)
+
+@router.post("/batch-get", response_model=ApiResponse[MovieBatchResponse])
+async def batch_get_movies(
+    request: MovieBatchGet,
+    http_request: Request,
+    db: AsyncSession = Depends(async_db_connection.get_db),
+):
+    rows, missing = await AsyncMovieRepository(db).get_many_rows(
+        sync_movies._batch_ids(request.ids), chunk_size=config.BULK_CHUNK_SIZE
+    )
+    return sync_movies._batch_response(http_request, rows, missing)
+
+# con ?ids= la respuesta tiene la forma de POST /batch-get
+@router.get("/", response_model=Union[PagedApiResponse[list[MovieResponse]], ApiResponse[MovieBatchResponse]])
+async def get_movies(
+    query: Annotated[MovieListQuery, Query()],
+    http_request: Request,
+    db: AsyncSession = Depends(async_db_connection.get_db),
+):
+    repo = AsyncMovieRepository(db)
+    if query.ids:
+        ids = sync_movies._batch_ids([int(id) for id in query.ids.split(",")])
+        rows, missing = await repo.get_many_rows(ids, chunk_size=config.BULK_CHUNK_SIZE)
+        return sync_movies._batch_response(http_request, rows, missing)
+
+    rows, next_cursor = await repo.search_rows(
+        query.filters(), cursor=query.cursor, limit=query.limit, order_by=query.order_by
+    )
+
+    # en listados solo se usa ETag: una baja no cambia la fecha maxima de la pagina
+    etag = collection_etag("movies", [(row["id"], row["version"]) for row in rows], next_cursor)
+    if is_not_modified(http_request, etag, None):
+        return not_modified_response(etag, None)
+
+    # filas planas serializadas una sola vez, sin pasar por response_model
+    response = movie_list_response(rows, "Listado obtenido correctamente", next_cursor)
+    set_validators(response, etag, None)
+    return response
+
+@router.get("/{movie_id}", response_model=ApiResponse[MovieResponse])
+async def get_movie_by_id(
+    movie_id: int,
+    http_request: Request,
+    response: Response,
+    db: AsyncSession = Depends(async_db_connection.get_db),
+):
+    repo = AsyncMovieRepository(db)
+
+    if has_conditional_headers(http_request):
+        # consulta liviana de version antes de traer la fila completa
+        current = await repo.read_version(movie_id)
+        if current is not None:
+            version, updated_at = current
+            etag = entity_etag("movies", movie_id, version)
+            if is_not_modified(http_request, etag, updated_at):
+                return not_modified_response(etag, updated_at)
+
+    movie = await repo.read_by_id_or_fail(movie_id)
+    set_validators(response, entity_etag("movies", movie.id, movie.version), movie.updated_at)
+
+    return ApiResponse(
+        status="success",
+        message="La consulta fue realizada exitosamente",
+        errors=[],
+        data=MovieResponse.model_validate(movie)
+    )
+
+@router.patch("/{movie_id}", response_model=ApiResponse[MovieResponse])
+async def update_movie_by_id(
+    movie_id: int,
+    request: MovieUpdate,
+    http_request: Request,
+    response: Response,
+    db: AsyncSession = Depends(async_db_connection.get_db),
+):
+    repo = AsyncMovieRepository(db)
+
+    expected_version = None
+    if "if-match" in http_request.headers:
+        current = await repo.read_version(movie_id)
+        expected_version = if_match_version(http_request, "movies", movie_id, current[0] if current else None)
+
+    movie = await repo.update_by_id(movie_id, request.model_dump(exclude_unset=True), expected_version)
+    set_validators(response, entity_etag("movies", movie.id, movie.version), movie.updated_at)
+
+    return ApiResponse(
+        status="success",
+        message="La consulta fue realizada exitosamente",
+        errors=[],
+        data=MovieResponse.model_validate(movie)
+    )
+
+@router.delete(
+        "/{movie_id}"
+        , response_model=ApiResponse[DeleteMovieResponse]
+        , status_code=status.HTTP_200_OK
+)
+async def delete_movie_by_id(
+    movie_id: int,
+    db: AsyncSession = Depends(async_db_connection.get_db),
+):
+    repo = AsyncMovieRepository(db)
+    await repo.delete_by_id(movie_id)
+
+    return ApiResponse(
+        status="success",
+        message="Película eliminada correctamente",
+        errors=[],
+        data=DeleteMovieResponse(id=movie_id)
+    )
@@ -1,4 +1,4 @@
-from .movies import MovieBase, MovieCreate
+from .movies import MovieBase, MovieCreate, MovieFilters, MovieListQuery, MovieSearchQuery
 
 
-__all__ = ["MovieCreate", "MovieBase"]
\ No newline at end of file
+__all__ = ["MovieCreate", "MovieBase", "MovieFilters", "MovieListQuery", "MovieSearchQuery"]
\ No newline at end of file
@@ -51,4 +51,9 @@ class ApiResponse(BaseModel, Generic[T]):
     status: str
     message: str
     errors: List[str]
-    data: T
\ No newline at end of file
+    data: T
+
+class PagedApiResponse(ApiResponse[T], Generic[T]):
+    """Sobre de los listados paginados por cursor: next_cursor se envia como
+    cursor para pedir la pagina siguiente, null en la ultima."""
+    next_cursor: Optional[str] = None
\ No newline at end of file
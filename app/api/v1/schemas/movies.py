@@ -1,5 +1,6 @@
-from typing import Optional
-from pydantic import BaseModel, Field, field_validator
+from typing import Literal, Optional
+from typing_extensions import TypedDict
+from pydantic import BaseModel, Field, field_validator, model_validator
 from datetime import date
 
 class MovieBase(BaseModel):
@@ -60,6 +61,64 @@ class MovieUpdate(BaseModel):
     description: str | None = None
     is_watched: bool | None = None
 
+class MovieBulkUpdate(BaseModel):
+    """Modificacion de una pelicula en PATCH /bulk: los mismos rangos que
+    MovieBase, todos opcionales, y sin null en las columnas obligatorias."""
+    id: int
+    title: Optional[str] = Field(None, min_length=3, max_length=255)
+    director: Optional[str] = Field(None, min_length=1, max_length=100)
+    year: Optional[int] = Field(None, gt=1880, lt=2030)
+    genre: Optional[str] = Field(None, min_length=3, max_length=50)
+    price: Optional[float] = Field(None, gt=0.0)
+    duration: Optional[int] = Field(None, ge=1, le=600)
+    rating: Optional[int] = Field(None, ge=0, le=10)
+    description: Optional[str] = Field(None, max_length=1000)
+    is_watched: Optional[bool] = None
+
+    # solo corre con valores enviados: los campos omitidos no se validan
+    @field_validator('title', 'director', 'year', 'genre', 'price', 'is_watched')
+    @classmethod
+    def validate_not_null(cls, value):
+        if value is None:
+            raise ValueError('no puede ser null')
+        return value
+
+    @field_validator('title')
+    @classmethod
+    def validate_title(cls, value: str) -> str:
+        return MovieBase.validate_title(value)
+
+class MovieBulkDelete(BaseModel):
+    ids: list[int] = Field(..., min_length=1, description='Ids de las peliculas a eliminar')
+
+class MovieBatchGet(BaseModel):
+    ids: list[int] = Field(..., min_length=1, description='Ids de las peliculas, la respuesta respeta el orden')
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status: str
+    errors: list[str] = []
+
+class BulkOperationResponse(BaseModel):
+    processed: int
+    succeeded: int
+    failed: int
+    items: list[BulkItemResult]
+
+class ImportLineError(BaseModel):
+    line: int
+    errors: list[str]
+
+class ImportResponse(BaseModel):
+    processed: int
+    created: int
+    updated: int
+    # con upsert: filas repetidas dentro de un bloque, reemplazadas por la ultima
+    duplicates: int = 0
+    failed: int
+    errors: list[ImportLineError]
+
 class MovieResponse(BaseModel):
     id: int
     title: str
@@ -67,4 +126,73 @@ class MovieResponse(BaseModel):
 
     model_config = {
         "from_attributes": True
-    }
\ No newline at end of file
+    }
+
+class MovieBatchResponse(BaseModel):
+    items: list[MovieResponse]
+    missing: list[int]
+
+class MovieResponseRow(TypedDict):
+    """Mismos campos que MovieResponse, para serializar filas planas de la
+    base sin construir modelos (las claves de mas se ignoran)."""
+    id: int
+    title: str
+    year: int
+
+class MovieSuggestion(BaseModel):
+    id: int
+    title: str
+
+class MovieStats(BaseModel):
+    total: int
+    by_genre: dict[str, int]
+    by_decade: dict[str, int]
+    by_rating: dict[str, int]
+    watched: int
+    unwatched: int
+    avg_price: Optional[float]
+    avg_rating: Optional[float]
+    avg_duration: Optional[float]
+
+class MovieFilters(BaseModel):
+    genre: Optional[str] = Field(None, max_length=50, description='Genero exacto')
+    year_min: Optional[int] = Field(None, ge=1880, le=2030, description='Año minimo (inclusive)')
+    year_max: Optional[int] = Field(None, ge=1880, le=2030, description='Año maximo (inclusive)')
+    rating_min: Optional[int] = Field(None, ge=0, le=10, description='Calificacion minima (inclusive)')
+    rating_max: Optional[int] = Field(None, ge=0, le=10, description='Calificacion maxima (inclusive)')
+    price_min: Optional[float] = Field(None, ge=0.0, description='Precio minimo (inclusive)')
+    price_max: Optional[float] = Field(None, ge=0.0, description='Precio maximo (inclusive)')
+    is_watched: Optional[bool] = Field(None, description='Filtra por peliculas vistas / no vistas')
+    title: Optional[str] = Field(None, max_length=255, description='Prefijo del titulo')
+
+    @model_validator(mode='after')
+    def validate_ranges(self) -> 'MovieFilters':
+        for name in ('year', 'rating', 'price'):
+            minimum = getattr(self, f'{name}_min')
+            maximum = getattr(self, f'{name}_max')
+            if minimum is not None and maximum is not None and minimum > maximum:
+                raise ValueError(f'{name}_min no puede ser mayor que {name}_max')
+        return self
+
+    def filters(self) -> dict:
+        return self.model_dump(exclude_none=True, include=set(MovieFilters.model_fields))
+
+
+class MovieListQuery(MovieFilters):
+    ids: Optional[str] = Field(
+        None, pattern=r'^\d+(,\d+)*$',
+        description='Ids separados por coma: devuelve esas peliculas en ese orden (como POST /batch-get) e ignora filtros y paginacion'
+    )
+    cursor: Optional[str] = Field(None, description='Cursor devuelto en next_cursor por la pagina anterior')
+    limit: int = Field(100, ge=1, le=500, description='Cantidad maxima de peliculas por pagina')
+    order_by: str = Field(
+        'id', description="Campo de orden (id, title, year, genre, rating, price), '-' para descendente"
+    )
+
+class MovieSearchQuery(MovieFilters):
+    q: str = Field(..., min_length=1, max_length=200, description='Palabras a buscar en titulo, director y descripcion')
+    cursor: Optional[str] = Field(None, description='Cursor devuelto en next_cursor por la pagina anterior')
+    limit: int = Field(20, ge=1, le=100, description='Cantidad maxima de resultados por pagina')
+
+class MovieExportQuery(MovieFilters):
+    format: Literal['ndjson', 'csv'] = Field('ndjson', description='Formato de exportacion')
@@ -0,0 +1,95 @@
+"""Soporte de peticiones condicionales HTTP (ETag / Last-Modified)."""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, Optional
+
+from fastapi import HTTPException, Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    raw = ":".join(str(part) for part in parts)
+    return '"' + hashlib.sha1(raw.encode()).hexdigest() + '"'
+
+
+def entity_etag(namespace: str, id: int, version: int) -> str:
+    return make_etag(namespace, id, version)
+
+
+def collection_etag(namespace: str, versions: Iterable[tuple[int, int]], next_cursor: Optional[str]) -> str:
+    return make_etag(namespace, *(f"{id}.{version}" for id, version in versions), next_cursor)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # la base guarda fechas sin zona horaria, se asumen en UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(_as_utc(value).replace(microsecond=0), usegmt=True)
+
+
+def _etag_list(header: str) -> list[str]:
+    return [tag.strip().removeprefix("W/") for tag in header.split(",")]
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evalua If-None-Match y, si no viene, If-Modified-Since (RFC 9110 13.2.2)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = _etag_list(if_none_match)
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return _as_utc(last_modified).replace(microsecond=0) <= since
+    return False
+
+
+def has_conditional_headers(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def check_if_match(request: Request, etag: str) -> None:
+    """Control de concurrencia optimista: si el cliente envia If-Match y no
+    coincide con la version actual se responde 412."""
+    if_match = request.headers.get("if-match")
+    if if_match is None:
+        return
+    tags = [tag.strip() for tag in if_match.split(",")]
+    if "*" not in tags and etag not in tags:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="El recurso fue modificado, vuelva a obtenerlo antes de actualizar"
+        )
+
+
+def if_match_version(request: Request, namespace: str, id: int, current_version: Optional[int]) -> Optional[int]:
+    """Valida If-Match contra la version actual y la devuelve para condicionar
+    el UPDATE (WHERE version = ...): un cambio concurrente entre esta lectura y
+    la escritura tambien termina en 412. Sin version actual (no existe) se
+    devuelve None y el UPDATE responde 404."""
+    if current_version is None:
+        return None
+    check_if_match(request, entity_etag(namespace, id, current_version))
+    return current_version
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime]) -> None:
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime]) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag, last_modified)
+    return response
@@ -0,0 +1,128 @@
+import csv
+import io
+import json
+import logging
+from typing import IO, Any, Iterator, Optional
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.api.v1.schemas.movies import MovieCreate
+from app.core.database.repositories.movie_repository import MovieRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ImportFormatError(Exception):
+    pass
+
+
+def iter_csv_rows(stream: IO[bytes]) -> Iterator[tuple[int, Any]]:
+    """Lee el CSV linea a linea desde el archivo subido, sin cargarlo entero.
+    La primera fila es el encabezado con los nombres de las columnas."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    for row in reader:
+        # las celdas vacias se consideran valores no informados
+        yield reader.line_num, {k: (v if v != "" else None) for k, v in row.items() if k}
+
+
+def iter_ndjson_rows(stream: IO[bytes]) -> Iterator[tuple[int, Any]]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig")
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, ImportFormatError(f"JSON invalido: {e.msg}")
+
+
+class MovieImporter:
+    """Importa peliculas desde un iterador de filas, validando con MovieCreate
+    y escribiendo por bloques de chunk_size con las operaciones masivas del
+    repositorio. Con upsert=True las filas cuyo (title, year, director) ya
+    existe se actualizan en lugar de duplicarse, y las filas repetidas dentro
+    de un bloque se cuentan en duplicates (se escribe solo la ultima)."""
+
+    def __init__(self, session: Session, chunk_size: int = 500, upsert: bool = False, max_errors: int = 1000):
+        self.repo = MovieRepository(session)
+        self.chunk_size = chunk_size
+        self.upsert = upsert
+        self.max_errors = max_errors
+        self.processed = 0
+        self.created = 0
+        self.updated = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.errors: list[dict] = []
+
+    def run(self, rows: Iterator[tuple[int, Any]]) -> dict:
+        batch: list[dict] = []
+        for line_number, raw in rows:
+            self.processed += 1
+            movie = self._validate(line_number, raw)
+            if movie is None:
+                continue
+            batch.append(movie)
+            if len(batch) >= self.chunk_size:
+                self._flush(batch)
+                batch = []
+        if batch:
+            self._flush(batch)
+
+        return {
+            "processed": self.processed,
+            "created": self.created,
+            "updated": self.updated,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+    def _validate(self, line_number: int, raw: Any) -> Optional[dict]:
+        try:
+            if isinstance(raw, ImportFormatError):
+                raise raw
+            return MovieCreate.model_validate(raw).model_dump()
+        except ValidationError as e:
+            self._add_error(line_number, [
+                f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+                for error in e.errors()
+            ])
+        except ImportFormatError as e:
+            self._add_error(line_number, [str(e)])
+        return None
+
+    def _add_error(self, line_number: int, messages: list[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line_number, "errors": messages})
+
+    def _flush(self, batch: list[dict]) -> None:
+        if not self.upsert:
+            self.repo.bulk_create(batch, chunk_size=self.chunk_size)
+            self.created += len(batch)
+            return
+
+        # dentro del bloque gana la ultima fila de cada clave natural: si no, dos
+        # filas nuevas con la misma clave se insertarian duplicadas. Las que se
+        # descartan no crean ni actualizan nada: van a duplicates.
+        unique = {(row["title"], row["year"], row["director"]): row for row in batch}
+        self.duplicates += len(batch) - len(unique)
+
+        existing = self.repo.find_ids_by_natural_key(list(unique))
+        to_create, to_update = [], []
+        for key, row in unique.items():
+            movie_id = existing.get(key)
+            if movie_id is None:
+                to_create.append(row)
+            else:
+                to_update.append({"id": movie_id, **row})
+
+        if to_create:
+            self.repo.bulk_create(to_create, chunk_size=self.chunk_size)
+        if to_update:
+            self.repo.bulk_update(to_update, chunk_size=self.chunk_size)
+        self.created += len(to_create)
+        self.updated += len(to_update)
@@ -0,0 +1,54 @@
+"""Respuestas JSON pre-serializadas para los listados.
+
+El camino normal (modelos pydantic por fila dentro de ApiResponse, validados
+de nuevo contra response_model y codificados con json) valida dos veces cada
+fila. Aca las filas planas se serializan una sola vez con pydantic-core y se
+insertan en el sobre de ApiResponse (o PagedApiResponse) ya renderizado."""
+import json
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.api.v1.schemas.movies import MovieResponseRow
+
+movie_rows_adapter = TypeAdapter(list[MovieResponseRow])
+
+
+@lru_cache(maxsize=64)
+def _envelope_prefix(status: str, message: str) -> bytes:
+    return (
+        '{"status":' + json.dumps(status, ensure_ascii=False)
+        + ',"message":' + json.dumps(message, ensure_ascii=False)
+        + ',"errors":[],"data":'
+    ).encode()
+
+
+def render_envelope(data: bytes, message: str, status: str = "success") -> bytes:
+    """JSON de ApiResponse alrededor de data ya serializado."""
+    return b"".join((_envelope_prefix(status, message), data, b"}"))
+
+
+def render_paged_envelope(data: bytes, message: str, next_cursor: Optional[str], status: str = "success") -> bytes:
+    """JSON de PagedApiResponse: el de ApiResponse mas next_cursor."""
+    return b"".join((
+        _envelope_prefix(status, message),
+        data,
+        b',"next_cursor":',
+        json.dumps(next_cursor).encode(),
+        b"}",
+    ))
+
+
+def movie_batch_response(rows: list[dict], missing: list[int], message: str) -> Response:
+    """Sobre de ApiResponse[MovieBatchResponse]: {"items": [...], "missing": [...]}."""
+    data = b"".join((b'{"items":', movie_rows_adapter.dump_json(rows), b',"missing":', json.dumps(missing).encode(), b"}"))
+    return Response(content=render_envelope(data, message), media_type="application/json")
+
+
+def movie_list_response(rows: list[dict], message: str, next_cursor: Optional[str] = None) -> Response:
+    return Response(
+        content=render_paged_envelope(movie_rows_adapter.dump_json(rows), message, next_cursor),
+        media_type="application/json",
+    )
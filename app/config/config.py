@@ -1,4 +1,4 @@
-from typing import List, Optional, ClassVar
+from typing import List, Literal, Optional, ClassVar
 import os
 from typing import Optional
 from dotenv import load_dotenv
@@ -20,6 +20,105 @@ class Config(BaseSettings):
     DB_HOST: str = Field(default="localhost", env="DB_HOST")
     DB_PORT: str = Field(default="3306", env="DB_PORT")
     DB_NAME: str = Field(default="catalogfilms", env="DB_NAME")
+    # URL completa del primario, reemplaza a DB_USER/DB_HOST/... (p.ej. sqlite:///primary.db)
+    DB_URL: Optional[str] = Field(default=None, env="DB_URL")
+
+    # Replicas de lectura: URLs separadas por coma. Las lecturas van por round
+    # robin a las replicas sanas; escrituras, requests que no son GET/HEAD o que
+    # envian DB_PRIMARY_HEADER, y los del cliente que escribio hace menos de
+    # DB_REPLICA_MAX_LAG_SECONDS (cookie DB_WRITE_COOKIE) van al primario.
+    # DB_REPLICA_GLOBAL_WRITE_WINDOW manda al primario todas las lecturas del
+    # proceso durante esa ventana despues de cualquier escritura. Lo leido de
+    # una replica dentro de esa ventana no se guarda en el cache de lecturas
+    DB_REPLICA_URLS: str = Field(default="", env="DB_REPLICA_URLS")
+    DB_REPLICA_HEALTH_INTERVAL_SECONDS: float = Field(default=5.0, env="DB_REPLICA_HEALTH_INTERVAL_SECONDS")
+    DB_REPLICA_MAX_LAG_SECONDS: float = Field(default=2.0, env="DB_REPLICA_MAX_LAG_SECONDS")
+    DB_REPLICA_GLOBAL_WRITE_WINDOW: bool = Field(default=False, env="DB_REPLICA_GLOBAL_WRITE_WINDOW")
+    DB_PRIMARY_HEADER: str = Field(default="X-Read-Primary", env="DB_PRIMARY_HEADER")
+    DB_WRITE_COOKIE: str = Field(default="db_last_write", env="DB_WRITE_COOKIE")
+
+    # Pool de conexiones. DB_POOL_CLASS="null" abre una conexion por uso y la
+    # cierra, para despliegues serverless (en Vercel es el default); el pool
+    # mantiene DB_POOL_SIZE conexiones y abre hasta DB_MAX_OVERFLOW extra. El
+    # threadpool de FastAPI corre hasta 40 endpoints sync a la vez: con
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW >= 40 ningun request espera por conexion.
+    DB_POOL_CLASS: Literal["queue", "null"] = Field(
+        default="null" if os.getenv("VERCEL") else "queue", env="DB_POOL_CLASS"
+    )
+    DB_POOL_SIZE: int = Field(default=10, env="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: int = Field(default=30, env="DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: float = Field(default=30.0, env="DB_POOL_TIMEOUT")
+    DB_POOL_RECYCLE: int = Field(default=3600, env="DB_POOL_RECYCLE")
+    # pre-ping agrega un SELECT 1 en cada checkout; sin el, las conexiones
+    # caidas se invalidan al fallar (todo el pool ante una desconexion) y el
+    # chequeo periodico detecta la caida antes que los requests
+    DB_POOL_PRE_PING: bool = Field(default=True, env="DB_POOL_PRE_PING")
+    DB_POOL_LIVENESS_INTERVAL_SECONDS: float = Field(default=0.0, env="DB_POOL_LIVENESS_INTERVAL_SECONDS")
+
+    # /health/ready responde con el resultado de un chequeo en segundo plano
+    # cada HEALTH_CHECK_INTERVAL_SECONDS; deja de estar listo si el primario no
+    # responde o algun pool supera HEALTH_MAX_POOL_SATURATION (en uso / maximo)
+    HEALTH_CHECK_INTERVAL_SECONDS: float = Field(default=5.0, env="HEALTH_CHECK_INTERVAL_SECONDS")
+    HEALTH_MAX_POOL_SATURATION: float = Field(default=1.0, env="HEALTH_MAX_POOL_SATURATION")
+
+    # Stack async opcional: endpoints async def sobre create_async_engine
+    DB_ASYNC: bool = Field(default=False, env="DB_ASYNC")
+    DB_ASYNC_DRIVER: str = Field(default="aiomysql", env="DB_ASYNC_DRIVER")
+    DB_ASYNC_URL: Optional[str] = Field(default=None, env="DB_ASYNC_URL")
+
+    # Operaciones masivas
+    BULK_CHUNK_SIZE: int = Field(default=500, env="BULK_CHUNK_SIZE")
+    BULK_MAX_ITEMS: int = Field(default=10000, env="BULK_MAX_ITEMS")
+    # ids por consulta de POST /movies/batch-get y GET /movies/?ids=
+    BATCH_GET_MAX_IDS: int = Field(default=1000, env="BATCH_GET_MAX_IDS")
+    EXPORT_BATCH_SIZE: int = Field(default=1000, env="EXPORT_BATCH_SIZE")
+    IMPORT_MAX_ERRORS: int = Field(default=1000, env="IMPORT_MAX_ERRORS")
+
+    # Cache de lecturas
+    CACHE_ENABLED: bool = Field(default=True, env="CACHE_ENABLED")
+    CACHE_MAX_ENTRIES: int = Field(default=10000, env="CACHE_MAX_ENTRIES")
+    CACHE_TTL_SECONDS: float = Field(default=60.0, env="CACHE_TTL_SECONDS")
+    # lecturas identicas concurrentes (por id y por listado/filtros) hacen una
+    # sola consulta y comparten el resultado, con o sin cache
+    SINGLE_FLIGHT_ENABLED: bool = Field(default=True, env="SINGLE_FLIGHT_ENABLED")
+
+    # Token y client key aceptados sin consultar la base (backend laravel)
+    FORCED_VALID_TOKEN: Optional[str] = Field(default=None, env="FORCED_VALID_TOKEN")
+    FORCED_CLIENT_KEY: Optional[str] = Field(default=None, env="FORCED_CLIENT_KEY")
+
+    # Base de sesiones de usuarios (verificacion de tokens)
+    SESSIONS_DB_URL: Optional[str] = Field(default=None, env="SESSIONS_DB_URL")
+    SESSIONS_TABLE: str = Field(default="usuarios_sessions", env="SESSIONS_TABLE")
+    SESSIONS_DB_POOL_SIZE: int = Field(default=3, env="SESSIONS_DB_POOL_SIZE")
+    SESSIONS_BATCH_WINDOW_MS: float = Field(default=2.0, env="SESSIONS_BATCH_WINDOW_MS")
+    SESSIONS_BATCH_MAX_SIZE: int = Field(default=100, env="SESSIONS_BATCH_MAX_SIZE")
+
+    # Cache de tokens verificados
+    TOKEN_CACHE_MAX_ENTRIES: int = Field(default=10000, env="TOKEN_CACHE_MAX_ENTRIES")
+    TOKEN_CACHE_TTL_SECONDS: float = Field(default=1200.0, env="TOKEN_CACHE_TTL_SECONDS")
+    TOKEN_CACHE_NEGATIVE_TTL_SECONDS: float = Field(default=30.0, env="TOKEN_CACHE_NEGATIVE_TTL_SECONDS")
+    TOKEN_CACHE_SHARDS: int = Field(default=16, env="TOKEN_CACHE_SHARDS")
+    TOKEN_CACHE_SWEEP_INTERVAL_SECONDS: float = Field(default=60.0, env="TOKEN_CACHE_SWEEP_INTERVAL_SECONDS")
+
+    # Busqueda de texto completo en MySQL: las palabras mas cortas que
+    # innodb_ft_min_token_size no estan en el indice FULLTEXT y se ignoran
+    SEARCH_MYSQL_MIN_TOKEN_SIZE: int = Field(default=3, env="SEARCH_MYSQL_MIN_TOKEN_SIZE")
+
+    # Autocompletado de titulos en memoria
+    AUTOCOMPLETE_ENABLED: bool = Field(default=True, env="AUTOCOMPLETE_ENABLED")
+    AUTOCOMPLETE_MEMORY_BUDGET_MB: float = Field(default=256.0, env="AUTOCOMPLETE_MEMORY_BUDGET_MB")
+
+    # Facetas y promedios del catalogo en memoria (/movies/stats); con varios
+    # procesos conviene STATS_REFRESH_SECONDS > 0 para ver las escrituras de los demas
+    STATS_ENABLED: bool = Field(default=True, env="STATS_ENABLED")
+    STATS_REFRESH_SECONDS: float = Field(default=0.0, env="STATS_REFRESH_SECONDS")
+
+    # Diagnostico de consultas (slow query log y deteccion de N+1), apagado por defecto
+    DB_DIAGNOSTICS: bool = Field(default=False, env="DB_DIAGNOSTICS")
+    DB_SLOW_QUERY_MS: float = Field(default=200.0, env="DB_SLOW_QUERY_MS")
+    DB_EXPLAIN_SLOW_QUERIES: bool = Field(default=True, env="DB_EXPLAIN_SLOW_QUERIES")
+    DB_MAX_QUERIES_PER_REQUEST: int = Field(default=20, env="DB_MAX_QUERIES_PER_REQUEST")
+    DB_REPEATED_STATEMENT_THRESHOLD: int = Field(default=5, env="DB_REPEATED_STATEMENT_THRESHOLD")
 
     AUTH_EXCLUDED_PATHS: List[str] = [
         "/docs",
@@ -65,6 +164,8 @@ class DevelopmentConfig(Config):
     DEBUG: bool = True
     LOG_LEVEL: str = "DEBUG"
     LOG_FILE: Optional[str] = "/var/log/app_dev.log"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 5
 
 class TestingConfig(Config):
     DEBUG: bool = True
@@ -76,6 +177,8 @@ class ProductionConfig(Config):
     DEBUG: bool = False
     LOG_LEVEL: str = "ERROR"
     LOG_FILE: Optional[str] = "/var/log/app.log"
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_LIVENESS_INTERVAL_SECONDS: float = 15.0
 
     
 
@@ -0,0 +1,17 @@
+from app.config.config import config
+
+from .backends import CacheBackend, CacheStats, InMemoryLRUCache
+from .repository_cache import RepositoryCache
+from .single_flight import AsyncSingleFlight, SingleFlight
+
+
+def build_cache_backend() -> CacheBackend:
+    return InMemoryLRUCache(
+        max_entries=config.CACHE_MAX_ENTRIES,
+        default_ttl=config.CACHE_TTL_SECONDS,
+    )
+
+# backend compartido por todos los repositorios del proceso
+cache_backend = build_cache_backend()
+
+__all__ = ["CacheBackend", "CacheStats", "InMemoryLRUCache", "RepositoryCache", "SingleFlight", "AsyncSingleFlight", "cache_backend", "build_cache_backend"]
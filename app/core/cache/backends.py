@@ -0,0 +1,149 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "sets": self.sets,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class CacheBackend(ABC):
+    """Interfaz minima de un almacen clave/valor para el cache de lecturas.
+
+    Los valores son filas planas y paginas de filas: dict, list y tuple con
+    str, int, float, bool, None, Decimal y datetime. Una implementacion
+    compartida (por ejemplo Redis) debe serializarlos conservando esos tipos
+    (pickle, o JSON con marcas de tipo): json.dumps solo no alcanza, y
+    devolver Decimal como float o datetime como str cambia las respuestas y
+    los Last-Modified.
+
+    Los contadores (incr/counter) son los numeros de generacion de
+    RepositoryCache: tienen que ser atomicos y compartidos entre procesos, y
+    no pueden vencer ni desalojarse como las demas claves (en Redis: INCR
+    sobre una clave sin TTL y una politica volatile-*).
+    """
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """Incrementa el contador key y devuelve el valor nuevo (1 si no existia)."""
+
+    @abstractmethod
+    def counter(self, key: str) -> int:
+        """Valor actual del contador key, 0 si no existe."""
+
+    def size(self) -> int:
+        return 0
+
+    def info(self) -> dict:
+        return {"backend": type(self).__name__, "size": self.size(), **self.stats.as_dict()}
+
+
+class InMemoryLRUCache(CacheBackend):
+    """Cache LRU en memoria del proceso, acotado por cantidad de entradas y con
+    TTL por entrada. Los vencidos se descartan al leerlos. Los contadores van
+    aparte y no cuentan para el limite de entradas."""
+
+    def __init__(self, max_entries: int = 10000, default_ttl: Optional[float] = 60.0):
+        super().__init__()
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._data: OrderedDict[str, tuple[Optional[float], Any]] = OrderedDict()
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            self.stats.sets += 1
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                if self._data.pop(key, None) is not None:
+                    self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = self._counters[key] = self._counters.get(key, 0) + 1
+            return value
+
+    def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def purge_expired(self) -> int:
+        """Descarta las entradas vencidas sin esperar a que se lean."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, (expires_at, _) in self._data.items() if expires_at is not None and expires_at <= now]
+            for key in expired:
+                del self._data[key]
+            self.stats.expirations += len(expired)
+        return len(expired)
+
+    def size(self) -> int:
+        return len(self._data)
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Iterable, Optional
+
+from .backends import CacheBackend
+
+
+class RepositoryCache:
+    """Cache de lecturas de un repositorio: entidades por id y paginas de
+    listado. Las escrituras borran las entidades afectadas e invalidan todas
+    las paginas, porque cualquier alta o cambio puede mover filas entre paginas.
+
+    Cada escritura incrementa un numero de generacion que tambien forma parte
+    de las claves de listado: las paginas anteriores quedan inalcanzables sin
+    recorrer el cache, y salen solas por LRU o TTL. La generacion es un
+    contador del backend, asi que con un backend compartido una escritura en
+    un proceso invalida las paginas de todos.
+
+    Para no volver a guardar un valor leido antes de una escritura concurrente,
+    la lectura toma la generacion con begin_read() y solo se guarda si ninguna
+    escritura ocurrio en el medio. Entre procesos la comparacion y el set no
+    son atomicos: una entidad leida justo antes de una escritura de otro
+    proceso puede quedar guardada hasta su TTL.
+
+    invalidate() tambien anota en el backend cuando fue la ultima escritura,
+    para que written_within() sepa, en cualquier proceso, si una lectura de
+    una replica puede ser anterior a ella.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: Optional[float] = None):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._generation_key = f"{namespace}:generation"
+        self._written_key = f"{namespace}:written"
+
+    def _entity_key(self, id: int) -> str:
+        return f"{self.namespace}:id:{id}"
+
+    def list_key(self, **params: Any) -> str:
+        raw = json.dumps(params, sort_keys=True, default=str)
+        return f"{self.namespace}:list:{self.begin_read()}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+    def begin_read(self) -> int:
+        return self.backend.counter(self._generation_key)
+
+    def get_entity(self, id: int) -> Optional[dict]:
+        return self.backend.get(self._entity_key(id))
+
+    def set_entity(self, id: int, row: dict, version: int) -> None:
+        with self._lock:
+            if version == self.begin_read():
+                self.backend.set(self._entity_key(id), row, self.ttl)
+
+    def set_entities(self, rows: dict[int, dict], version: int) -> None:
+        with self._lock:
+            if version == self.begin_read():
+                for id, row in rows.items():
+                    self.backend.set(self._entity_key(id), row, self.ttl)
+
+    def get_list(self, key: str) -> Optional[Any]:
+        return self.backend.get(key)
+
+    def set_list(self, key: str, value: Any, version: int) -> None:
+        with self._lock:
+            if version == self.begin_read():
+                self.backend.set(key, value, self.ttl)
+
+    def written_within(self, seconds: float) -> bool:
+        written = self.backend.get(self._written_key)
+        return written is not None and time.time() - written < seconds
+
+    def invalidate(self, ids: Iterable[int] = ()) -> None:
+        keys = [self._entity_key(id) for id in ids]
+        with self._lock:
+            self.backend.incr(self._generation_key)
+            self.backend.set(self._written_key, time.time(), self.ttl)
+            if keys:
+                self.backend.delete(*keys)
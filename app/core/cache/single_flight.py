@@ -0,0 +1,123 @@
+import asyncio
+import hashlib
+import json
+import threading
+from typing import Any, Awaitable, Callable, TypeVar
+
+from app.core.metrics import single_flight_calls_total
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Agrupa lecturas identicas en curso: el primer hilo que pide una clave
+    ejecuta la consulta y los que llegan mientras tanto esperan y reciben el
+    mismo resultado (o la misma excepcion), en lugar de repetir el SELECT.
+
+    El resultado se comparte entre todos los que esperaban: debe ser de solo
+    lectura y no estar atado a una sesion (filas planas, no entidades ORM).
+
+    forget() lo llaman las escrituras: las lecturas que empiezan despues de
+    un commit no se suman a una consulta que arranco antes y podria devolver
+    datos previos a la escritura.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(*parts: Any, **params: Any) -> str:
+        raw = json.dumps([parts, params], sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            single_flight_calls_total.inc(name=self.name, result="shared")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        single_flight_calls_total.inc(name=self.name, result="leader")
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    def forget(self) -> None:
+        with self._lock:
+            self._calls.clear()
+
+    def info(self) -> dict:
+        leaders = single_flight_calls_total.value(name=self.name, result="leader")
+        shared = single_flight_calls_total.value(name=self.name, result="shared")
+        return {
+            "in_flight": len(self._calls),
+            "queries": int(leaders),
+            "queries_saved": int(shared),
+            "saved_ratio": round(shared / (leaders + shared), 4) if leaders + shared else 0.0,
+        }
+
+
+class AsyncSingleFlight(SingleFlight):
+    """Version para corrutinas: los que esperan hacen await de un Future en
+    lugar de bloquear un hilo. Las claves en curso son del event loop que las
+    creo; un proceso corre un solo loop, asi que basta con un dict."""
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._calls.get(key)
+        if future is not None:
+            single_flight_calls_total.inc(name=self.name, result="shared")
+            try:
+                # shield: si este request se cancela, no cancela el Future de los demas
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+            # se cancelo el request que hacia la consulta: se repite con la propia
+            return await self.do(key, fn)
+
+        single_flight_calls_total.inc(name=self.name, result="leader")
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # sin esperas pendientes, evita el aviso de "exception was never retrieved"
+            future.exception()
+            raise
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def forget(self) -> None:
+        self._calls.clear()
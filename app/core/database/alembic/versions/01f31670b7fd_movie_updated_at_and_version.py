@@ -0,0 +1,30 @@
+"""movie updated_at and version
+
+Revision ID: 01f31670b7fd
+Revises: 170f7a4beb35
+Create Date: 2026-10-18 12:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '01f31670b7fd'
+down_revision: Union[str, Sequence[str], None] = '170f7a4beb35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('movies', sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+    op.add_column('movies', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('movies', 'version')
+    op.drop_column('movies', 'updated_at')
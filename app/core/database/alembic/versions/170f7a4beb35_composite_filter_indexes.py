@@ -0,0 +1,30 @@
+"""composite filter indexes
+
+Revision ID: 170f7a4beb35
+Revises: 8974c06de62a
+Create Date: 2026-10-18 11:57:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '170f7a4beb35'
+down_revision: Union[str, Sequence[str], None] = '8974c06de62a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_movies_genre_year', 'movies', ['genre', 'year'], unique=False)
+    op.create_index('ix_movies_is_watched_rating', 'movies', ['is_watched', 'rating'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movies_is_watched_rating', table_name='movies')
+    op.drop_index('ix_movies_genre_year', table_name='movies')
@@ -0,0 +1,46 @@
+"""movies fulltext search
+
+Revision ID: 5c2e9a41d7b3
+Revises: 01f31670b7fd
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# el DDL de FTS5 se declara una sola vez, junto al modelo
+from app.core.database.models.fulltext import SQLITE_FTS_CREATE, SQLITE_FTS_DROP
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e9a41d7b3'
+down_revision: Union[str, Sequence[str], None] = '01f31670b7fd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect in ('mysql', 'mariadb'):
+        op.create_index(
+            'ix_movies_fulltext', 'movies', ['title', 'director', 'description'],
+            unique=False, mysql_prefix='FULLTEXT',
+        )
+    elif dialect == 'sqlite':
+        for statement in SQLITE_FTS_CREATE:
+            op.execute(statement)
+        # indexa las filas existentes
+        op.execute("INSERT INTO movies_fts(movies_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect in ('mysql', 'mariadb'):
+        op.drop_index('ix_movies_fulltext', table_name='movies')
+    elif dialect == 'sqlite':
+        for statement in SQLITE_FTS_DROP:
+            op.execute(statement)
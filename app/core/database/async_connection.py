@@ -0,0 +1,68 @@
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.config.config import config
+from app.core.metrics.sql import instrument_engine, pool_stats
+from .diagnostics import attach_diagnostics
+from .pool import pool_options
+from typing import AsyncGenerator
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabaseConnection:
+    """Equivalente async de DatabaseConnection. Solo se instancia cuando
+    DB_ASYNC esta habilitado, ya que requiere el driver async (aiomysql, o
+    aiosqlite para pruebas locales)."""
+
+    def __init__(self):
+        self.engine = None
+        self.SessionLocal = None
+        self.diagnostics = None
+        self._initialize_connection()
+
+    def _initialize_connection(self):
+        try:
+            database_url = self._build_database_url()
+            engine_options = {"echo": config.DEBUG}
+            if not database_url.startswith("sqlite"):
+                engine_options.update(pool_options(async_engine=True))
+            self.engine = create_async_engine(database_url, **engine_options)
+            instrument_engine(self.engine.sync_engine, name="catalog_async")
+            self.diagnostics = attach_diagnostics(self.engine.sync_engine)
+            self.SessionLocal = async_sessionmaker(
+                autoflush=False,
+                expire_on_commit=False,
+                bind=self.engine
+            )
+            logger.info("Conexión async a base de datos inicializada correctamente")
+        except Exception as e:
+            logger.error(f"Error al inicializar la conexión async a la base de datos: {e}")
+            raise
+
+    def _build_database_url(self):
+        if config.DB_ASYNC_URL:
+            return config.DB_ASYNC_URL
+        return (
+            f"mysql+{config.DB_ASYNC_DRIVER}://{config.DB_USER}:{config.DB_PASSWORD}"
+            f"@{config.DB_HOST}:{config.DB_PORT}/{config.DB_NAME}?charset=utf8mb4"
+        )
+
+    async def get_db(self) -> AsyncGenerator[AsyncSession, None]:
+        if not self.SessionLocal:
+            raise RuntimeError("Base de datos aún no inicializada")
+
+        async with self.SessionLocal() as db:
+            yield db
+
+    def pool_stats(self) -> dict:
+        return pool_stats(self.engine.sync_engine)
+
+    async def close_connection(self):
+        if self.engine:
+            await self.engine.dispose()
+            logger.info("Conexión async a la base de datos cerrada correctamente")
+        else:
+            logger.warning("No hay conexión async a la base de datos para cerrar")
+
+# Instancia global, se crea al importar el modulo (solo si DB_ASYNC esta activo)
+async_db_connection = AsyncDatabaseConnection()
@@ -2,9 +2,16 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import create_engine
 from app.config.config import config
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Generator, Optional
+from contextlib import contextmanager
 import logging
 from .models import Base
+from app.core.metrics.sql import instrument_engine, pool_stats
+from .diagnostics import attach_diagnostics
+from .health import ReadinessMonitor
+from .pool import PoolLivenessCheck, connect_args, pool_options
+from .replicas import ReplicaRouter, RoutingSession
+from fastapi import Request
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +20,10 @@ class DatabaseConnection:
     def __init__(self):
         self.engine = None
         self.SessionLocal = None
+        self.diagnostics = None
+        self.liveness = None
+        self.replicas = None
+        self.readiness = None
         self._initialize_connection()
 
     def _initialize_connection(self):
@@ -20,15 +31,31 @@ class DatabaseConnection:
             database_url = self._build_database_url()
             self.engine = create_engine(
                 database_url,
-                pool_size=10,
-                max_overflow=20,
-                pool_pre_ping=True,
-                pool_recycle=3600,
-                pool_timeout=30,
-                echo=config.DEBUG
-
+                echo=config.DEBUG,
+                connect_args=connect_args(database_url),
+                **pool_options()
+            )
+            instrument_engine(self.engine)
+            self.diagnostics = attach_diagnostics(self.engine)
+            self.liveness = PoolLivenessCheck(self.engine, config.DB_POOL_LIVENESS_INTERVAL_SECONDS)
+            replica_urls = [url.strip() for url in config.DB_REPLICA_URLS.split(",") if url.strip()]
+            if replica_urls:
+                self.replicas = ReplicaRouter(
+                    replica_urls,
+                    health_interval=config.DB_REPLICA_HEALTH_INTERVAL_SECONDS,
+                    max_lag_seconds=config.DB_REPLICA_MAX_LAG_SECONDS,
+                    global_write_window=config.DB_REPLICA_GLOBAL_WRITE_WINDOW,
+                )
+                logger.info(f"Lecturas distribuidas entre {len(replica_urls)} replicas")
+            self.readiness = ReadinessMonitor(
+                self.liveness,
+                interval=config.HEALTH_CHECK_INTERVAL_SECONDS,
+                max_saturation=config.HEALTH_MAX_POOL_SATURATION,
+                replicas=self.replicas,
             )
             self.SessionLocal = sessionmaker(
+                class_=RoutingSession,
+                router=self.replicas,
                 autocommit=False,
                 autoflush=False,
                 bind=self.engine
@@ -39,6 +66,8 @@ class DatabaseConnection:
             raise
 
     def _build_database_url(self):
+        if config.DB_URL:
+            return config.DB_URL
         # Base de datos
         db_user = config.DB_USER
         db_password = config.DB_PASSWORD
@@ -47,7 +76,37 @@ class DatabaseConnection:
         db_name = config.DB_NAME
         return f"mysql+pymysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}?charset=utf8mb4"
 
-    def get_db(self) -> Generator[Session, None, None]:
+    def get_db(self, request: Request) -> Generator[Session, None, None]:
+        if not self.SessionLocal:
+            raise RuntimeError("Base de datos aún no inicializada")
+
+        db = self.SessionLocal()
+        # los requests de escritura, los que lo piden y los del cliente que acaba
+        # de escribir leen del primario, para ver sus propias escrituras aunque
+        # las replicas esten atrasadas
+        if (
+            request.method not in ("GET", "HEAD")
+            or request.headers.get(config.DB_PRIMARY_HEADER)
+            or self.replicas is not None and self.replicas.written_since(self._write_cookie(request))
+        ):
+            db.info["primary"] = True
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @staticmethod
+    def _write_cookie(request: Request) -> Optional[float]:
+        try:
+            return float(request.cookies[config.DB_WRITE_COOKIE])
+        except (KeyError, ValueError):
+            return None
+
+    @contextmanager
+    def get_session(self) -> Generator[Session, None, None]:
+        """Sesion fuera del ciclo de dependencias de FastAPI, por ejemplo para
+        respuestas en streaming que siguen leyendo despues de que el endpoint retorna
+        o para scripts."""
         if not self.SessionLocal:
             raise RuntimeError("Base de datos aún no inicializada")
 
@@ -73,7 +132,27 @@ class DatabaseConnection:
             logger.error(f"Error al eliminar tablas: {e}")
             raise
 
+    def pool_stats(self) -> dict:
+        stats = pool_stats(self.engine)
+        stats["liveness"] = self.liveness.info() if self.liveness.interval > 0 else None
+        stats["replicas"] = self.replicas.info() if self.replicas is not None else None
+        return stats
+
+    def start_health_checks(self):
+        self.liveness.start()
+        if self.replicas is not None:
+            self.replicas.start()
+        # primer resultado antes de recibir trafico, despues en segundo plano
+        self.readiness.refresh()
+        self.readiness.start()
+
     def close_connection(self):
+        if self.readiness:
+            self.readiness.stop()
+        if self.liveness:
+            self.liveness.stop()
+        if self.replicas is not None:
+            self.replicas.close()
         if self.engine:
             self.engine.dispose()
             logger.info("Conexión a la base de datos cerrada correctamente")
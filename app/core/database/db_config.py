@@ -1,6 +1,6 @@
 from app.config.config import config
 
-DATABASE_URL = (
+DATABASE_URL = config.DB_URL or (
     f"mysql+pymysql://{config.DB_USER}:"
     f"{config.DB_PASSWORD}@"
     f"{config.DB_HOST}:"
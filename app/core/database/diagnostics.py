@@ -0,0 +1,147 @@
+import logging
+import re
+import time
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config.config import config
+from app.core.metrics.request_context import current_request_stats
+
+logger = logging.getLogger(__name__)
+
+# IN (?, ?, ?) / IN (%s, %s) / IN (%(id_1)s, ...) se reducen a IN (...) para que
+# listas de distinto largo cuenten como la misma forma de sentencia
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_EXPLAIN_PREFIX = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "mysql": "EXPLAIN ",
+    "mariadb": "EXPLAIN ",
+    "postgresql": "EXPLAIN ",
+}
+
+
+def statement_shape(statement: str) -> str:
+    return _PLACEHOLDER_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def parameters_shape(parameters: Any, executemany: bool = False) -> str:
+    """Tipos de los parametros ligados, sin sus valores (no se loguean datos)."""
+    if executemany and parameters and isinstance(parameters[0], (list, tuple, dict)):
+        parameters = list(parameters)
+        first = parameters_shape(parameters[0]) if parameters else "()"
+        return f"{len(parameters)} x {first}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+class QueryDiagnostics:
+    """Modo diagnostico opt-in (DB_DIAGNOSTICS) para el engine de la base.
+
+    - Loguea las sentencias que superan DB_SLOW_QUERY_MS junto con la forma de
+      sus parametros y, para los SELECT, el plan de ejecucion (EXPLAIN).
+    - Dentro de un request cuenta las sentencias y avisa una sola vez si se
+      superan DB_MAX_QUERIES_PER_REQUEST o si la misma forma de sentencia se
+      repite DB_REPEATED_STATEMENT_THRESHOLD veces (patron N+1).
+    """
+
+    def __init__(
+        self,
+        slow_query_ms: float = None,
+        explain: bool = None,
+        max_queries_per_request: int = None,
+        repeated_statement_threshold: int = None,
+    ):
+        self.slow_query_seconds = (slow_query_ms if slow_query_ms is not None else config.DB_SLOW_QUERY_MS) / 1000
+        self.explain = explain if explain is not None else config.DB_EXPLAIN_SLOW_QUERIES
+        self.max_queries_per_request = max_queries_per_request or config.DB_MAX_QUERIES_PER_REQUEST
+        self.repeated_statement_threshold = repeated_statement_threshold or config.DB_REPEATED_STATEMENT_THRESHOLD
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        logger.info(
+            f"Diagnostico de consultas activo (lentas > {self.slow_query_seconds * 1000:.0f} ms, "
+            f"max {self.max_queries_per_request} por request)"
+        )
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("diagnostics_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["diagnostics_start"].pop()
+
+        if elapsed >= self.slow_query_seconds:
+            self._log_slow_query(conn, context, statement, parameters, executemany, elapsed)
+
+        stats = current_request_stats()
+        if stats is not None:
+            self._track_request(stats, statement)
+
+    def _log_slow_query(self, conn, context, statement, parameters, executemany, elapsed) -> None:
+        plan = None
+        if self.explain and not executemany:
+            plan = self._explain(conn, context, statement, parameters)
+        logger.warning(
+            "Consulta lenta (%.1f ms): %s | parametros: %s%s",
+            elapsed * 1000,
+            statement_shape(statement),
+            parameters_shape(parameters, executemany),
+            f"\n{plan}" if plan else "",
+        )
+
+    def _explain(self, conn, context, statement, parameters) -> Optional[str]:
+        prefix = _EXPLAIN_PREFIX.get(conn.dialect.name)
+        if prefix is None or statement.split(None, 1)[0].upper() not in ("SELECT", "WITH"):
+            return None
+        if context is not None and context.execution_options.get("stream_results"):
+            # con un cursor del lado del servidor abierto no se puede ejecutar otra sentencia
+            return None
+        try:
+            cursor = conn.connection.dbapi_connection.cursor()
+            try:
+                cursor.execute(prefix + statement, parameters)
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception as e:
+            logger.debug("No se pudo obtener el EXPLAIN: %s", e)
+            return None
+        return "\n".join(" | ".join(str(col) for col in row) for row in rows)
+
+    def _track_request(self, stats, statement: str) -> None:
+        shape = statement_shape(statement)
+        count = stats.statements.get(shape, 0) + 1
+        stats.statements[shape] = count
+
+        if count >= self.repeated_statement_threshold and shape not in stats.warned:
+            stats.warned.add(shape)
+            logger.warning(
+                "Posible N+1 en %s %s: la misma sentencia se ejecuto %s veces: %s",
+                stats.method, stats.path, count, shape,
+            )
+        # stats.queries lo incrementa la instrumentacion de metricas; aca se cuenta
+        # por forma para no depender del orden de los listeners
+        total = sum(stats.statements.values())
+        if total > self.max_queries_per_request and "__total__" not in stats.warned:
+            stats.warned.add("__total__")
+            logger.warning(
+                "El request %s %s supero las %s sentencias SQL",
+                stats.method, stats.path, self.max_queries_per_request,
+            )
+
+
+def attach_diagnostics(engine: Engine) -> Optional[QueryDiagnostics]:
+    """Activa el diagnostico sobre el engine si DB_DIAGNOSTICS esta habilitado."""
+    if not config.DB_DIAGNOSTICS:
+        return None
+    diagnostics = QueryDiagnostics()
+    diagnostics.attach(engine)
+    return diagnostics
@@ -0,0 +1,132 @@
+import logging
+import threading
+from time import time
+from typing import Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from app.core.metrics.sql import pool_stats
+from .pool import PoolLivenessCheck
+from .replicas import ReplicaRouter
+
+logger = logging.getLogger(__name__)
+
+
+def pool_saturation(engine: Engine) -> Optional[float]:
+    """Fraccion de conexiones en uso sobre el maximo (pool_size + max_overflow).
+    None con NullPool, que no tiene limite."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return None
+    limit = pool.size() + max(pool._max_overflow, 0)
+    return round(pool.checkedout() / limit, 3) if limit else None
+
+
+class ReadinessMonitor:
+    """Estado de readiness calculado en un hilo aparte cada interval segundos.
+
+    /health/ready devuelve el ultimo resultado sin tocar la base, asi el
+    polling del balanceador no ocupa conexiones del pool ni hilos del
+    threadpool. En cada ronda se hace un SELECT 1 contra el primario (via su
+    PoolLivenessCheck), se mide la saturacion de los pools y, si hay
+    replicas, su estado y lag de replicacion.
+
+    - ready: el primario responde y ningun pool supera max_saturation.
+    - degraded: listo, pero con alguna replica caida o atrasada mas de
+      max_lag_seconds; el router deja de mandarle lecturas (van a las demas
+      replicas o al primario) hasta que se recupere.
+    - not_ready: el primario no responde, un pool esta saturado, todavia no
+      hubo un chequeo o el ultimo tiene mas de 3 intervalos (hilo colgado).
+    """
+
+    def __init__(
+        self,
+        liveness: PoolLivenessCheck,
+        interval: float,
+        max_saturation: float,
+        replicas: Optional[ReplicaRouter] = None,
+    ):
+        self.liveness = liveness
+        self.interval = interval
+        self.max_saturation = max_saturation
+        self.replicas = replicas
+        self.pools: dict[str, Engine] = {"primary": liveness.engine}
+        self._result: Optional[dict] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch_pool(self, name: str, engine: Engine) -> None:
+        # p.ej. el engine async, que atiende los requests cuando DB_ASYNC esta activo
+        self.pools[name] = engine
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="db-readiness", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Error calculando el estado de readiness: {e}")
+
+    def refresh(self) -> dict:
+        database_ok = self.liveness.check()
+        pools = {}
+        saturated = False
+        for name, engine in self.pools.items():
+            saturation = pool_saturation(engine)
+            stats = pool_stats(engine)
+            pools[name] = {
+                "saturation": saturation,
+                "checked_out": stats.get("checked_out"),
+                "timeouts": stats["timeouts"],
+            }
+            saturated |= saturation is not None and saturation >= self.max_saturation
+
+        replicas = None
+        degraded = False
+        if self.replicas is not None:
+            replicas = []
+            for check, lag in zip(self.replicas.replicas, self.replicas.measure_lag()):
+                lagging = lag is not None and lag > self.replicas.max_lag_seconds
+                degraded |= not check.healthy or lagging
+                replicas.append({
+                    "url": check.engine.url.render_as_string(hide_password=True),
+                    "healthy": check.healthy,
+                    "lag_seconds": lag,
+                    "saturation": pool_saturation(check.engine),
+                })
+
+        if not database_ok or saturated:
+            status = "not_ready"
+        else:
+            status = "degraded" if degraded else "ready"
+        self._result = {
+            "status": status,
+            "checked_at": time(),
+            "database": {"healthy": database_ok, "last_error": self.liveness.last_error},
+            "pools": pools,
+            "replicas": replicas,
+        }
+        return self._result
+
+    def snapshot(self) -> dict:
+        result = self._result
+        if result is None:
+            return {"status": "not_ready", "reason": "sin chequeos todavia"}
+        age = time() - result["checked_at"]
+        result = {**result, "age_seconds": round(age, 1)}
+        if age > 3 * self.interval:
+            result.update(status="not_ready", reason="el ultimo chequeo esta vencido")
+        return result
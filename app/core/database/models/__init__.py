@@ -1,5 +1,6 @@
 from .models import Movie
 from .base import Base
+from . import fulltext
 __all__ = [
     "Movie",
     "Base"
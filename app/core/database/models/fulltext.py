@@ -0,0 +1,44 @@
+"""Busqueda de texto completo sobre title, director y description.
+
+En MySQL se usa el indice FULLTEXT ix_movies_fulltext declarado en Movie. En
+SQLite (desarrollo y pruebas) se crea una tabla virtual FTS5 de contenido
+externo, movies_fts, que los triggers mantienen sincronizada con movies ante
+cualquier INSERT/UPDATE/DELETE (incluidas las operaciones masivas con Core).
+"""
+from sqlalchemy import DDL, column, event, table
+
+from .models import Movie
+
+FTS_TABLE = "movies_fts"
+
+# solo se declara rowid: la columna oculta con el nombre de la tabla se usa via literal_column
+movies_fts = table(FTS_TABLE, column("rowid"))
+
+SQLITE_FTS_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5("
+    "title, director, description, content='movies', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS movies_fts_ai AFTER INSERT ON movies BEGIN "
+    "INSERT INTO movies_fts(rowid, title, director, description) "
+    "VALUES (new.id, new.title, new.director, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS movies_fts_ad AFTER DELETE ON movies BEGIN "
+    "INSERT INTO movies_fts(movies_fts, rowid, title, director, description) "
+    "VALUES ('delete', old.id, old.title, old.director, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS movies_fts_au AFTER UPDATE OF title, director, description ON movies BEGIN "
+    "INSERT INTO movies_fts(movies_fts, rowid, title, director, description) "
+    "VALUES ('delete', old.id, old.title, old.director, old.description); "
+    "INSERT INTO movies_fts(rowid, title, director, description) "
+    "VALUES (new.id, new.title, new.director, new.description); END",
+]
+
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS movies_fts_au",
+    "DROP TRIGGER IF EXISTS movies_fts_ad",
+    "DROP TRIGGER IF EXISTS movies_fts_ai",
+    "DROP TABLE IF EXISTS movies_fts",
+]
+
+for statement in SQLITE_FTS_CREATE:
+    event.listen(Movie.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in SQLITE_FTS_DROP:
+    event.listen(Movie.__table__, "before_drop", DDL(statement).execute_if(dialect="sqlite"))
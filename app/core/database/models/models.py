@@ -1,8 +1,15 @@
 #/app/core/database/models.py
-from sqlalchemy import CheckConstraint, Column, Integer, String, DateTime, TIMESTAMP, Boolean, Date, BigInteger, Text, ForeignKey, func, Numeric
+from sqlalchemy import CheckConstraint, Column, Integer, String, DateTime, TIMESTAMP, Boolean, Date, BigInteger, Text, ForeignKey, func, Numeric, Index
+from datetime import datetime, timezone
 from .base import Base
 from sqlalchemy.orm import validates
 
+
+def utcnow() -> datetime:
+    """Hora UTC sin zona y truncada a segundos, como la guarda DATETIME."""
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
 class Movie(Base):
     __tablename__ = "movies"
     id = Column(Integer, primary_key=True, index=True)
@@ -22,14 +29,27 @@ class Movie(Base):
 
     is_watched = Column(Boolean, index=True, nullable=False, default=False)
 
+    # control de cambios para ETag / Last-Modified y concurrencia optimista. La
+    # aplicacion escribe siempre la hora UTC de su reloj, en altas y
+    # modificaciones (conditional.py toma las fechas sin zona como UTC); el
+    # server_default queda para filas insertadas por fuera de la aplicacion
+    updated_at = Column(DateTime, nullable=False, default=utcnow, server_default=func.now(), onupdate=utcnow)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     __table_args__ = (
         CheckConstraint('year >= 1880 and year <= 2030', name='year_constraint'),
         CheckConstraint('duration >= 1 AND duration <= 600', name='duration_constraint'),
         CheckConstraint('rating >= 0 and rating <= 10', name='rating_constraint'),
         CheckConstraint('price > 0', name='price_constraint'),
-        
+        # indices compuestos para los filtros mas usados del listado
+        Index('ix_movies_genre_year', 'genre', 'year'),
+        Index('ix_movies_is_watched_rating', 'is_watched', 'rating'),
+        # busqueda de texto completo (en SQLite se usa FTS5, ver fulltext.py)
+        Index('ix_movies_fulltext', 'title', 'director', 'description', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
     )
 
+    __mapper_args__ = {"version_id_col": version}
+
     @validates('year')
     def validate_year(self, _, value):
         if value < 1880 or value > 2030:
@@ -0,0 +1,100 @@
+import logging
+import threading
+from time import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.config.config import config
+from app.core.metrics.sql import InstrumentedAsyncQueuePool, InstrumentedNullPool, InstrumentedQueuePool
+
+logger = logging.getLogger(__name__)
+
+
+def pool_options(async_engine: bool = False) -> dict:
+    """Argumentos de pool para create_engine / create_async_engine segun Config."""
+    if config.DB_POOL_CLASS == "null":
+        # serverless: cada invocacion abre y cierra su conexion, no quedan
+        # conexiones ociosas de instancias congeladas ocupando la base
+        return {"poolclass": InstrumentedNullPool}
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if async_engine else InstrumentedQueuePool,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+
+
+def connect_args(url: str) -> dict:
+    # SQLite (pruebas locales): el pool comparte conexiones entre los hilos del threadpool
+    return {"check_same_thread": False} if url.startswith("sqlite") else {}
+
+
+class PoolLivenessCheck:
+    """Hace un SELECT 1 cada interval segundos en un hilo aparte.
+
+    Reemplaza a pool_pre_ping: en lugar de un round trip extra en cada
+    checkout, la caida de la base se detecta aca. Si el ping falla por
+    desconexion SQLAlchemy invalida todo el pool, asi que los requests
+    siguientes abren conexiones nuevas en lugar de recibir una muerta.
+    """
+
+    def __init__(self, engine: Engine, interval: float):
+        self.engine = engine
+        self.interval = interval
+        self.last_ok: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.failures = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="db-pool-liveness", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    @property
+    def healthy(self) -> bool:
+        return self.last_error is None
+
+    def check(self) -> bool:
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except Exception as e:
+            # se avisa al caer, no en cada intento mientras sigue caida
+            if self.last_error is None:
+                logger.warning(f"Chequeo de conexion a la base fallido: {e}")
+            self.failures += 1
+            self.last_error = str(e)
+            return False
+        if self.last_error is not None:
+            logger.info("Conexion a la base recuperada")
+        self.last_ok = time()
+        self.last_error = None
+        return True
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def info(self) -> dict:
+        return {
+            "interval_seconds": self.interval,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "healthy": self.healthy,
+            "last_ok_seconds_ago": round(time() - self.last_ok, 1) if self.last_ok else None,
+            "last_error": self.last_error,
+            "failures": self.failures,
+        }
@@ -0,0 +1,202 @@
+import itertools
+import logging
+import threading
+from contextvars import ContextVar
+from time import monotonic, time
+from typing import Optional
+
+from sqlalchemy import Select, create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.config.config import config
+from app.core.metrics.sql import instrument_engine, pool_stats
+from .diagnostics import attach_diagnostics
+from .pool import PoolLivenessCheck, connect_args, pool_options
+
+logger = logging.getLogger(__name__)
+
+
+def replication_lag(engine: Engine) -> Optional[float]:
+    # MySQL 8.0.22+ usa SHOW REPLICA STATUS; las versiones anteriores, SHOW SLAVE STATUS
+    with engine.connect() as conn:
+        for statement, column in (
+            ("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+            ("SHOW SLAVE STATUS", "Seconds_Behind_Master"),
+        ):
+            try:
+                row = conn.exec_driver_sql(statement).mappings().first()
+            except DBAPIError:
+                conn.rollback()
+                continue
+            # sin fila: el servidor no es replica; None: el hilo SQL esta detenido
+            return None if row is None or row[column] is None else float(row[column])
+    return None
+
+
+class RequestWrites:
+    """Marca del request en curso: cuando escribio por ultima vez en el
+    primario (epoch). Se comparte por ContextVar, que se propaga a los hilos
+    del threadpool donde corren los handlers sync."""
+
+    __slots__ = ("last_write",)
+
+    def __init__(self):
+        self.last_write: Optional[float] = None
+
+
+_request_writes: ContextVar[Optional[RequestWrites]] = ContextVar("request_writes", default=None)
+
+
+def start_request_writes() -> tuple[RequestWrites, object]:
+    writes = RequestWrites()
+    return writes, _request_writes.set(writes)
+
+
+def end_request_writes(token) -> None:
+    _request_writes.reset(token)
+
+
+class ReplicaRouter:
+    """Engines de las replicas de lectura con round robin entre las sanas.
+
+    Cada replica tiene un PoolLivenessCheck que la marca caida o sana; un
+    error de desconexion en un request tambien la marca caida al momento.
+    Tambien se saltean las replicas cuyo ultimo lag medido (measure_lag, que
+    llama el ReadinessMonitor en cada ronda) supera max_lag_seconds. Sin
+    replicas disponibles las lecturas van al primario.
+
+    Para que un cliente lea lo que acaba de escribir, la escritura queda
+    anotada en el request (RequestWrites) y ReadYourWritesMiddleware la
+    devuelve en una cookie; los requests que la traen con menos de
+    max_lag_seconds leen del primario. Solo ese cliente paga el primario.
+
+    Con global_write_window, ademas, despues de cualquier escritura de este
+    proceso todas las lecturas van al primario durante max_lag_seconds. Es
+    opcional: da lectura consistente a todos los clientes (no solo al que
+    escribio), a costa de mandar todo el trafico al primario mientras haya
+    escrituras. El cache no necesita esta ventana: lo leido de una replica
+    durante la ventana de lag no se guarda.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        health_interval: float,
+        max_lag_seconds: float,
+        global_write_window: bool = False,
+    ):
+        self.max_lag_seconds = max_lag_seconds
+        self.global_write_window = global_write_window
+        self.replicas: list[PoolLivenessCheck] = []
+        for i, url in enumerate(urls, start=1):
+            engine = create_engine(url, echo=config.DEBUG, connect_args=connect_args(url), **pool_options())
+            instrument_engine(engine, name=f"replica{i}")
+            attach_diagnostics(engine)
+            check = PoolLivenessCheck(engine, health_interval)
+            self._mark_down_on_disconnect(check)
+            self.replicas.append(check)
+        # ultimo lag medido de cada replica, None si no se pudo medir
+        self.lags: list[Optional[float]] = [None] * len(self.replicas)
+        self._next = itertools.count()
+        self._last_write = float("-inf")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _mark_down_on_disconnect(check: PoolLivenessCheck) -> None:
+        @event.listens_for(check.engine, "handle_error")
+        def _on_error(context):
+            if context.is_disconnect:
+                check.last_error = str(context.original_exception)
+
+    def note_write(self) -> None:
+        writes = _request_writes.get()
+        if writes is not None:
+            writes.last_write = time()
+        self._last_write = monotonic()
+
+    def recently_written(self) -> bool:
+        return self.global_write_window and monotonic() - self._last_write < self.max_lag_seconds
+
+    def written_since(self, last_write: Optional[float]) -> bool:
+        """Si una escritura hecha en last_write (epoch, p.ej. de la cookie del
+        cliente) puede no haber llegado todavia a las replicas."""
+        return last_write is not None and time() - last_write < self.max_lag_seconds
+
+    def engine_for_read(self) -> Optional[Engine]:
+        healthy = [
+            check.engine for check, lag in zip(self.replicas, self.lags)
+            if check.healthy and (lag is None or lag <= self.max_lag_seconds)
+        ]
+        if not healthy:
+            return None
+        with self._lock:
+            return healthy[next(self._next) % len(healthy)]
+
+    def start(self) -> None:
+        for check in self.replicas:
+            # estado inicial conocido antes de recibir trafico
+            check.check()
+            check.start()
+
+    def close(self) -> None:
+        for check in self.replicas:
+            check.stop()
+            check.engine.dispose()
+
+    def measure_lag(self) -> list[Optional[float]]:
+        """Segundos de atraso de cada replica segun el propio servidor, None si
+        no se puede saber (replica caida, SQLite, sin privilegio REPLICATION CLIENT).
+        El resultado queda en lags para que engine_for_read saltee las atrasadas."""
+        lags = []
+        for check in self.replicas:
+            lag = None
+            if check.healthy and check.engine.dialect.name == "mysql":
+                try:
+                    lag = replication_lag(check.engine)
+                except Exception as e:
+                    logger.debug(f"No se pudo medir el lag de {check.engine.url.host}: {e}")
+            lags.append(lag)
+        self.lags = lags
+        return lags
+
+    def info(self) -> list[dict]:
+        return [
+            {"url": check.engine.url.render_as_string(hide_password=True), "healthy": check.healthy,
+             "lag_seconds": lag, "pool": pool_stats(check.engine), "liveness": check.info()}
+            for check, lag in zip(self.replicas, self.lags)
+        ]
+
+
+class RoutingSession(Session):
+    """Session que manda las lecturas a una replica y el resto al primario.
+
+    Van al primario: INSERT/UPDATE/DELETE y flush, SELECT ... FOR UPDATE,
+    cualquier sentencia que no sea un SELECT (text(), DDL), las sesiones
+    marcadas con info["primary"] (requests de escritura, que piden leer del
+    primario o cuyo cliente escribio hace menos de max_lag_seconds) y las
+    sesiones que ya escribieron; con global_write_window, tambien todas las
+    lecturas dentro de la ventana de lag despues de una escritura del proceso.
+
+    Las sesiones que leyeron de una replica quedan marcadas con
+    info["replica_read"]: los repositorios no guardan en el cache lo que leen
+    durante la ventana de lag de una escritura (ver _cacheable_read).
+    """
+
+    def __init__(self, *args, router: Optional[ReplicaRouter] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.router = router
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        if self.router is not None:
+            if self._flushing or not isinstance(clause, Select) or clause._for_update_arg is not None:
+                if self._flushing or clause is not None and clause.is_dml:
+                    self.info["primary"] = True
+                    self.router.note_write()
+            elif not self.info.get("primary") and not self.router.recently_written():
+                engine = self.router.engine_for_read()
+                if engine is not None:
+                    self.info["replica_read"] = True
+                    return engine
+        return super().get_bind(mapper, clause=clause, **kwargs)
@@ -1,3 +1,7 @@
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, ConcurrentModificationError, EntityNotFoundError, InvalidCursorError
+from .query_builder import QueryBuilder
 
-__all__ = ["BaseRepository"]
\ No newline at end of file
+# AsyncBaseRepository no se reexporta: importa sqlalchemy.ext.asyncio (greenlet)
+# y solo se carga con DB_ASYNC, desde async_base_repository
+
+__all__ = ["BaseRepository", "ConcurrentModificationError", "EntityNotFoundError", "InvalidCursorError", "QueryBuilder"]
\ No newline at end of file
@@ -0,0 +1,349 @@
+import logging
+from typing import AsyncIterator, Generic, Optional, TypeVar, Type, Mapping, Any, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.cache import AsyncSingleFlight, RepositoryCache
+from .base_repository import (
+    BulkOperationsMixin, CachedReadsMixin, ConcurrentModificationError, EntityNotFoundError,
+    KeysetPaginationMixin, SingleStatementWritesMixin, _chunks, _consecutive_autoinc,
+)
+
+logger = logging.getLogger(__name__)
+
+ModelType = TypeVar("ModelType")
+
+
+class AsyncBaseRepository(
+    KeysetPaginationMixin, CachedReadsMixin, SingleStatementWritesMixin, BulkOperationsMixin, Generic[ModelType]
+):
+    """Version async de BaseRepository sobre AsyncSession, con la misma API
+    de lectura/escritura."""
+
+    def __init__(
+        self,
+        model_class: Type[ModelType],
+        session: AsyncSession,
+        cache: Optional[RepositoryCache] = None,
+        flights: Optional[AsyncSingleFlight] = None,
+    ):
+        self.model_class = model_class
+        self.session = session
+        self.cache = cache
+        self.flights = flights
+
+    async def get_by_id(self, id: int) -> Optional[ModelType]:
+        return await self.session.get(self.model_class, id)
+
+    async def get_by_id_or_fail(self, id: int) -> ModelType:
+        db_obj = await self.get_by_id(id)
+        if db_obj is None:
+            raise EntityNotFoundError(f"{self.model_class.__name__} con id={id} no encontrado")
+        return db_obj
+
+    async def read_by_id(self, id: int) -> Optional[ModelType]:
+        if self.cache is None and self.flights is None:
+            return await self.get_by_id(id)
+
+        if self.cache is not None:
+            row = self.cache.get_entity(id)
+            if row is not None:
+                return self._from_row(row)
+
+        row = await self._coalesced(("id", id), lambda: self._load_row(id))
+        return self._from_row(row) if row is not None else None
+
+    async def _load_row(self, id: int) -> Optional[dict]:
+        version = self.cache.begin_read() if self.cache is not None else None
+        db_obj = await self.get_by_id(id)
+        if db_obj is None:
+            return None
+        row = self._to_row(db_obj)
+        if self.cache is not None and self._cacheable_read():
+            self.cache.set_entity(id, row, version)
+        return row
+
+    async def read_by_id_or_fail(self, id: int) -> ModelType:
+        db_obj = await self.read_by_id(id)
+        if db_obj is None:
+            raise EntityNotFoundError(f"{self.model_class.__name__} con id={id} no encontrado")
+        return db_obj
+
+    async def get_many_rows(self, ids: Sequence[int], chunk_size: int = 500) -> tuple[list[dict], list[int]]:
+        order, found, misses, version = self._split_cached(ids)
+        loaded = {}
+        for chunk in _chunks(misses, chunk_size):
+            for row in (await self.session.execute(self._many_statement(chunk))).mappings():
+                loaded[row["id"]] = dict(row)
+        return self._many_result(order, found, loaded, version)
+
+    async def get_many(self, ids: Sequence[int], chunk_size: int = 500) -> tuple[list[ModelType], list[int]]:
+        rows, missing = await self.get_many_rows(ids, chunk_size)
+        return [self._from_row(row) for row in rows], missing
+
+    async def read_version(self, id: int) -> Optional[tuple[int, Any]]:
+        if self.cache is not None:
+            row = self.cache.get_entity(id)
+            if row is not None:
+                return row["version"], row["updated_at"]
+        result = (await self.session.execute(
+            select(self.model_class.version, self.model_class.updated_at)
+            .where(self.model_class.id == id)
+        )).first()
+        return tuple(result) if result is not None else None
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> list[ModelType]:
+        stmt = select(self.model_class).offset(skip).limit(limit)
+        return list((await self.session.scalars(stmt)).all())
+
+    async def get_page_after(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        criteria: Sequence = (),
+    ) -> tuple[list[ModelType], Optional[str]]:
+        stmt = self._page_statement(cursor, limit, order_by, criteria)
+        rows = (await self.session.scalars(stmt)).all()
+        return self._page_result(rows, limit, order_by)
+
+    async def get_page_rows_after(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        criteria: Sequence = (),
+    ) -> tuple[list[dict], Optional[str]]:
+        stmt = self._page_statement(cursor, limit, order_by, criteria, plain=True)
+        rows, next_cursor = self._page_result((await self.session.execute(stmt)).all(), limit, order_by)
+        return [row._asdict() for row in rows], next_cursor
+
+    async def stream_batches(
+        self, batch_size: int = 1000, criteria: Sequence = ()
+    ) -> AsyncIterator[Sequence[Mapping[str, Any]]]:
+        """Como BaseRepository.stream_batches, con AsyncSession.stream()."""
+        result = await self.session.stream(self._stream_statement(batch_size, criteria))
+        try:
+            async for partition in result.mappings().partitions():
+                yield partition
+        finally:
+            await result.close()
+
+    async def create(self, data: Mapping[str, Any]) -> ModelType:
+        values = self._validated(data)
+        dialect = self.session.bind.dialect
+        try:
+            if dialect.insert_returning:
+                result = await self.session.execute(self._insert_statement(values, returning=True))
+                row = result.mappings().one()
+            else:
+                values = self._with_client_defaults(values)
+                result = await self.session.execute(self._insert_statement(values, returning=False))
+                row = self._inserted_row(values, result.inserted_primary_key[0])
+            await self.session.commit()
+            self._invalidate([row["id"]])
+            self._after_write([row])
+            return self._from_row(row)
+        except SQLAlchemyError:
+            logger.exception(
+                "Error creando %s con data=%s",
+                self.model_class.__name__,
+                data,
+            )
+            await self.session.rollback()
+            raise
+
+    async def update(self, obj: ModelType) -> ModelType:
+        try:
+            self.session.add(obj)
+            await self.session.commit()
+            await self.session.refresh(obj)
+            self._invalidate([obj.id])
+            self._after_write([self._to_row(obj)])
+            return obj
+        except StaleDataError:
+            await self.session.rollback()
+            raise ConcurrentModificationError(
+                f"{self.model_class.__name__} fue modificado por otra operacion"
+            )
+        except SQLAlchemyError:
+            logger.exception(
+                "Error al intentar actualizar el %s",
+                self.model_class.__name__,
+            )
+            await self.session.rollback()
+            raise
+
+    async def delete(self, db_obj: ModelType) -> None:
+        try:
+            id = db_obj.id
+            await self.session.delete(db_obj)
+            await self.session.commit()
+            self._invalidate([id])
+            self._after_delete([id])
+        except SQLAlchemyError:
+            await self.session.rollback()
+            logger.exception(
+                "Error eliminando %s",
+                self.model_class.__name__,
+            )
+            raise
+
+    async def update_by_id(self, id: int, data: Mapping[str, Any], expected_version: Optional[int] = None) -> ModelType:
+        if not data:
+            db_obj = await self.read_by_id_or_fail(id)
+            if expected_version is not None and getattr(db_obj, "version", None) != expected_version:
+                raise self._conflict()
+            return db_obj
+
+        values = self._validated(data)
+        dialect = self.session.bind.dialect
+        table = self.model_class.__table__
+        try:
+            if dialect.update_returning:
+                result = await self.session.execute(
+                    self._update_statement(id, values, expected_version, returning=True)
+                )
+                row = result.mappings().first()
+            else:
+                result = await self.session.execute(self._update_statement(id, values, expected_version, returning=False))
+                row = None
+                if result.rowcount:
+                    result = await self.session.execute(select(table).where(table.c.id == id))
+                    row = result.mappings().first()
+
+            if row is None:
+                await self.session.rollback()
+                if expected_version is not None and await self.session.scalar(select(table.c.id).where(table.c.id == id)):
+                    raise self._conflict()
+                raise self._not_found(id)
+
+            await self.session.commit()
+            self._invalidate([id])
+            self._after_write([row])
+            return self._from_row(row)
+        except SQLAlchemyError:
+            logger.exception(
+                "Error al intentar actualizar el %s",
+                self.model_class.__name__,
+            )
+            await self.session.rollback()
+            raise
+
+    async def delete_by_id(self, id: int) -> None:
+        try:
+            result = await self.session.execute(self._delete_statement(id))
+            if not result.rowcount:
+                await self.session.rollback()
+                raise self._not_found(id)
+            await self.session.commit()
+            self._invalidate([id])
+            self._after_delete([id])
+        except SQLAlchemyError:
+            await self.session.rollback()
+            logger.exception(
+                "Error eliminando %s",
+                self.model_class.__name__,
+            )
+            raise
+
+    async def bulk_create(self, rows: Sequence[Mapping[str, Any]], chunk_size: int = 500) -> list[Optional[int]]:
+        dialect = self.session.bind.dialect
+        ids: list[Optional[int]] = []
+        try:
+            consecutive = await self._consecutive_ids(dialect)
+            for chunk in _chunks(rows, chunk_size):
+                stmt, params = self._bulk_insert_statement(dialect, chunk)
+                result = await self.session.execute(stmt, params)
+                chunk_ids = self._bulk_inserted_ids(dialect, result, chunk, consecutive)
+                if None in chunk_ids:
+                    lookup = self._bulk_ids_by_key_statement(dialect, result, chunk)
+                    if lookup is not None:
+                        chunk_ids = self._bulk_ids_by_key(chunk, (await self.session.execute(lookup)).all())
+                ids.extend(chunk_ids)
+            await self.session.commit()
+            self._invalidate()
+            self._after_write([{**row, "id": id} for row, id in zip(rows, ids)])
+            return ids
+        except SQLAlchemyError:
+            logger.exception(
+                "Error en alta masiva de %s (%d filas)",
+                self.model_class.__name__,
+                len(rows),
+            )
+            await self.session.rollback()
+            raise
+
+    async def bulk_update(self, rows: Sequence[Mapping[str, Any]], chunk_size: int = 500) -> tuple[set[int], dict[int, str]]:
+        updated: set[int] = set()
+        valid, invalid = self._bulk_split_invalid(rows)
+        try:
+            for chunk in _chunks(valid, chunk_size):
+                existing = await self._existing_ids([row["id"] for row in chunk])
+                unchanged, statements = self._bulk_update_statements(chunk, existing)
+                updated.update(unchanged)
+                for stmt, params in statements:
+                    await self.session.execute(stmt, params)
+                    updated.update(p["_id"] for p in params)
+            await self.session.commit()
+            self._invalidate(list(updated))
+            self._after_write([row for row in valid if row["id"] in updated])
+            return updated, invalid
+        except SQLAlchemyError:
+            logger.exception(
+                "Error en actualizacion masiva de %s (%d filas)",
+                self.model_class.__name__,
+                len(rows),
+            )
+            await self.session.rollback()
+            raise
+
+    async def bulk_delete(self, ids: Sequence[int], chunk_size: int = 500) -> set[int]:
+        deleted: set[int] = set()
+        try:
+            for chunk in _chunks(ids, chunk_size):
+                existing = await self._existing_ids(chunk)
+                if existing:
+                    await self.session.execute(self._bulk_delete_statement(list(existing)))
+                    deleted.update(existing)
+            await self.session.commit()
+            self._invalidate(list(deleted))
+            self._after_delete(list(deleted))
+            return deleted
+        except SQLAlchemyError:
+            logger.exception(
+                "Error en baja masiva de %s (%d ids)",
+                self.model_class.__name__,
+                len(ids),
+            )
+            await self.session.rollback()
+            raise
+
+    async def _existing_ids(self, ids: Sequence[int]) -> set[int]:
+        return set((await self.session.execute(self._existing_ids_statement(ids))).scalars())
+
+    async def _consecutive_ids(self, dialect) -> bool:
+        if dialect.name != "mysql":
+            return False
+        consecutive = _consecutive_autoinc.get(dialect)
+        if consecutive is None:
+            settings = (await self.session.execute(self._autoinc_settings)).one()
+            consecutive = _consecutive_autoinc[dialect] = self._autoinc_is_consecutive(*settings)
+        return consecutive
+
+    async def count(self, **filters) -> int:
+        try:
+            stmt = select(func.count()).select_from(self.model_class)
+            for field, value in filters.items():
+                if hasattr(self.model_class, field):
+                    stmt = stmt.where(getattr(self.model_class, field) == value)
+            return await self.session.scalar(stmt)
+        except SQLAlchemyError:
+            logger.exception(
+                "Error al intentar contar %s",
+                self.model_class.__name__,
+            )
+            raise
@@ -0,0 +1,80 @@
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from .async_base_repository import AsyncBaseRepository
+from .movie_repository import MovieQueryMixin, movie_async_flights, movie_cache
+from ..models.models import Movie
+
+
+class AsyncMovieRepository(MovieQueryMixin, AsyncBaseRepository[Movie]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(Movie, session, cache=movie_cache, flights=movie_async_flights)
+
+    async def search(
+        self,
+        filters: dict,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+    ) -> tuple[list[Movie], Optional[str]]:
+        rows, next_cursor = await self.search_rows(filters, cursor=cursor, limit=limit, order_by=order_by)
+        return [self._from_row(row) for row in rows], next_cursor
+
+    async def search_rows(
+        self,
+        filters: dict,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+    ) -> tuple[list[dict], Optional[str]]:
+        if self.cache is not None:
+            cached = self.cache.get_list(self._search_cache_key(filters, cursor, limit, order_by))
+            if cached is not None:
+                return cached
+        return await self._coalesced(
+            ("list", filters, cursor, limit, order_by),
+            lambda: self._load_search_rows(filters, cursor, limit, order_by),
+        )
+
+    async def _load_search_rows(self, filters: dict, cursor: Optional[str], limit: int, order_by: str):
+        version = self.cache.begin_read() if self.cache is not None else None
+        rows, next_cursor = await self.get_page_rows_after(
+            cursor=cursor,
+            limit=limit,
+            order_by=order_by,
+            criteria=self.build_criteria(**filters),
+        )
+        if self.cache is not None and self._cacheable_read():
+            self.cache.set_list(self._search_cache_key(filters, cursor, limit, order_by), (rows, next_cursor), version)
+        return rows, next_cursor
+
+    async def search_text(
+        self,
+        q: str,
+        filters: dict,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> tuple[list[dict], Optional[str]]:
+        if self.cache is not None:
+            cached = self.cache.get_list(self._text_search_cache_key(q, filters, cursor, limit))
+            if cached is not None:
+                return cached
+        return await self._coalesced(
+            ("text", q, filters, cursor, limit),
+            lambda: self._load_text_search(q, filters, cursor, limit),
+        )
+
+    async def _load_text_search(self, q: str, filters: dict, cursor: Optional[str], limit: int):
+        version = self.cache.begin_read() if self.cache is not None else None
+        offset = self._decode_search_cursor(cursor, q)
+        stmt = self._text_search_statement(
+            self.session.bind.dialect.name, q, self.build_criteria(**filters)
+        )
+        rows, next_cursor = [], None
+        if stmt is not None:
+            result = (await self.session.execute(stmt.offset(offset).limit(limit + 1))).all()
+            rows, next_cursor = self._text_search_page(result, q, offset, limit)
+
+        if self.cache is not None and self._cacheable_read():
+            self.cache.set_list(self._text_search_cache_key(q, filters, cursor, limit), (rows, next_cursor), version)
+        return rows, next_cursor
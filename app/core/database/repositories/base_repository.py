@@ -1,22 +1,399 @@
+import base64
+import json
 import logging
-from typing import Generic, Optional, TypeVar, Type, Mapping, Any
+import weakref
+from collections import deque
+from decimal import Decimal
+from typing import Callable, Generic, Iterator, Optional, TypeVar, Type, Mapping, Any, Sequence
 
 
 
+from sqlalchemy import Delete, Insert, Numeric, Select, Update, and_, bindparam, func, or_, delete, insert, select, text, tuple_, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.cache import RepositoryCache, SingleFlight
 
 logger = logging.getLogger(__name__)
 
 ModelType = TypeVar("ModelType")
 
+def _chunks(items: Sequence, size: int) -> Iterator[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+# por engine (su dialecto): si InnoDB asigna ids consecutivos a un INSERT multi-fila
+_consecutive_autoinc: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+
 class EntityNotFoundError(Exception):
     pass
 
-class BaseRepository(Generic[ModelType]):
-    def __init__(self, model_class: Type[ModelType], session: Session):
+class InvalidCursorError(Exception):
+    pass
+
+class ConcurrentModificationError(Exception):
+    pass
+
+class KeysetPaginationMixin:
+    """Construccion de consultas paginadas por cursor (keyset), compartida por
+    los repositorios sync y async. Requiere model_class y cursor_columns."""
+
+    # columnas por las que se permite paginar con cursor, deben estar indexadas
+    cursor_columns: tuple[str, ...] = ("id",)
+
+    def _page_statement(
+        self,
+        cursor: Optional[str],
+        limit: int,
+        order_by: str,
+        criteria: Sequence = (),
+        plain: bool = False,
+    ) -> Select:
+        field, descending = self._parse_order_by(order_by)
+        column = getattr(self.model_class, field)
+        pk = self.model_class.id
+
+        # plain: select sobre la tabla, filas Core en lugar de entidades ORM
+        source = self.model_class.__table__ if plain else self.model_class
+        stmt = select(source).where(*criteria)
+        if cursor is not None:
+            last_value, last_id = self._decode_cursor(cursor, order_by, column)
+            stmt = stmt.where(
+                self._keyset_condition(column, pk, last_value, last_id, descending)
+            )
+
+        # el id desempata valores repetidos; ordenando por id ya es unico
+        order = [column] if field == "id" else [column, pk]
+        stmt = stmt.order_by(*(c.desc() if descending else c.asc() for c in order))
+
+        # se pide una fila de mas para saber si hay una pagina siguiente
+        return stmt.limit(limit + 1)
+
+    def _page_result(self, rows: Sequence, limit: int, order_by: str) -> tuple[list, Optional[str]]:
+        rows = list(rows)
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        last = rows[-1]
+        field = order_by.lstrip("-")
+        return rows, self._encode_cursor(order_by, getattr(last, field), last.id)
+
+    def _parse_order_by(self, order_by: str) -> tuple[str, bool]:
+        descending = order_by.startswith("-")
+        field = order_by.lstrip("-")
+        if field not in self.cursor_columns:
+            raise InvalidCursorError(
+                f"No se puede ordenar {self.model_class.__name__} por '{field}', "
+                f"opciones: {', '.join(self.cursor_columns)}"
+            )
+        return field, descending
+
+    @staticmethod
+    def _keyset_condition(column, pk, last_value, last_id: int, descending: bool):
+        # NULL se ordena como el menor valor tanto en MySQL como en SQLite
+        if pk is column:
+            return pk < last_id if descending else pk > last_id
+        if descending:
+            if last_value is None:
+                return and_(column.is_(None), pk < last_id)
+            return or_(
+                column < last_value,
+                and_(column == last_value, pk < last_id),
+                column.is_(None),
+            )
+        if last_value is None:
+            return or_(and_(column.is_(None), pk > last_id), column.isnot(None))
+        return or_(column > last_value, and_(column == last_value, pk > last_id))
+
+    @staticmethod
+    def _encode_cursor(order_by: str, value: Any, id: int) -> str:
+        if isinstance(value, Decimal):
+            value = str(value)
+        raw = json.dumps([order_by, value, id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str, order_by: str, column) -> tuple[Any, int]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            cursor_order_by, value, id = json.loads(base64.urlsafe_b64decode(padded))
+            id = int(id)
+            if value is not None and isinstance(column.type, Numeric):
+                value = Decimal(value)
+        except Exception:
+            raise InvalidCursorError("Cursor invalido")
+        if cursor_order_by != order_by:
+            raise InvalidCursorError("El cursor no corresponde al orden solicitado")
+        return value, id
+
+class CachedReadsMixin:
+    """Conversion entre entidades y filas planas para el cache de lecturas y
+    el single-flight. Las entidades que salen de ahi son copias nuevas, sin
+    sesion, por lo que solo sirven para consulta (no para modificar y hacer update)."""
+
+    cache: Optional[RepositoryCache] = None
+    flights: Optional[SingleFlight] = None
+
+    def _to_row(self, obj) -> dict:
+        return {attr.key: getattr(obj, attr.key) for attr in self.model_class.__mapper__.column_attrs}
+
+    def _from_row(self, row: Mapping[str, Any]):
+        return self.model_class(**row)
+
+    def _invalidate(self, ids: Sequence[int] = ()) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(ids)
+        if self.flights is not None:
+            self.flights.forget()
+
+    def _cacheable_read(self) -> bool:
+        """Si lo que leyo la sesion se puede guardar en el cache. No cuando vino
+        de una replica y hubo una escritura hace menos de max_lag_seconds: la
+        replica puede no tenerla todavia, y el cliente que escribio, aunque
+        RoutingSession lo mande al primario, leeria primero del cache."""
+        router = getattr(self.session, "router", None)
+        if router is None or not self.session.info.get("replica_read"):
+            return True
+        return not self.cache.written_within(router.max_lag_seconds)
+
+    def _split_cached(self, ids: Sequence[int]) -> tuple[list[int], dict[int, dict], list[int], Optional[int]]:
+        """Para lecturas de varios ids: (ids sin repetir en el orden pedido,
+        filas que ya estan en el cache, ids que hay que buscar en la base,
+        version del cache tomada antes de ir a la base)."""
+        order = list(dict.fromkeys(ids))
+        found = {}
+        if self.cache is not None:
+            for id in order:
+                row = self.cache.get_entity(id)
+                if row is not None:
+                    found[id] = row
+        version = self.cache.begin_read() if self.cache is not None else None
+        return order, found, [id for id in order if id not in found], version
+
+    def _many_statement(self, ids: Sequence[int]) -> Select:
+        return select(self.model_class.__table__).where(self.model_class.id.in_(ids))
+
+    def _many_result(
+        self, order: list[int], found: dict[int, dict], loaded: dict[int, dict], version: Optional[int]
+    ) -> tuple[list[dict], list[int]]:
+        if self.cache is not None and loaded and self._cacheable_read():
+            self.cache.set_entities(loaded, version)
+        found.update(loaded)
+        return [found[id] for id in order if id in found], [id for id in order if id not in found]
+
+    def _coalesced(self, key: tuple, load: Callable[[], Any]) -> Any:
+        """load() a traves del single-flight si esta habilitado. En los
+        repositorios async load devuelve una corrutina y el resultado se awaitea.
+
+        Las sesiones pinneadas al primario (info["primary"]) tienen sus propias
+        claves: no se suman a una lectura en curso que puede ir a una replica
+        atrasada y devolver datos previos a la escritura del cliente."""
+        if self.flights is None:
+            return load()
+        return self.flights.do(self.flights.key(*key, primary=bool(self.session.info.get("primary"))), load)
+
+    def _after_write(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Se llama despues del commit de altas y modificaciones con las filas
+        escritas (id y columnas modificadas), para mantener otros indices en
+        memoria. El id puede ser None si bulk_create no pudo deducirlo."""
+
+    def _after_delete(self, ids: Sequence[int]) -> None:
+        """Se llama despues del commit de bajas."""
+
+
+class SingleStatementWritesMixin:
+    """Sentencias de alta/modificacion/baja de una sola entidad sin pasar por
+    la unidad de trabajo del ORM, compartidas por los repositorios sync y
+    async: cada escritura es una sola sentencia mas el commit, sin el SELECT
+    previo para cargar la entidad ni el SELECT de refresh() posterior."""
+
+    def _validated(self, values: Mapping[str, Any]) -> dict:
+        columns = self.model_class.__table__.c
+        for key, value in values.items():
+            if value is None and key in columns and not columns[key].nullable:
+                raise ValueError(f"{key} no puede ser null")
+        # se asignan sobre una instancia transitoria para que corran los @validates del modelo
+        obj = self.model_class()
+        for key, value in values.items():
+            setattr(obj, key, value)
+        return dict(values)
+
+    def _insert_statement(self, values: dict, returning: bool) -> Insert:
+        table = self.model_class.__table__
+        stmt = insert(table).values(values)
+        return stmt.returning(*table.c) if returning else stmt
+
+    def _with_client_defaults(self, values: dict) -> dict:
+        """Completa los valores por defecto del lado de la aplicacion, para
+        conocer la fila insertada sin releerla cuando no hay RETURNING (MySQL).
+        Los defaults que son funciones (p.ej. updated_at=utcnow) se evaluan aca,
+        asi la fila devuelta tiene el mismo valor que se inserta."""
+        values = dict(values)
+        for column in self.model_class.__table__.c:
+            if column.key in values or column.primary_key or column.default is None:
+                continue
+            if column.default.is_scalar:
+                values[column.key] = column.default.arg
+            elif column.default.is_callable:
+                values[column.key] = column.default.arg(None)
+        return values
+
+    def _inserted_row(self, values: dict, id: int) -> dict:
+        row = {column.key: values.get(column.key) for column in self.model_class.__table__.c}
+        row["id"] = id
+        return row
+
+    def _update_statement(self, id: int, values: dict, expected_version: Optional[int], returning: bool) -> Update:
+        table = self.model_class.__table__
+        stmt = update(table).where(table.c.id == id)
+        if "version" in table.c:
+            values = {**values, "version": table.c.version + 1}
+            if expected_version is not None:
+                stmt = stmt.where(table.c.version == expected_version)
+        stmt = stmt.values(values)
+        return stmt.returning(*table.c) if returning else stmt
+
+    def _delete_statement(self, id: int) -> Delete:
+        table = self.model_class.__table__
+        return delete(table).where(table.c.id == id)
+
+    def _not_found(self, id: int) -> EntityNotFoundError:
+        return EntityNotFoundError(f"{self.model_class.__name__} con id={id} no encontrado")
+
+    def _conflict(self) -> ConcurrentModificationError:
+        return ConcurrentModificationError(f"{self.model_class.__name__} fue modificado por otra operacion")
+
+
+class BulkOperationsMixin:
+    """Sentencias de las operaciones masivas (bulk_* y stream_batches),
+    compartidas por los repositorios sync y async: cada uno solo las ejecuta
+    con su sesion y hace el commit."""
+
+    def _stream_statement(self, batch_size: int, criteria: Sequence) -> Select:
+        table = self.model_class.__table__
+        return (
+            select(table)
+            .where(*criteria)
+            .order_by(table.c.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+    def _bulk_insert_statement(self, dialect, chunk: Sequence[Mapping[str, Any]]) -> tuple[Insert, Optional[list]]:
+        table = self.model_class.__table__
+        if dialect.insert_executemany_returning_sort_by_parameter_order:
+            return insert(table).returning(table.c.id, sort_by_parameter_order=True), list(chunk)
+        # sin RETURNING: un unico INSERT ... VALUES (...), (...) por bloque
+        return insert(table).values(list(chunk)), None
+
+    # columnas que identifican una fila sin el id, para recuperar los ids de un
+    # alta masiva en MySQL cuando no son consecutivos (no tienen que ser unicas)
+    natural_key: tuple[str, ...] = ()
+
+    _autoinc_settings = text("SELECT @@innodb_autoinc_lock_mode, @@auto_increment_increment")
+
+    @staticmethod
+    def _autoinc_is_consecutive(lock_mode, increment) -> bool:
+        # modos 0 (tradicional) y 1 (consecutivo): un INSERT con cantidad de filas
+        # conocida recibe un rango contiguo. El modo 2 (intercalado, el default
+        # de MySQL 8) puede repartirlo con sentencias concurrentes
+        return int(lock_mode) in (0, 1) and int(increment) == 1
+
+    @staticmethod
+    def _bulk_inserted_ids(dialect, result, chunk: Sequence, consecutive: bool) -> list[Optional[int]]:
+        if dialect.insert_executemany_returning_sort_by_parameter_order:
+            return list(result.scalars().all())
+        # con ids consecutivos salen de lastrowid (el primero) y rowcount
+        if consecutive and result.lastrowid and result.rowcount == len(chunk):
+            return list(range(result.lastrowid, result.lastrowid + len(chunk)))
+        return [None] * len(chunk)
+
+    def _bulk_ids_by_key_statement(self, dialect, result, chunk: Sequence[Mapping[str, Any]]) -> Optional[Select]:
+        """SELECT de las filas recien insertadas por clave natural, para cuando
+        los ids no son consecutivos: todas tienen id >= lastrowid (el primero
+        que genero la sentencia). None si no hay como buscarlas."""
+        if dialect.name != "mysql" or not self.natural_key or not result.lastrowid:
+            return None
+        table = self.model_class.__table__
+        columns = [table.c[name] for name in self.natural_key]
+        keys = {tuple(row[name] for name in self.natural_key) for row in chunk}
+        return (
+            select(table.c.id, *columns)
+            .where(table.c.id >= result.lastrowid, tuple_(*columns).in_(keys))
+            .order_by(table.c.id)
+        )
+
+    def _bulk_ids_by_key(self, chunk: Sequence[Mapping[str, Any]], found: Sequence) -> list[Optional[int]]:
+        # dentro de una sentencia los ids crecen en el orden de las filas, asi
+        # que las claves repetidas se asignan por orden de id
+        ids_by_key: dict[tuple, deque] = {}
+        for id, *key in found:
+            ids_by_key.setdefault(tuple(key), deque()).append(id)
+        ids = []
+        for row in chunk:
+            pending = ids_by_key.get(tuple(row[name] for name in self.natural_key))
+            ids.append(pending.popleft() if pending else None)
+        return ids
+
+    def _bulk_split_invalid(self, rows: Sequence[Mapping[str, Any]]) -> tuple[list, dict[int, str]]:
+        invalid: dict[int, str] = {}
+        for position, row in enumerate(rows):
+            try:
+                self._validated({k: v for k, v in row.items() if k != "id"})
+            except (ValueError, TypeError) as e:
+                invalid[position] = str(e)
+        return [row for position, row in enumerate(rows) if position not in invalid], invalid
+
+    def _bulk_update_statements(
+        self, chunk: Sequence[Mapping[str, Any]], existing: set[int]
+    ) -> tuple[set[int], list[tuple[Update, list[dict]]]]:
+        """Agrupa las filas existentes por conjunto de columnas, un UPDATE ...
+        WHERE id = ? (executemany) por grupo. Devuelve tambien los ids sin
+        columnas para modificar, que cuentan como actualizados."""
+        table = self.model_class.__table__
+        unchanged: set[int] = set()
+        groups: dict[tuple[str, ...], list[dict]] = {}
+        for row in chunk:
+            if row["id"] not in existing:
+                continue
+            values = {k: v for k, v in row.items() if k != "id"}
+            if not values:
+                unchanged.add(row["id"])
+                continue
+            params = {f"_{k}": v for k, v in values.items()}
+            params["_id"] = row["id"]
+            groups.setdefault(tuple(sorted(values)), []).append(params)
+
+        statements = []
+        for columns, params in groups.items():
+            values = {c: bindparam(f"_{c}") for c in columns}
+            if "version" in table.c:
+                values["version"] = table.c.version + 1
+            statements.append((update(table).where(table.c.id == bindparam("_id")).values(values), params))
+        return unchanged, statements
+
+    def _bulk_delete_statement(self, ids: Sequence[int]) -> Delete:
+        table = self.model_class.__table__
+        return delete(table).where(table.c.id.in_(ids))
+
+    def _existing_ids_statement(self, ids: Sequence[int]) -> Select:
+        table = self.model_class.__table__
+        return select(table.c.id).where(table.c.id.in_(ids))
+
+
+class BaseRepository(KeysetPaginationMixin, CachedReadsMixin, SingleStatementWritesMixin, BulkOperationsMixin, Generic[ModelType]):
+    def __init__(
+        self,
+        model_class: Type[ModelType],
+        session: Session,
+        cache: Optional[RepositoryCache] = None,
+        flights: Optional[SingleFlight] = None,
+    ):
         self.model_class = model_class
         self.session = session
+        self.cache = cache
+        self.flights = flights
 
     def get_by_id(self, id: int) -> Optional[ModelType]:
         return (
@@ -32,6 +409,67 @@ class BaseRepository(Generic[ModelType]):
             raise EntityNotFoundError(f"{self.model_class.__name__} con id={id} no encontrado")
         return db_obj
 
+    def read_by_id(self, id: int) -> Optional[ModelType]:
+        """Lectura de solo consulta a traves del cache (read-through) y del
+        single-flight: los pedidos concurrentes del mismo id hacen un solo SELECT."""
+        if self.cache is None and self.flights is None:
+            return self.get_by_id(id)
+
+        if self.cache is not None:
+            row = self.cache.get_entity(id)
+            if row is not None:
+                return self._from_row(row)
+
+        row = self._coalesced(("id", id), lambda: self._load_row(id))
+        return self._from_row(row) if row is not None else None
+
+    def _load_row(self, id: int) -> Optional[dict]:
+        version = self.cache.begin_read() if self.cache is not None else None
+        db_obj = self.get_by_id(id)
+        if db_obj is None:
+            return None
+        row = self._to_row(db_obj)
+        if self.cache is not None and self._cacheable_read():
+            self.cache.set_entity(id, row, version)
+        return row
+
+    def read_by_id_or_fail(self, id: int) -> ModelType:
+        db_obj = self.read_by_id(id)
+        if db_obj is None:
+            raise EntityNotFoundError(f"{self.model_class.__name__} con id={id} no encontrado")
+        return db_obj
+
+    def get_many_rows(self, ids: Sequence[int], chunk_size: int = 500) -> tuple[list[dict], list[int]]:
+        """Varias entidades por id como filas planas, en el orden pedido y sin
+        repetidos, mas los ids que no existen. Los ids que estan en el cache
+        no van a la base; el resto se trae con un SELECT ... WHERE id IN (...)
+        por bloque de chunk_size ids. Las filas pueden venir del cache: no modificarlas."""
+        order, found, misses, version = self._split_cached(ids)
+        loaded = {}
+        for chunk in _chunks(misses, chunk_size):
+            for row in self.session.execute(self._many_statement(chunk)).mappings():
+                loaded[row["id"]] = dict(row)
+        return self._many_result(order, found, loaded, version)
+
+    def get_many(self, ids: Sequence[int], chunk_size: int = 500) -> tuple[list[ModelType], list[int]]:
+        """Igual que get_many_rows pero como entidades de solo consulta."""
+        rows, missing = self.get_many_rows(ids, chunk_size)
+        return [self._from_row(row) for row in rows], missing
+
+    def read_version(self, id: int) -> Optional[tuple[int, Any]]:
+        """(version, updated_at) de la entidad sin traer la fila completa; se
+        resuelve desde el cache si la entidad esta cacheada. Requiere que el
+        modelo defina las columnas version y updated_at."""
+        if self.cache is not None:
+            row = self.cache.get_entity(id)
+            if row is not None:
+                return row["version"], row["updated_at"]
+        result = self.session.execute(
+            select(self.model_class.version, self.model_class.updated_at)
+            .where(self.model_class.id == id)
+        ).first()
+        return tuple(result) if result is not None else None
+
     def get_all(self, skip: int = 0, limit: int = 100) -> list[ModelType]:
         return (
             self.session
@@ -41,14 +479,73 @@ class BaseRepository(Generic[ModelType]):
             .all()
         )
 
-        
+    def get_page_after(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        criteria: Sequence = (),
+    ) -> tuple[list[ModelType], Optional[str]]:
+        """Paginacion por cursor (keyset). En lugar de OFFSET se busca a partir
+        de la ultima fila entregada usando (columna de orden, id), por lo que el
+        costo de cada pagina no depende de la profundidad.
+
+        Args:
+            cursor (str | None): cursor opaco devuelto por la pagina anterior
+            limit (int): cantidad maxima de filas
+            order_by (str): columna de orden, con prefijo "-" para descendente
+            criteria (Sequence): condiciones WHERE adicionales (ver QueryBuilder)
+
+        Returns:
+            tuple: (filas de la pagina, cursor de la siguiente pagina o None)
+        """
+        stmt = self._page_statement(cursor, limit, order_by, criteria)
+        return self._page_result(self.session.scalars(stmt).all(), limit, order_by)
+
+    def get_page_rows_after(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        criteria: Sequence = (),
+    ) -> tuple[list[dict], Optional[str]]:
+        """Igual que get_page_after pero devuelve filas planas (dict por fila)
+        sin hidratar entidades ni registrarlas en la sesion, para respuestas de
+        solo lectura que se serializan directo a JSON."""
+        stmt = self._page_statement(cursor, limit, order_by, criteria, plain=True)
+        rows, next_cursor = self._page_result(self.session.execute(stmt).all(), limit, order_by)
+        return [row._asdict() for row in rows], next_cursor
+
+    def stream_batches(self, batch_size: int = 1000, criteria: Sequence = ()) -> Iterator[Sequence[Mapping[str, Any]]]:
+        """Recorre la tabla completa con un cursor del lado del servidor
+        (yield_per habilita stream_results), devolviendo bloques de filas como
+        mappings sin hidratar objetos ORM. La memoria usada depende de
+        batch_size y no del tamaño de la tabla.
+        """
+        result = self.session.execute(self._stream_statement(batch_size, criteria))
+        try:
+            for partition in result.mappings().partitions():
+                yield partition
+        finally:
+            result.close()
+
     def create(self, data: Mapping[str, Any]) -> ModelType:
+        """Alta con una sola sentencia: INSERT ... RETURNING donde el motor lo
+        soporta y, en MySQL, lastrowid con los defaults completados del lado de
+        la aplicacion. La entidad devuelta no queda asociada a la sesion."""
+        values = self._validated(data)
+        dialect = self.session.get_bind().dialect
         try:
-            obj = self.model_class(**data)
-            self.session.add(obj)
+            if dialect.insert_returning:
+                row = self.session.execute(self._insert_statement(values, returning=True)).mappings().one()
+            else:
+                values = self._with_client_defaults(values)
+                result = self.session.execute(self._insert_statement(values, returning=False))
+                row = self._inserted_row(values, result.inserted_primary_key[0])
             self.session.commit()
-            self.session.refresh(obj)
-            return obj
+            self._invalidate([row["id"]])
+            self._after_write([row])
+            return self._from_row(row)
         except SQLAlchemyError as e:
             logger.exception(
                 "Error creando %s con data=%s",
@@ -63,7 +560,14 @@ class BaseRepository(Generic[ModelType]):
             self.session.add(obj)
             self.session.commit()
             self.session.refresh(obj)
+            self._invalidate([obj.id])
+            self._after_write([self._to_row(obj)])
             return obj
+        except StaleDataError:
+            self.session.rollback()
+            raise ConcurrentModificationError(
+                f"{self.model_class.__name__} fue modificado por otra operacion"
+            )
         except SQLAlchemyError as e:
             logger.exception(
                 "Error al intentar actualizar el %s",
@@ -74,8 +578,11 @@ class BaseRepository(Generic[ModelType]):
         
     def delete(self, db_obj: ModelType) -> None:
         try:
+            id = db_obj.id
             self.session.delete(db_obj)
             self.session.commit()
+            self._invalidate([id])
+            self._after_delete([id])
         except SQLAlchemyError:
             self.session.rollback()
             logger.exception(
@@ -84,22 +591,200 @@ class BaseRepository(Generic[ModelType]):
             )
             raise
         
+    def update_by_id(self, id: int, data: Mapping[str, Any], expected_version: Optional[int] = None) -> ModelType:
+        """Modificacion parcial con un UPDATE ... WHERE id = :id directo, sin
+        cargar antes la entidad. Con expected_version la comparacion de version
+        va en el mismo WHERE (concurrencia optimista atomica).
+
+        Donde no hay UPDATE ... RETURNING (MySQL) la fila actualizada se lee en
+        la misma transaccion, antes del commit.
+
+        Raises:
+            EntityNotFoundError: si no existe la entidad
+            ConcurrentModificationError: si la version no coincide con expected_version
+        """
+        if not data:
+            db_obj = self.read_by_id_or_fail(id)
+            if expected_version is not None and getattr(db_obj, "version", None) != expected_version:
+                raise self._conflict()
+            return db_obj
+
+        values = self._validated(data)
+        dialect = self.session.get_bind().dialect
+        table = self.model_class.__table__
+        try:
+            if dialect.update_returning:
+                row = self.session.execute(
+                    self._update_statement(id, values, expected_version, returning=True)
+                ).mappings().first()
+            else:
+                result = self.session.execute(self._update_statement(id, values, expected_version, returning=False))
+                row = None
+                if result.rowcount:
+                    row = self.session.execute(select(table).where(table.c.id == id)).mappings().first()
+
+            if row is None:
+                self.session.rollback()
+                if expected_version is not None and self._existing_ids([id]):
+                    raise self._conflict()
+                raise self._not_found(id)
+
+            self.session.commit()
+            self._invalidate([id])
+            self._after_write([row])
+            return self._from_row(row)
+        except SQLAlchemyError:
+            logger.exception(
+                "Error al intentar actualizar el %s",
+                self.model_class.__name__,
+            )
+            self.session.rollback()
+            raise
+
     def delete_by_id(self, id: int) -> None:
-        db_obj = self.get_by_id(id)
-        if db_obj is None:
-            raise EntityNotFoundError(f"{self.model_class.__name__} con id={id} no encontrado")
+        """Baja con un unico DELETE ... WHERE id = :id; la inexistencia se
+        detecta por rowcount."""
+        try:
+            result = self.session.execute(self._delete_statement(id))
+            if not result.rowcount:
+                self.session.rollback()
+                raise self._not_found(id)
+            self.session.commit()
+            self._invalidate([id])
+            self._after_delete([id])
+        except SQLAlchemyError:
+            self.session.rollback()
+            logger.exception(
+                "Error eliminando %s",
+                self.model_class.__name__,
+            )
+            raise
+
+    def bulk_create(self, rows: Sequence[Mapping[str, Any]], chunk_size: int = 500) -> list[Optional[int]]:
+        """Inserta todas las filas en una sola transaccion con INSERT multi-fila
+        (executemany) por cada bloque de chunk_size filas.
+
+        Las filas deben venir validadas y con las mismas claves: no se construyen
+        objetos ORM, por lo que no corren los @validates del modelo.
+
+        Sin RETURNING (MySQL) cada bloque va como un unico INSERT ... VALUES
+        (...), (...). Si innodb_autoinc_lock_mode y auto_increment_increment
+        garantizan ids consecutivos (se consultan una vez por engine), salen de
+        lastrowid y rowcount; si no, se releen por natural_key entre las filas
+        con id >= lastrowid.
+
+        Returns:
+            list: ids generados en el mismo orden que rows; None en otros motores
+            sin RETURNING o en MySQL sin natural_key y con ids no consecutivos
+        """
+        dialect = self.session.get_bind().dialect
+        ids: list[Optional[int]] = []
+        try:
+            consecutive = self._consecutive_ids(dialect)
+            for chunk in _chunks(rows, chunk_size):
+                stmt, params = self._bulk_insert_statement(dialect, chunk)
+                result = self.session.execute(stmt, params)
+                chunk_ids = self._bulk_inserted_ids(dialect, result, chunk, consecutive)
+                if None in chunk_ids:
+                    lookup = self._bulk_ids_by_key_statement(dialect, result, chunk)
+                    if lookup is not None:
+                        chunk_ids = self._bulk_ids_by_key(chunk, self.session.execute(lookup).all())
+                ids.extend(chunk_ids)
+            self.session.commit()
+            self._invalidate()
+            self._after_write([{**row, "id": id} for row, id in zip(rows, ids)])
+            return ids
+        except SQLAlchemyError:
+            logger.exception(
+                "Error en alta masiva de %s (%d filas)",
+                self.model_class.__name__,
+                len(rows),
+            )
+            self.session.rollback()
+            raise
+
+    def bulk_update(self, rows: Sequence[Mapping[str, Any]], chunk_size: int = 500) -> tuple[set[int], dict[int, str]]:
+        """Actualiza por id en una sola transaccion. Cada fila debe incluir "id"
+        y solo las columnas a modificar; las filas con el mismo conjunto de
+        columnas se envian juntas en un UPDATE ... WHERE id = ? (executemany).
+
+        Cada fila pasa antes por los @validates del modelo y las columnas NOT
+        NULL: las que fallan no se envian y el resto se actualiza igual.
+
+        Returns:
+            tuple: (ids que existian y fueron actualizados,
+            {posicion en rows: error} de las filas invalidas)
+        """
+        updated: set[int] = set()
+        valid, invalid = self._bulk_split_invalid(rows)
+        try:
+            for chunk in _chunks(valid, chunk_size):
+                existing = self._existing_ids([row["id"] for row in chunk])
+                unchanged, statements = self._bulk_update_statements(chunk, existing)
+                updated.update(unchanged)
+                for stmt, params in statements:
+                    self.session.execute(stmt, params)
+                    updated.update(p["_id"] for p in params)
+            self.session.commit()
+            self._invalidate(list(updated))
+            self._after_write([row for row in valid if row["id"] in updated])
+            return updated, invalid
+        except SQLAlchemyError:
+            logger.exception(
+                "Error en actualizacion masiva de %s (%d filas)",
+                self.model_class.__name__,
+                len(rows),
+            )
+            self.session.rollback()
+            raise
+
+    def bulk_delete(self, ids: Sequence[int], chunk_size: int = 500) -> set[int]:
+        """Elimina por id con DELETE ... WHERE id IN (...) por bloque, en una sola
+        transaccion.
+
+        Returns:
+            set: ids que existian y fueron eliminados
+        """
+        deleted: set[int] = set()
+        try:
+            for chunk in _chunks(ids, chunk_size):
+                existing = self._existing_ids(chunk)
+                if existing:
+                    self.session.execute(self._bulk_delete_statement(list(existing)))
+                    deleted.update(existing)
+            self.session.commit()
+            self._invalidate(list(deleted))
+            self._after_delete(list(deleted))
+            return deleted
+        except SQLAlchemyError:
+            logger.exception(
+                "Error en baja masiva de %s (%d ids)",
+                self.model_class.__name__,
+                len(ids),
+            )
+            self.session.rollback()
+            raise
+
+    def _existing_ids(self, ids: Sequence[int]) -> set[int]:
+        return set(self.session.execute(self._existing_ids_statement(ids)).scalars())
+
+    def _consecutive_ids(self, dialect) -> bool:
+        if dialect.name != "mysql":
+            return False
+        consecutive = _consecutive_autoinc.get(dialect)
+        if consecutive is None:
+            settings = self.session.execute(self._autoinc_settings).one()
+            consecutive = _consecutive_autoinc[dialect] = self._autoinc_is_consecutive(*settings)
+        return consecutive
 
-        self.session.delete(db_obj)
-        self.session.commit()
-        
     def count(self, **filters) -> int:
         try:
-            query = self.session.query(self.model_class)
+            # COUNT(*) directo sobre la tabla; query.count() lo envuelve en una subconsulta
+            stmt = select(func.count()).select_from(self.model_class)
             for field, value in filters.items():
                 if hasattr(self.model_class, field):
-                    query = query.filter(getattr(self.model_class, field) == value)
-
-            return query.count()
+                    stmt = stmt.where(getattr(self.model_class, field) == value)
+            return self.session.scalar(stmt)
         except SQLAlchemyError as e:
             logger.exception(
                 "Error al intentar contar %s",
@@ -1,8 +1,306 @@
+import base64
+import json
+import re
+from typing import Iterator, Optional, Sequence
+
+from sqlalchemy import Select, and_, func, literal, literal_column, or_, select, tuple_
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import Session
-from .base_repository import BaseRepository
+from app.config.config import config
+from app.core.cache import AsyncSingleFlight, RepositoryCache, SingleFlight, cache_backend
+from app.core.search import TitleAutocomplete, title_autocomplete
+from app.core.stats import CatalogStats, catalog_stats
+from .base_repository import BaseRepository, InvalidCursorError
+from .query_builder import QueryBuilder
+from ..models.fulltext import FTS_TABLE, movies_fts
 from ..models.models import Movie
 
+_SEARCH_TERM = re.compile(r"\w+")
+
+# stopwords por defecto de InnoDB (INFORMATION_SCHEMA.INNODB_FT_DEFAULT_STOPWORD):
+# no estan en el indice FULLTEXT, asi que exigirlas con + no encuentra nada
+_MYSQL_FT_STOPWORDS = frozenset((
+    "a", "about", "an", "are", "as", "at", "be", "by", "com", "de", "en", "for",
+    "from", "how", "i", "in", "is", "it", "la", "of", "on", "or", "that", "the",
+    "this", "to", "was", "what", "when", "where", "who", "will", "with", "und", "www",
+))
+
+# cache de lecturas de peliculas, compartido por todas las instancias del repositorio
+movie_cache = (
+    RepositoryCache(cache_backend, namespace="movies", ttl=config.CACHE_TTL_SECONDS)
+    if config.CACHE_ENABLED else None
+)
+
+# lecturas identicas en curso (por id y por listado/busqueda), una por stack
+movie_flights = SingleFlight("movies") if config.SINGLE_FLIGHT_ENABLED else None
+movie_async_flights = AsyncSingleFlight("movies_async") if config.SINGLE_FLIGHT_ENABLED else None
+
+
+class MovieQueryMixin:
+    """Filtros y columnas de orden de Movie, compartidos por el repositorio sync y el async."""
+
+    cursor_columns = ("id", "title", "year", "genre", "rating", "price")
+    autocomplete: Optional[TitleAutocomplete] = title_autocomplete
+    stats: Optional[CatalogStats] = catalog_stats
+
+    # para releer los ids de un alta masiva en MySQL (ver BulkOperationsMixin)
+    natural_key = ("title", "year", "director")
+
+    # columnas que lleva CatalogStats por pelicula
+    stats_columns = ("id", "genre", "year", "rating", "is_watched", "price", "duration")
+
+    def _after_write(self, rows: Sequence[dict]) -> None:
+        if self.stats is not None:
+            self.stats.apply(rows)
+        if self.autocomplete is None:
+            return
+        for row in rows:
+            if "title" in row and row.get("id") is not None:
+                self.autocomplete.add(row["id"], row["title"])
+
+    def _after_delete(self, ids: Sequence[int]) -> None:
+        if self.stats is not None:
+            self.stats.remove(ids)
+        if self.autocomplete is not None:
+            self.autocomplete.remove(ids)
+
+    def _invalidate(self, ids: Sequence[int] = ()) -> None:
+        super()._invalidate(ids)
+        # con DB_ASYNC las altas masivas siguen en el stack sync: una escritura
+        # de cualquiera de los dos corta las lecturas en curso de ambos
+        for flights in (movie_flights, movie_async_flights):
+            if flights is not None:
+                flights.forget()
+
+    def build_criteria(
+        self,
+        genre: Optional[str] = None,
+        year_min: Optional[int] = None,
+        year_max: Optional[int] = None,
+        rating_min: Optional[int] = None,
+        rating_max: Optional[int] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+        is_watched: Optional[bool] = None,
+        title: Optional[str] = None,
+    ) -> list:
+        return (
+            QueryBuilder(Movie)
+            .equals("genre", genre)
+            .equals("is_watched", is_watched)
+            .between("year", year_min, year_max)
+            .between("rating", rating_min, rating_max)
+            .between("price", price_min, price_max)
+            .prefix("title", title)
+            .build()
+        )
+
+    def _text_search_statement(self, dialect_name: str, q: str, criteria: Sequence = ()) -> Optional[Select]:
+        """SELECT de peliculas que contienen todas las palabras de q (como
+        prefijo) en title, director o description, con columna score de
+        relevancia (mayor es mejor). None si q no tiene palabras."""
+        terms = [term.lower() for term in _SEARCH_TERM.findall(q)]
+        if not terms:
+            return None
+        table = Movie.__table__
+
+        if dialect_name in ("mysql", "mariadb"):
+            # las stopwords y las palabras cortas no estan en el indice: se
+            # descartan, porque un +palabra que no se puede encontrar deja la
+            # busqueda entera sin resultados
+            terms = [
+                term for term in terms
+                if len(term) >= config.SEARCH_MYSQL_MIN_TOKEN_SIZE and term not in _MYSQL_FT_STOPWORDS
+            ]
+            if not terms:
+                return None
+            # modo booleano: +palabra* exige la palabra y acepta prefijos
+            match = mysql.match(
+                table.c.title, table.c.director, table.c.description,
+                against=" ".join(f"+{term}*" for term in terms),
+            ).in_boolean_mode()
+            score = match.label("score")
+            return select(table, score).where(match, *criteria).order_by(score.desc(), table.c.id)
+
+        if dialect_name == "sqlite":
+            fts = literal_column(FTS_TABLE)
+            query = " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+            # bm25 devuelve valores negativos, mas chico es mas relevante
+            rank = func.bm25(fts)
+            return (
+                select(table, (-rank).label("score"))
+                .select_from(table.join(movies_fts, movies_fts.c.rowid == table.c.id))
+                .where(fts.op("MATCH")(query), *criteria)
+                .order_by(rank, table.c.id)
+            )
+
+        # otros motores: sin indice de texto, LIKE por palabra y sin ranking
+        columns = (table.c.title, table.c.director, table.c.description)
+        condition = and_(*(
+            or_(*(c.contains(term, autoescape=True) for c in columns)) for term in terms
+        ))
+        return select(table, literal(0).label("score")).where(condition, *criteria).order_by(table.c.id)
 
-class MovieRepository(BaseRepository[Movie]):
+    def _text_search_page(self, result: Sequence, q: str, offset: int, limit: int) -> tuple[list[dict], Optional[str]]:
+        rows = []
+        for row in result[:limit]:
+            row = row._asdict()
+            row.pop("score", None)
+            rows.append(row)
+        next_cursor = self._encode_search_cursor(q, offset + limit) if len(result) > limit else None
+        return rows, next_cursor
+
+    @staticmethod
+    def _encode_search_cursor(q: str, offset: int) -> str:
+        # el orden por relevancia no es estable ante altas/bajas, por eso la
+        # busqueda pagina por posicion y no por keyset
+        raw = json.dumps(["q", q, offset], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_search_cursor(cursor: Optional[str], q: str) -> int:
+        if cursor is None:
+            return 0
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            kind, cursor_q, offset = json.loads(base64.urlsafe_b64decode(padded))
+            offset = int(offset)
+        except Exception:
+            raise InvalidCursorError("Cursor invalido")
+        if kind != "q" or cursor_q != q or offset < 0:
+            raise InvalidCursorError("El cursor no corresponde a la busqueda solicitada")
+        return offset
+
+    def _search_cache_key(self, filters: dict, cursor: Optional[str], limit: int, order_by: str) -> str:
+        return self.cache.list_key(filters=filters, cursor=cursor, limit=limit, order_by=order_by)
+
+    def _text_search_cache_key(self, q: str, filters: dict, cursor: Optional[str], limit: int) -> str:
+        return self.cache.list_key(q=q, filters=filters, cursor=cursor, limit=limit)
+
+
+class MovieRepository(MovieQueryMixin, BaseRepository[Movie]):
     def __init__(self, session: Session):
-        super().__init__(Movie, session)
\ No newline at end of file
+        super().__init__(Movie, session, cache=movie_cache, flights=movie_flights)
+
+    def search(
+        self,
+        filters: dict,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+    ) -> tuple[list[Movie], Optional[str]]:
+        """Pagina filtrada como entidades de solo consulta (ver search_rows)."""
+        rows, next_cursor = self.search_rows(filters, cursor=cursor, limit=limit, order_by=order_by)
+        return [self._from_row(row) for row in rows], next_cursor
+
+    def search_rows(
+        self,
+        filters: dict,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+    ) -> tuple[list[dict], Optional[str]]:
+        """Pagina filtrada como filas planas, a traves del cache de listados y
+        del single-flight si estan habilitados. Las filas pueden venir del
+        cache o de la consulta de otro request: no modificarlas."""
+        if self.cache is not None:
+            cached = self.cache.get_list(self._search_cache_key(filters, cursor, limit, order_by))
+            if cached is not None:
+                return cached
+        return self._coalesced(
+            ("list", filters, cursor, limit, order_by),
+            lambda: self._load_search_rows(filters, cursor, limit, order_by),
+        )
+
+    def _load_search_rows(self, filters: dict, cursor: Optional[str], limit: int, order_by: str):
+        version = self.cache.begin_read() if self.cache is not None else None
+        rows, next_cursor = self.get_page_rows_after(
+            cursor=cursor,
+            limit=limit,
+            order_by=order_by,
+            criteria=self.build_criteria(**filters),
+        )
+        if self.cache is not None and self._cacheable_read():
+            self.cache.set_list(self._search_cache_key(filters, cursor, limit, order_by), (rows, next_cursor), version)
+        return rows, next_cursor
+
+    def search_text(
+        self,
+        q: str,
+        filters: dict,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> tuple[list[dict], Optional[str]]:
+        """Busqueda de texto completo (FULLTEXT en MySQL, FTS5 en SQLite)
+        ordenada por relevancia, combinable con los filtros del listado.
+        Devuelve filas planas como search_rows."""
+        if self.cache is not None:
+            cached = self.cache.get_list(self._text_search_cache_key(q, filters, cursor, limit))
+            if cached is not None:
+                return cached
+        return self._coalesced(
+            ("text", q, filters, cursor, limit),
+            lambda: self._load_text_search(q, filters, cursor, limit),
+        )
+
+    def _load_text_search(self, q: str, filters: dict, cursor: Optional[str], limit: int):
+        version = self.cache.begin_read() if self.cache is not None else None
+        offset = self._decode_search_cursor(cursor, q)
+        stmt = self._text_search_statement(
+            self.session.get_bind().dialect.name, q, self.build_criteria(**filters)
+        )
+        rows, next_cursor = [], None
+        if stmt is not None:
+            result = self.session.execute(stmt.offset(offset).limit(limit + 1)).all()
+            rows, next_cursor = self._text_search_page(result, q, offset, limit)
+
+        if self.cache is not None and self._cacheable_read():
+            self.cache.set_list(self._text_search_cache_key(q, filters, cursor, limit), (rows, next_cursor), version)
+        return rows, next_cursor
+
+    def iter_titles(self, batch_size: int = 10000) -> Iterator[tuple[int, str]]:
+        """(id, titulo) de todo el catalogo leido en bloques, para construir el
+        indice de autocompletado."""
+        result = self.session.execute(
+            select(Movie.id, Movie.title).execution_options(yield_per=batch_size)
+        )
+        try:
+            for id, title in result:
+                yield id, title
+        finally:
+            result.close()
+
+    def catalog_stats(self) -> Optional[dict]:
+        """Facetas y promedios del catalogo desde CatalogStats, recargandolo
+        con una lectura de la tabla solo si esta vencido."""
+        if self.stats is None:
+            return None
+        self.stats.refresh_if_stale(self.iter_stats_rows)
+        return self.stats.snapshot()
+
+    def iter_stats_rows(self, batch_size: int = 10000) -> Iterator[dict]:
+        """Columnas de faceta de todo el catalogo leidas en bloques, para
+        construir CatalogStats."""
+        table = Movie.__table__
+        result = self.session.execute(
+            select(*(table.c[name] for name in self.stats_columns)).execution_options(yield_per=batch_size)
+        )
+        try:
+            for row in result.mappings():
+                yield row
+        finally:
+            result.close()
+
+    def find_ids_by_natural_key(self, keys: Sequence[tuple[str, int, str]]) -> dict[tuple[str, int, str], int]:
+        """Busca ids por la clave natural (title, year, director) en una sola
+        consulta WHERE (title, year, director) IN (...)."""
+        if not keys:
+            return {}
+        stmt = (
+            select(Movie.id, Movie.title, Movie.year, Movie.director)
+            .where(tuple_(Movie.title, Movie.year, Movie.director).in_(set(keys)))
+        )
+        return {
+            (title, year, director): movie_id
+            for movie_id, title, year, director in self.session.execute(stmt)
+        }
@@ -0,0 +1,44 @@
+from typing import Any, Generic, Optional, Type, TypeVar
+
+from sqlalchemy.sql.elements import ColumnElement
+
+ModelType = TypeVar("ModelType")
+
+
+class QueryBuilder(Generic[ModelType]):
+    """Arma la lista de condiciones WHERE a partir de filtros opcionales.
+
+    Cada metodo ignora los valores None, de modo que el endpoint puede pasar
+    todos los parametros de la query string sin preguntar cuales vinieron.
+    Solo se generan comparaciones directas sobre la columna (=, >=, <=, LIKE 'x%')
+    para que el motor pueda resolverlas con los indices existentes.
+    """
+
+    def __init__(self, model_class: Type[ModelType]):
+        self.model_class = model_class
+        self.criteria: list[ColumnElement] = []
+
+    def _column(self, field: str):
+        return getattr(self.model_class, field)
+
+    def equals(self, field: str, value: Any) -> "QueryBuilder[ModelType]":
+        if value is not None:
+            self.criteria.append(self._column(field) == value)
+        return self
+
+    def between(self, field: str, minimum: Optional[Any], maximum: Optional[Any]) -> "QueryBuilder[ModelType]":
+        column = self._column(field)
+        if minimum is not None:
+            self.criteria.append(column >= minimum)
+        if maximum is not None:
+            self.criteria.append(column <= maximum)
+        return self
+
+    def prefix(self, field: str, value: Optional[str]) -> "QueryBuilder[ModelType]":
+        # LIKE 'valor%' puede usar el indice B-tree, a diferencia de '%valor%'
+        if value:
+            self.criteria.append(self._column(field).startswith(value, autoescape=True))
+        return self
+
+    def build(self) -> list[ColumnElement]:
+        return list(self.criteria)
@@ -0,0 +1,56 @@
+from .registry import Counter, Gauge, Histogram, Registry
+from .request_context import RequestStats, current_request_stats
+
+registry = Registry()
+
+SIZE_BUCKETS = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+http_requests_total = registry.counter(
+    "http_requests_total", "Requests atendidos", ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "Latencia de los requests por ruta", ("method", "route")
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "Requests en curso"
+)
+http_response_size_bytes = registry.histogram(
+    "http_response_size_bytes", "Tamaño del body de respuesta", ("route",), buckets=SIZE_BUCKETS
+)
+db_queries_total = registry.counter(
+    "db_queries_total", "Sentencias SQL ejecutadas"
+)
+db_query_duration_seconds = registry.histogram(
+    "db_query_duration_seconds", "Duracion de cada sentencia SQL"
+)
+db_queries_per_request = registry.histogram(
+    "db_queries_per_request", "Sentencias SQL por request", ("route",), buckets=COUNT_BUCKETS
+)
+db_time_per_request_seconds = registry.histogram(
+    "db_time_per_request_seconds", "Tiempo total en SQL por request", ("route",)
+)
+db_pool_checkout_wait_seconds = registry.histogram(
+    "db_pool_checkout_wait_seconds", "Espera para obtener una conexion del pool", ("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+db_pool_checkout_timeouts_total = registry.counter(
+    "db_pool_checkout_timeouts_total", "Checkouts del pool que terminaron en timeout", ("pool",)
+)
+db_pool_invalidations_total = registry.counter(
+    "db_pool_invalidations_total", "Conexiones descartadas por error o desconexion", ("pool",)
+)
+single_flight_calls_total = registry.counter(
+    "single_flight_calls_total",
+    "Lecturas por single-flight: leader ejecuto la consulta, shared recibio el resultado de otra en curso",
+    ("name", "result"),
+)
+
+__all__ = [
+    "Counter", "Gauge", "Histogram", "Registry", "RequestStats", "current_request_stats", "registry",
+    "http_requests_total", "http_request_duration_seconds", "http_requests_in_flight",
+    "http_response_size_bytes", "db_queries_total", "db_query_duration_seconds",
+    "db_queries_per_request", "db_time_per_request_seconds",
+    "db_pool_checkout_wait_seconds", "db_pool_checkout_timeouts_total", "db_pool_invalidations_total",
+    "single_flight_calls_total",
+]
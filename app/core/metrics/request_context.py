@@ -0,0 +1,34 @@
+from contextvars import ContextVar
+from typing import Optional
+
+
+class RequestStats:
+    """Contadores de SQL del request en curso. Se comparte por ContextVar, que
+    se propaga a los hilos del threadpool donde corren los handlers sync."""
+
+    __slots__ = ("method", "path", "queries", "db_time", "statements", "warned")
+
+    def __init__(self, method: str = "", path: str = ""):
+        self.method = method
+        self.path = path
+        self.queries = 0
+        self.db_time = 0.0
+        # solo lo usa el diagnostico de consultas: forma de la sentencia -> repeticiones
+        self.statements: dict[str, int] = {}
+        self.warned: set = set()
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+def start_request_stats(method: str = "", path: str = "") -> tuple[RequestStats, object]:
+    stats = RequestStats(method, path)
+    return stats, _request_stats.set(stats)
+
+
+def end_request_stats(token) -> None:
+    _request_stats.reset(token)
@@ -0,0 +1,115 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from . import (
+    db_pool_checkout_timeouts_total,
+    db_pool_checkout_wait_seconds,
+    db_pool_invalidations_total,
+    db_queries_total,
+    db_query_duration_seconds,
+    registry,
+)
+from .request_context import current_request_stats
+
+
+def instrument_engine(engine: Engine, name: str = "catalog") -> None:
+    """Registra cantidad y duracion de cada sentencia (global y por request)
+    y expone el estado del pool como gauges."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        db_queries_total.inc()
+        db_query_duration_seconds.observe(elapsed)
+        stats = current_request_stats()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += elapsed
+
+    pool = engine.pool
+    pool.metrics_name = name
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        db_pool_invalidations_total.inc(pool=name)
+
+    if isinstance(pool, QueuePool):
+        # engine.pool y no pool: dispose() reemplaza el pool por uno nuevo
+        registry.gauge(f"db_pool_{name}_size", "Tamaño configurado del pool", callback=lambda: engine.pool.size())
+        registry.gauge(
+            f"db_pool_{name}_checked_out", "Conexiones prestadas", callback=lambda: engine.pool.checkedout()
+        )
+        registry.gauge(
+            f"db_pool_{name}_overflow", "Conexiones abiertas por encima de pool_size",
+            callback=lambda: engine.pool.overflow(),
+        )
+        registry.gauge(
+            f"db_pool_{name}_saturation", "Conexiones prestadas / (pool_size + max_overflow)",
+            callback=lambda: engine.pool.checkedout() / max(1, engine.pool.size() + engine.pool._max_overflow),
+        )
+
+
+def pool_stats(engine: Engine) -> dict:
+    """Estado actual del pool y acumulados de checkouts, esperas, timeouts e
+    invalidaciones, para /status."""
+    pool = engine.pool
+    name = getattr(pool, "metrics_name", "")
+    checkouts = db_pool_checkout_wait_seconds.count(pool=name)
+    stats = {
+        "pool_class": type(pool).__name__,
+        "checkouts": checkouts,
+        "avg_wait_ms": round(db_pool_checkout_wait_seconds.sum(pool=name) / checkouts * 1000, 3) if checkouts else None,
+        "timeouts": int(db_pool_checkout_timeouts_total.value(pool=name)),
+        "invalidations": int(db_pool_invalidations_total.value(pool=name)),
+    }
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    return stats
+
+
+class _CheckoutTimingMixin:
+    """Mide la espera para obtener una conexion (en NullPool, lo que tarda en
+    abrirse) y los timeouts, etiquetados con el nombre que le da instrument_engine."""
+
+    metrics_name = ""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            db_pool_checkout_timeouts_total.inc(pool=self.metrics_name)
+            raise
+        finally:
+            db_pool_checkout_wait_seconds.observe(time.perf_counter() - start, pool=self.metrics_name)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(_CheckoutTimingMixin, NullPool):
+    pass
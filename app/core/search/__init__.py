@@ -0,0 +1,11 @@
+from app.config.config import config
+
+from .autocomplete import TitleAutocomplete, normalize, tokenize
+
+# indice de sugerencias de titulos del proceso, se carga en el lifespan de la app
+title_autocomplete = (
+    TitleAutocomplete(memory_budget_mb=config.AUTOCOMPLETE_MEMORY_BUDGET_MB)
+    if config.AUTOCOMPLETE_ENABLED else None
+)
+
+__all__ = ["TitleAutocomplete", "normalize", "tokenize", "title_autocomplete"]
@@ -0,0 +1,350 @@
+import bisect
+import heapq
+import logging
+from collections import OrderedDict
+import re
+import sys
+import threading
+import unicodedata
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\w+")
+
+# articulos y conectores que no aportan a la sugerencia ("el", "la", "de"...)
+SPANISH_STOPWORDS = frozenset({
+    "a", "al", "con", "de", "del", "el", "en", "la", "las", "lo", "los",
+    "o", "para", "por", "u", "un", "una", "y",
+})
+
+# costo aproximado en bytes de cada estructura, para el presupuesto de memoria
+_TITLE_BYTES = 330
+_POSTING_BYTES = 10
+_TOKEN_BYTES = 300
+_TRIGRAM_LINK_BYTES = 80
+
+
+def normalize(text: str) -> str:
+    """Minusculas y sin tildes ni dieresis (incluida la ñ, para tolerar
+    teclados sin ella)."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = _TOKEN.findall(normalize(text))
+    significant = [t for t in tokens if t not in SPANISH_STOPWORDS]
+    # un titulo hecho solo de stopwords ("El") se indexa igual
+    return significant or tokens
+
+
+def _trigrams(token: str, prefix: bool = False) -> set[str]:
+    # se marca el inicio con "$$" para que los trigramas de un prefijo sean
+    # un subconjunto de los de las palabras que empiezan con el
+    padded = f"$${token}" if prefix else f"$${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _within_distance(a: str, b: str, max_distance: int) -> bool:
+    """Distancia de edicion (con transposiciones) <= max_distance."""
+    if abs(len(a) - len(b)) > max_distance:
+        return False
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return False
+        previous2, previous = previous, current
+    return previous[-1] <= max_distance
+
+
+class TitleAutocomplete:
+    """Indice invertido en memoria de los titulos para sugerencias mientras
+    se escribe, sin ir a la base.
+
+    - Las palabras normalizadas de los titulos se guardan en un arreglo
+      ordenado: las que empiezan con un prefijo son un rango contiguo que se
+      encuentra con bisect.
+    - Cada palabra apunta a la lista de ids de los titulos que la contienen,
+      ordenada por un rango fijo (titulos mas cortos primero), por lo que los
+      mejores resultados de un prefijo salen de mezclar las cabezas de esas
+      listas sin recorrerlas enteras.
+    - Si un termino no coincide como prefijo, se buscan palabras con
+      trigramas en comun y distancia de edicion 1 (2 para terminos largos).
+    - Los resultados se cachean por consulta hasta la siguiente escritura.
+
+    Se construye al iniciar la app y los repositorios lo actualizan en cada
+    alta, modificacion o baja. Con varios procesos cada uno tiene su indice y
+    solo ve sus propias escrituras hasta el siguiente reinicio.
+    """
+
+    def __init__(self, memory_budget_mb: float = 256, result_cache_size: int = 4096):
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.result_cache_size = result_cache_size
+        self._lock = threading.RLock()
+        self._titles: dict[int, str] = {}
+        self._title_tokens: dict[int, tuple[str, ...]] = {}
+        # rango fijo de cada titulo: largo y despues id, empaquetados en un int
+        self._rank: dict[int, int] = {}
+        self._postings: dict[str, list[int]] = {}
+        self._sorted_tokens: list[str] = []
+        self._trigram_index: dict[str, set[str]] = {}
+        self._results: OrderedDict = OrderedDict()
+        self._estimated_bytes = 0
+        self._over_budget = False
+        self._loading = False
+        self.ready = False
+
+    # --- carga y actualizacion ---
+
+    def load(self, rows: Iterable[tuple[int, str]]) -> int:
+        """Agrega (id, titulo) en bloque; devuelve la cantidad indexada. Las
+        palabras y los ids se agregan al final y se ordenan una sola vez al
+        terminar, en lugar de insertarlos ordenados de a uno."""
+        count = 0
+        with self._lock:
+            self._loading = True
+            try:
+                for id, title in rows:
+                    if self.add(id, title):
+                        count += 1
+            finally:
+                self._sorted_tokens.sort()
+                rank = self._rank.__getitem__
+                for posting in self._postings.values():
+                    posting.sort(key=rank)
+                self._loading = False
+            self.ready = True
+        logger.info(
+            "Autocompletado: %s titulos, %s palabras, ~%.1f MB",
+            len(self._titles), len(self._sorted_tokens), self._estimated_bytes / 1024 / 1024,
+        )
+        return count
+
+    def add(self, id: int, title: Optional[str]) -> bool:
+        """Indexa o reemplaza el titulo de id. Devuelve False si se excede el
+        presupuesto de memoria (el titulo queda sin indexar)."""
+        with self._lock:
+            self._remove(id)
+            if not title:
+                return True
+            tokens = tuple(dict.fromkeys(tokenize(title)))
+            cost = self._title_cost(title, tokens)
+            cost += sum(self._token_cost(t) for t in tokens if t not in self._postings)
+            if self._estimated_bytes + cost > self.memory_budget:
+                if not self._over_budget:
+                    logger.warning(
+                        "Autocompletado: se alcanzo el presupuesto de memoria (%s MB), "
+                        "los titulos nuevos no se indexan",
+                        self.memory_budget // 1024 // 1024,
+                    )
+                self._over_budget = True
+                return False
+
+            self._titles[id] = title
+            self._title_tokens[id] = tokens
+            self._rank[id] = (len(title) << 32) | id
+            rank = self._rank.__getitem__
+            for token in tokens:
+                posting = self._postings.get(token)
+                if posting is None:
+                    posting = self._postings[token] = []
+                    if self._loading:
+                        self._sorted_tokens.append(token)
+                    else:
+                        bisect.insort(self._sorted_tokens, token)
+                    for trigram in _trigrams(token):
+                        self._trigram_index.setdefault(trigram, set()).add(token)
+                if self._loading:
+                    posting.append(id)
+                else:
+                    bisect.insort(posting, id, key=rank)
+            self._estimated_bytes += cost
+            self._results.clear()
+            return True
+
+    def remove(self, ids: Iterable[int]) -> None:
+        with self._lock:
+            for id in ids:
+                self._remove(id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._titles.clear()
+            self._title_tokens.clear()
+            self._rank.clear()
+            self._postings.clear()
+            self._sorted_tokens.clear()
+            self._trigram_index.clear()
+            self._results.clear()
+            self._estimated_bytes = 0
+            self._over_budget = False
+            self.ready = False
+
+    @staticmethod
+    def _title_cost(title: str, tokens: tuple[str, ...]) -> int:
+        return _TITLE_BYTES + sys.getsizeof(title) + len(tokens) * _POSTING_BYTES
+
+    @staticmethod
+    def _token_cost(token: str) -> int:
+        return _TOKEN_BYTES + len(_trigrams(token)) * _TRIGRAM_LINK_BYTES
+
+    def _remove(self, id: int) -> None:
+        title = self._titles.pop(id, None)
+        if title is None:
+            return
+        tokens = self._title_tokens.pop(id)
+        cost = self._title_cost(title, tokens)
+        for token in tokens:
+            posting = self._postings[token]
+            posting.remove(id)
+            if not posting:
+                del self._postings[token]
+                if self._loading:
+                    self._sorted_tokens.remove(token)
+                else:
+                    del self._sorted_tokens[bisect.bisect_left(self._sorted_tokens, token)]
+                for trigram in _trigrams(token):
+                    linked = self._trigram_index[trigram]
+                    linked.discard(token)
+                    if not linked:
+                        del self._trigram_index[trigram]
+                cost += self._token_cost(token)
+        del self._rank[id]
+        self._estimated_bytes -= cost
+        self._over_budget = False
+        self._results.clear()
+
+    # --- consulta ---
+
+    def suggest(self, q: str, limit: int = 10) -> list[tuple[int, str]]:
+        """Titulos con una palabra que empiece con cada termino de q. Las
+        correcciones por error de tipeo solo se usan para los terminos sin
+        coincidencias exactas. Entre los resultados se priorizan los titulos
+        mas cortos."""
+        terms = tokenize(q)
+        if not terms:
+            return []
+        key = (tuple(terms), limit)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is None:
+                cached = self._suggest(terms, limit)
+                self._results[key] = cached
+                if len(self._results) > self.result_cache_size:
+                    self._results.popitem(last=False)
+            return cached
+
+    def _suggest(self, terms: list[str], limit: int) -> list[tuple[int, str]]:
+        ranges = [self._token_range(term) for term in terms]
+        if all(ranges):
+            return [(id, self._titles[id]) for id in self._top_matching(terms, ranges, limit)]
+
+        # algun termino no coincide como prefijo: se corrige con trigramas
+        within: Optional[set[int]] = None
+        for i, (term, tokens) in enumerate(zip(terms, ranges)):
+            if tokens:
+                ids = set().union(*(self._postings[token] for token in tokens))
+            elif len(term) >= 3:
+                ids = self._match_fuzzy(term, is_prefix=i == len(terms) - 1)
+            else:
+                return []
+            within = ids if within is None else within & ids
+            if not within:
+                return []
+        ranked = heapq.nsmallest(limit, within, key=self._rank.__getitem__)
+        return [(id, self._titles[id]) for id in ranked]
+
+    def _token_range(self, prefix: str) -> list[str]:
+        start = bisect.bisect_left(self._sorted_tokens, prefix)
+        end = bisect.bisect_left(self._sorted_tokens, prefix + "\uffff", start)
+        return self._sorted_tokens[start:end]
+
+    def _top_matching(self, terms: list[str], ranges: list[list[str]], limit: int) -> list[int]:
+        """Los limit mejores ids (por rango) con una palabra que empiece con
+        cada termino. Se recorren en orden las listas del termino con menos
+        titulos y el resto de los terminos se verifica contra las palabras de
+        cada candidato, sin armar conjuntos con todos los ids."""
+        sizes = [sum(len(self._postings[token]) for token in tokens) for tokens in ranges]
+        driver = sizes.index(min(sizes))
+        # para el resto de los terminos alcanza con ver si el candidato tiene
+        # alguna de las palabras del rango; con rangos enormes (prefijos de una
+        # letra) es mas barato comparar el prefijo contra sus pocas palabras
+        checks = [
+            (None, term) if len(tokens) > 64 else (frozenset(tokens), term)
+            for i, (term, tokens) in enumerate(zip(terms, ranges)) if i != driver
+        ]
+        postings = [self._postings[token] for token in ranges[driver]]
+        if len(postings) == 1:
+            candidates, seen = postings[0], None
+        else:
+            candidates = heapq.merge(*postings, key=self._rank.__getitem__)
+            # un titulo aparece en varias listas si tiene varias palabras con el prefijo
+            seen = set()
+
+        result: list[int] = []
+        title_tokens = self._title_tokens
+        for id in candidates:
+            if seen is not None:
+                if id in seen:
+                    continue
+                seen.add(id)
+            if checks and not self._has_all(title_tokens[id], checks):
+                continue
+            result.append(id)
+            if len(result) >= limit:
+                break
+        return result
+
+    @staticmethod
+    def _has_all(tokens: tuple[str, ...], checks: list) -> bool:
+        for words, prefix in checks:
+            if words is not None:
+                if words.isdisjoint(tokens):
+                    return False
+            elif not any(token.startswith(prefix) for token in tokens):
+                return False
+        return True
+
+    def _match_fuzzy(self, term: str, is_prefix: bool) -> set[int]:
+        trigrams = _trigrams(term, prefix=is_prefix)
+        shared: dict[str, int] = {}
+        for trigram in trigrams:
+            for token in self._trigram_index.get(trigram, ()):
+                shared[token] = shared.get(token, 0) + 1
+
+        max_distance = 1 if len(term) <= 5 else 2
+        # cada edicion cambia a lo sumo 3 trigramas
+        min_shared = max(1, len(trigrams) - 3 * max_distance)
+        ids: set[int] = set()
+        for token, count in shared.items():
+            if count < min_shared:
+                continue
+            if is_prefix:
+                # el prefijo corregido puede ser mas corto o mas largo que lo tipeado
+                matched = any(
+                    _within_distance(term, token[:length], max_distance)
+                    for length in range(max(1, len(term) - max_distance), len(term) + max_distance + 1)
+                )
+            else:
+                matched = _within_distance(term, token, max_distance)
+            if matched:
+                ids.update(self._postings[token])
+        return ids
+
+    def info(self) -> dict:
+        return {
+            "ready": self.ready,
+            "titles": len(self._titles),
+            "tokens": len(self._sorted_tokens),
+            "estimated_mb": round(self._estimated_bytes / 1024 / 1024, 2),
+            "memory_budget_mb": round(self.memory_budget / 1024 / 1024, 2),
+            "over_budget": self._over_budget,
+        }
@@ -0,0 +1,11 @@
+from app.config.config import config
+
+from .catalog_stats import CatalogStats
+
+# facetas y promedios del catalogo del proceso, se cargan en el lifespan de la app
+catalog_stats = (
+    CatalogStats(refresh_seconds=config.STATS_REFRESH_SECONDS)
+    if config.STATS_ENABLED else None
+)
+
+__all__ = ["CatalogStats", "catalog_stats"]
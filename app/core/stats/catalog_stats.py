@@ -0,0 +1,260 @@
+import logging
+import threading
+from collections import Counter
+from decimal import Decimal
+from time import monotonic
+from typing import Any, Callable, Iterable, Mapping, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Facets(NamedTuple):
+    genre: str
+    year: int
+    rating: Optional[int]
+    is_watched: bool
+    price: Decimal
+    duration: Optional[int]
+
+
+# valores que toma la fila si el alta no los trae (defaults del modelo)
+_DEFAULTS = {"rating": None, "is_watched": False, "duration": None}
+
+# atributos del agregado que se reemplazan juntos al recargar
+_STATE = (
+    "_rows", "_genres", "_decades", "_ratings", "_watched",
+    "_price_sum", "_rating_sum", "_duration_sum", "_duration_count", "_snapshot",
+)
+
+
+class CatalogStats:
+    """Conteos por faceta y promedios del catalogo mantenidos en memoria.
+
+    Se construyen con una sola lectura al iniciar la app y despues los
+    repositorios los actualizan en cada alta, modificacion o baja: se resta
+    el aporte anterior de la fila y se suma el nuevo. Para eso se guarda una
+    tupla con las columnas de faceta de cada pelicula (las modificaciones
+    parciales solo traen las columnas cambiadas).
+
+    Las sumas de precio son Decimal, asi que restar y sumar no acumula error.
+    Igual que el autocompletado, cada proceso tiene su copia y no ve las
+    escrituras de los demas; refresh_seconds permite reconstruirla cada tanto.
+    """
+
+    def __init__(self, refresh_seconds: float = 0):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._rows: dict[int, _Facets] = {}
+        self._genres: Counter = Counter()
+        self._decades: Counter = Counter()
+        self._ratings: Counter = Counter()
+        self._watched: Counter = Counter()
+        self._price_sum = Decimal(0)
+        self._rating_sum = 0
+        self._duration_sum = 0
+        self._duration_count = 0
+        self._snapshot: Optional[dict] = None
+        self.loaded_at: Optional[float] = None
+        self.ready = False
+        # recarga en curso: evita dos lecturas de la tabla a la vez; las
+        # escrituras que llegan mientras tanto se anotan en _pending
+        self.refreshing = False
+        self._pending: list[tuple[str, list]] = []
+        # la primera carga (o su error): hasta entonces no hay agregado anterior que servir
+        self._first_load = threading.Event()
+
+    # --- carga y actualizacion ---
+
+    def load(self, rows: Iterable[Mapping[str, Any]]) -> int:
+        """Reemplaza todo con las filas dadas (id y columnas de faceta)."""
+        with self._lock:
+            self._start_refresh()
+        return self._rebuild(rows)
+
+    def refresh_if_stale(self, rows: Callable[[], Iterable[Mapping[str, Any]]]) -> None:
+        """Recarga desde rows() si nunca se cargo o paso refresh_seconds. Si
+        otro request ya esta recargando no se lee la tabla de nuevo: se sigue
+        respondiendo con el agregado anterior, o se espera la primera carga."""
+        with self._lock:
+            if self.refreshing and self.loaded_at is None:
+                wait = True
+            elif self.refreshing or not self.is_stale():
+                return
+            else:
+                wait = False
+                self._start_refresh()
+        if wait:
+            self._first_load.wait()
+            return
+        self._rebuild(rows())
+
+    def _start_refresh(self) -> None:
+        self.refreshing = True
+        self._pending = []
+
+    def _rebuild(self, rows: Iterable[Mapping[str, Any]]) -> int:
+        # la lectura de la tabla arma un agregado nuevo sin tomar el lock; las
+        # consultas y escrituras siguen sobre el actual hasta el intercambio
+        try:
+            fresh = CatalogStats(self.refresh_seconds)
+            for row in rows:
+                fresh._add(row["id"], fresh._facets(row, None))
+            fresh.ready = True
+        except BaseException:
+            with self._lock:
+                self.refreshing = False
+                self._pending = []
+            self._first_load.set()
+            raise
+
+        with self._lock:
+            # escrituras que llegaron durante la lectura: aplicarlas otra vez es
+            # inocuo si la lectura ya las habia visto
+            for operation, items in self._pending:
+                if operation == "apply":
+                    fresh.apply(items)
+                else:
+                    fresh.remove(items)
+            for name in _STATE:
+                setattr(self, name, getattr(fresh, name))
+            self.loaded_at = monotonic()
+            self.ready = fresh.ready
+            self.refreshing = False
+            self._pending = []
+            self._first_load.set()
+            logger.info("Estadisticas del catalogo: %s peliculas", len(self._rows))
+            return len(self._rows)
+
+    def apply(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """Altas y modificaciones: cada fila trae el id y las columnas escritas."""
+        rows = list(rows)
+        unknown = 0
+        with self._lock:
+            if self.refreshing:
+                self._pending.append(("apply", rows))
+            for row in rows:
+                id = row.get("id")
+                if id is None:
+                    # alta masiva cuyos ids no se pudieron recuperar (no deberia
+                    # pasar, ver BaseRepository.bulk_create): se reconstruye en
+                    # la proxima consulta
+                    self.ready = False
+                    unknown += 1
+                    continue
+                previous = self._rows.get(id)
+                if previous is not None:
+                    self._subtract(previous)
+                elif not self._has_all_columns(row):
+                    # modificacion parcial de una fila que no se conoce (escrita por
+                    # otro proceso): no hay con que completarla, se reconstruye todo
+                    # en la proxima consulta
+                    self.ready = False
+                    continue
+                self._add(id, self._facets(row, previous))
+        if unknown:
+            logger.warning(
+                "Estadisticas del catalogo: %d filas escritas sin id, se reconstruyen "
+                "con una lectura completa de la tabla en la proxima consulta", unknown,
+            )
+
+    def remove(self, ids: Iterable[int]) -> None:
+        ids = list(ids)
+        with self._lock:
+            if self.refreshing:
+                self._pending.append(("remove", ids))
+            for id in ids:
+                previous = self._rows.pop(id, None)
+                if previous is not None:
+                    self._subtract(previous)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rows.clear()
+            for counter in (self._genres, self._decades, self._ratings, self._watched):
+                counter.clear()
+            self._price_sum = Decimal(0)
+            self._rating_sum = self._duration_sum = self._duration_count = 0
+            self._snapshot = None
+            self.ready = False
+
+    def is_stale(self) -> bool:
+        return (
+            not self.ready
+            or self.refresh_seconds > 0 and monotonic() - self.loaded_at > self.refresh_seconds
+        )
+
+    @staticmethod
+    def _has_all_columns(row: Mapping[str, Any]) -> bool:
+        return all(field in row or field in _DEFAULTS for field in _Facets._fields)
+
+    @staticmethod
+    def _facets(row: Mapping[str, Any], previous: Optional[_Facets]) -> _Facets:
+        base = previous._asdict() if previous is not None else _DEFAULTS
+        values = {field: row[field] if field in row else base[field] for field in _Facets._fields}
+        values["price"] = Decimal(str(values["price"]))
+        values["is_watched"] = bool(values["is_watched"])
+        return _Facets(**values)
+
+    def _add(self, id: int, facets: _Facets) -> None:
+        self._rows[id] = facets
+        self._count(facets, 1)
+
+    def _subtract(self, facets: _Facets) -> None:
+        self._count(facets, -1)
+
+    def _count(self, facets: _Facets, sign: int) -> None:
+        self._genres[facets.genre] += sign
+        self._decades[facets.year // 10 * 10] += sign
+        self._ratings[facets.rating] += sign
+        self._watched[facets.is_watched] += sign
+        self._price_sum += sign * facets.price
+        if facets.rating is not None:
+            self._rating_sum += sign * facets.rating
+        if facets.duration is not None:
+            self._duration_sum += sign * facets.duration
+            self._duration_count += sign
+        self._snapshot = None
+
+    # --- consulta ---
+
+    def snapshot(self) -> dict:
+        """Facetas y promedios actuales. Se arma de nuevo solo si hubo
+        escrituras desde la ultima consulta."""
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = self._build_snapshot()
+            return self._snapshot
+
+    def _build_snapshot(self) -> dict:
+        total = len(self._rows)
+        rated = total - self._ratings[None]
+        return {
+            "total": total,
+            "by_genre": _positive(self._genres),
+            "by_decade": _positive(self._decades),
+            "by_rating": {
+                ("sin_calificar" if rating is None else str(rating)): count
+                for rating, count in sorted(self._ratings.items(), key=lambda item: (item[0] is None, item[0] or 0))
+                if count > 0
+            },
+            "watched": self._watched[True],
+            "unwatched": self._watched[False],
+            "avg_price": _average(self._price_sum, total, 2),
+            "avg_rating": _average(self._rating_sum, rated, 2),
+            "avg_duration": _average(self._duration_sum, self._duration_count, 1),
+        }
+
+    def info(self) -> dict:
+        return {
+            "ready": self.ready,
+            "movies": len(self._rows),
+            "age_seconds": round(monotonic() - self.loaded_at, 1) if self.loaded_at else None,
+        }
+
+
+def _positive(counter: Counter) -> dict:
+    return {str(key): count for key, count in sorted(counter.items()) if count > 0}
+
+
+def _average(total, count: int, digits: int) -> Optional[float]:
+    return round(float(total) / count, digits) if count else None
@@ -0,0 +1,78 @@
+"""Micro-benchmark del overhead por request de AuthMiddleware.
+
+Invoca la app ASGI directamente (sin servidor ni red) y compara la app sin
+middleware contra la app envuelta, para rutas excluidas, sin token y con token.
+
+    python -m app.scripts.bench_auth_middleware --requests 20000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI
+
+from app.api.middleware.auth_middleware import AuthMiddleware
+
+
+def build_app(with_auth: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/movies/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    if with_auth:
+        app.add_middleware(
+            AuthMiddleware,
+            excluded_paths=["/docs", "/redoc", "/openapi.json", "/health", "/favicon.ico"],
+            protected_paths=[],
+        )
+    return app
+
+
+async def run(app, path: str, headers: list, requests: int) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": headers,
+        "client": ("127.0.0.1", 1234), "server": ("testserver", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main(requests: int):
+    token_header = [(b"x-authorization", json.dumps({"token": "abc", "clientKey": "web"}).encode())]
+    bare, wrapped = build_app(False), build_app(True)
+    cases = [
+        ("ruta excluida", "/health", []),
+        ("sin token", "/api/v1/movies/ping", []),
+        ("con token", "/api/v1/movies/ping", token_header),
+    ]
+    for name, path, headers in cases:
+        base = await run(bare, path, headers, requests)
+        auth = await run(wrapped, path, headers, requests)
+        print(f"{name:15s} sin middleware {base:8.1f} us   con AuthMiddleware {auth:8.1f} us   overhead {auth - base:7.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    asyncio.run(main(parser.parse_args().requests))
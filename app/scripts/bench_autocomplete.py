@@ -0,0 +1,92 @@
+"""Benchmark del indice de autocompletado de titulos: tiempo de construccion,
+memoria (medida con tracemalloc contra la estimacion del indice) y latencia de
+sugerencias por tipo de consulta.
+
+Los titulos se generan combinando palabras al azar, no hace falta base de datos.
+
+    python -m app.scripts.bench_autocomplete --titles 200000 --queries 2000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from app.core.search.autocomplete import TitleAutocomplete
+
+WORDS = (
+    "amor guerra noche ciudad sombra camino tiempo mar sueño fuego silencio "
+    "corazón ángel diablo río montaña viaje regreso último primer secreto "
+    "verano invierno luna sol estrella tierra memoria fantasma ladrón rey "
+    "reina hijo padre madre hermano casa puerta ventana jardín bosque desierto "
+    "isla tormenta venganza promesa destino milagro espejo cristal acero "
+    "sangre oro plata león lobo águila dragón caballero pasajero octavo"
+).split()
+CONNECTORS = ["el", "la", "los", "las", "de", "del", "y", "en"]
+
+
+def make_title(rng: random.Random) -> str:
+    words = []
+    for _ in range(rng.randint(1, 4)):
+        if words and rng.random() < 0.4:
+            words.append(rng.choice(CONNECTORS))
+        words.append(rng.choice(WORDS))
+    title = " ".join(words).capitalize()
+    # sufijo para que haya muchas palabras distintas, como en un catalogo real
+    return f"{title} {rng.randint(1, 50000)}" if rng.random() < 0.5 else title
+
+
+def typo(word: str, rng: random.Random) -> str:
+    i = rng.randrange(len(word) - 1)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main(titles: int, queries: int, seed: int):
+    rng = random.Random(seed)
+    rows = [(i, make_title(rng)) for i in range(1, titles + 1)]
+
+    index = TitleAutocomplete(memory_budget_mb=4096)
+    tracemalloc.start()
+    start = time.perf_counter()
+    index.load(rows)
+    elapsed = time.perf_counter() - start
+    measured = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+    tracemalloc.stop()
+    info = index.info()
+    print(
+        f"construccion: {titles} titulos en {elapsed:.2f} s, {info['tokens']} palabras, "
+        f"memoria medida {measured:.1f} MB, estimada {info['estimated_mb']:.1f} MB"
+    )
+
+    long_words = [w for w in WORDS if len(w) >= 5]
+    cases = {
+        "prefijo 1 letra": lambda: rng.choice(WORDS)[:1],
+        "prefijo 3 letras": lambda: rng.choice(WORDS)[:3],
+        "dos palabras": lambda: f"{rng.choice(WORDS)} {rng.choice(WORDS)[:3]}",
+        "con error": lambda: typo(rng.choice(long_words), rng),
+    }
+    for name, make_query in cases.items():
+        latencies, empty = [], 0
+        for _ in range(queries):
+            q = make_query()
+            start = time.perf_counter()
+            result = index.suggest(q, limit=10)
+            latencies.append((time.perf_counter() - start) * 1e6)
+            empty += not result
+        print(
+            f"{name:18s} p50 {percentile(latencies, 0.5):8.1f} us   p99 {percentile(latencies, 0.99):8.1f} us   "
+            f"sin resultados {empty}/{queries}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--titles", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    main(args.titles, args.queries, args.seed)
@@ -0,0 +1,92 @@
+"""CPU por request del listado de peliculas: camino anterior (entidades ORM,
+MovieResponse por fila, ApiResponse revalidado contra response_model y
+codificado con json) contra el camino rapido (filas Core serializadas una vez
+con pydantic-core dentro del sobre pre-renderizado).
+
+Usa SQLite en memoria con --rows peliculas y pide una sola pagina de ese tamaño.
+
+    python -m app.scripts.bench_movie_list_json --rows 10000 --requests 20
+"""
+import argparse
+import json
+import time
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.v1.schemas.generic import PagedApiResponse
+from app.api.v1.schemas.movies import MovieResponse
+from app.api.v1.services.serialization import movie_list_response
+from app.core.database.models import Base, Movie
+from app.core.database.repositories.base_repository import BaseRepository
+
+response_adapter = TypeAdapter(PagedApiResponse[list[MovieResponse]])
+
+
+def seed(engine, rows: int) -> None:
+    genres = ["Drama", "Comedia", "Terror", "Accion"]
+    with engine.begin() as conn:
+        conn.execute(insert(Movie.__table__), [
+            {
+                "title": f"Pelicula {i:06d}", "director": "Director", "year": 1900 + i % 120,
+                "genre": genres[i % 4], "duration": 90 + i % 60, "rating": i % 11,
+                "description": "Descripcion de prueba", "price": 1 + i % 20, "is_watched": bool(i % 2),
+            }
+            for i in range(rows)
+        ])
+
+
+def orm_path(repo: BaseRepository, limit: int) -> bytes:
+    movies, next_cursor = repo.get_page_after(limit=limit)
+    content = PagedApiResponse(
+        status="success",
+        message="Listado obtenido correctamente",
+        errors=[],
+        data=[MovieResponse.model_validate(m) for m in movies],
+        next_cursor=next_cursor,
+    )
+    # lo que hace FastAPI con response_model: dump, validacion, serializacion y json.dumps
+    value = response_adapter.validate_python(content.model_dump())
+    body = json.dumps(
+        response_adapter.dump_python(value, mode="json"), ensure_ascii=False, separators=(",", ":")
+    ).encode()
+    repo.session.expunge_all()
+    return body
+
+
+def fast_path(repo: BaseRepository, limit: int) -> bytes:
+    rows, next_cursor = repo.get_page_rows_after(limit=limit)
+    return movie_list_response(rows, "Listado obtenido correctamente", next_cursor).body
+
+
+def measure(name: str, fn, requests: int) -> bytes:
+    body = fn()
+    cpu, wall = time.process_time(), time.perf_counter()
+    for _ in range(requests):
+        fn()
+    cpu = (time.process_time() - cpu) / requests * 1000
+    wall = (time.perf_counter() - wall) / requests * 1000
+    print(f"{name:14s} {cpu:8.2f} ms CPU/request  {wall:8.2f} ms/request  {len(body)} bytes")
+    return body
+
+
+def main(rows: int, requests: int):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    seed(engine, rows)
+    with sessionmaker(bind=engine)() as session:
+        repo = BaseRepository(Movie, session)
+        before = measure("ORM + modelos", lambda: orm_path(repo, rows), requests)
+        after = measure("filas + core", lambda: fast_path(repo, rows), requests)
+    assert json.loads(before) == json.loads(after), "las respuestas difieren"
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+    main(args.rows, args.requests)
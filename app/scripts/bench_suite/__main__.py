@@ -0,0 +1,80 @@
+import argparse
+import os
+import tempfile
+
+
+def configure_environment(url: str, cache: bool) -> None:
+    # antes de importar la app: config y db_connection se crean al importarse
+    os.environ["DB_URL"] = url
+    os.environ.setdefault("ENVIRONMENT", "testing")
+    os.environ.setdefault("PERSIST_PATH", tempfile.gettempdir())
+    os.environ["DEBUG"] = "false"
+    os.environ["LOG_LEVEL"] = "WARNING"
+    os.environ["DB_DIAGNOSTICS"] = "false"
+    # sin cache se mide el camino a la base; con --cache, el de un catalogo caliente
+    os.environ["CACHE_ENABLED"] = "true" if cache else "false"
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.scripts.bench_suite")
+    parser.add_argument("--size", choices=["1k", "100k", "1m"], default="100k")
+    parser.add_argument("--url", help="base a usar en lugar del SQLite del dataset (se siembra si hace falta)")
+    parser.add_argument("--data-dir", default=tempfile.gettempdir(), help="donde se guardan los SQLite sembrados")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--suite", choices=["all", "repo", "http", "async"], default="all",
+        help="all = repo + http; async compara los stacks sync y DB_ASYNC en procesos aparte",
+    )
+    parser.add_argument("--ops", type=int, default=500, help="llamadas por caso del repositorio")
+    parser.add_argument("--requests", type=int, default=500, help="requests por ruta")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--levels", default="1,4,16,64", help="escalones de concurrencia de --suite async")
+    parser.add_argument("--p99-ms", type=float, default=50.0, help="p99 maximo para el throughput de --suite async")
+    parser.add_argument("--alloc-samples", type=int, default=50, help="operaciones medidas con tracemalloc (0 = no medir)")
+    parser.add_argument("--cache", action="store_true", help="con el cache de lecturas habilitado")
+    parser.add_argument("--output", help="ruta del reporte JSON")
+    parser.add_argument("--compare", help="reporte JSON anterior contra el cual comparar")
+    args = parser.parse_args()
+
+    from .dataset import SIZES, dataset_url, ensure_dataset
+
+    movies = SIZES[args.size]
+    url = args.url or dataset_url(args.size, args.seed, args.data_dir)
+    ensure_dataset(url, movies, args.seed).dispose()
+    configure_environment(url, args.cache)
+
+    from app.core.database.connection import db_connection
+    from . import report
+
+    results = {}
+    if args.suite in ("all", "repo"):
+        from . import repository
+
+        print("repositorio:")
+        with db_connection.get_session() as session:
+            results.update(repository.run(session, movies, args.ops, args.alloc_samples, args.seed))
+    if args.suite in ("all", "http"):
+        from app.api.main import create_app
+        from . import http
+
+        print(f"http (concurrencia {args.concurrency}):")
+        results.update(http.run(create_app(), movies, args.requests, args.concurrency, args.alloc_samples, args.seed))
+    if args.suite == "async":
+        from . import stacks
+
+        levels = [int(level) for level in args.levels.split(",")]
+        results.update(stacks.run(movies, args.requests, levels, args.p99_ms, args.seed))
+
+    built = report.build(
+        results, dataset=args.size, movies=movies, seed=args.seed, cache=args.cache,
+        database=db_connection.engine.url.render_as_string(hide_password=True),
+        concurrency=args.concurrency,
+    )
+    if args.output:
+        report.write(built, args.output)
+    if args.compare:
+        report.compare(built, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import os
+import random
+import time
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.engine import Engine
+
+from app.core.database.models import Base, Movie
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+GENRES = ["Drama", "Comedia", "Accion", "Terror", "Ciencia ficcion", "Animacion", "Documental", "Romance"]
+WORDS = (
+    "amor guerra noche ciudad sombra camino tiempo mar sueño fuego silencio corazon angel "
+    "rio montaña viaje regreso ultimo secreto verano invierno luna sol estrella memoria "
+    "fantasma ladron rey reina hijo padre madre casa puerta jardin bosque isla tormenta"
+).split()
+DIRECTORS = [f"Director {i}" for i in range(500)]
+
+
+def dataset_url(size: str, seed: int, data_dir: str) -> str:
+    return f"sqlite:///{os.path.join(data_dir, f'bench_{size}_{seed}.db')}"
+
+
+def make_rows(rng: random.Random, start: int, count: int) -> list[dict]:
+    rows = []
+    for i in range(start, start + count):
+        title = " ".join(rng.choices(WORDS, k=rng.randint(1, 4))).capitalize()
+        rows.append({
+            # el numero hace unica la clave natural (title, year, director)
+            "title": f"{title} {i}",
+            "director": rng.choice(DIRECTORS),
+            "year": rng.randint(1920, 2025),
+            "genre": rng.choice(GENRES),
+            "duration": rng.randint(70, 180),
+            "rating": rng.randint(0, 10) if rng.random() < 0.8 else None,
+            "description": f"{rng.choice(WORDS)} y {rng.choice(WORDS)}",
+            "price": round(rng.uniform(1, 30), 2),
+            "is_watched": rng.random() < 0.3,
+        })
+    return rows
+
+
+def ensure_dataset(url: str, movies: int, seed: int, chunk_size: int = 10_000) -> Engine:
+    """Crea las tablas y siembra movies peliculas si la tabla no tiene
+    exactamente esa cantidad (una corrida anterior con el mismo tamaño se
+    reutiliza tal cual)."""
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        current = conn.scalar(select(func.count()).select_from(Movie.__table__))
+    if current == movies:
+        return engine
+
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    table = Movie.__table__
+    with engine.begin() as conn:
+        conn.execute(table.delete())
+        for offset in range(0, movies, chunk_size):
+            conn.execute(insert(table), make_rows(rng, offset, min(chunk_size, movies - offset)))
+    print(f"dataset: {movies} peliculas sembradas en {time.perf_counter() - start:.1f} s")
+    return engine
@@ -0,0 +1,146 @@
+"""Generador de carga en proceso: httpx.AsyncClient con ASGITransport contra
+create_app(), sin servidor ni red, con --concurrency requests en vuelo.
+
+Cubre todas las rutas de app/api/v1/endpoints/movies.py y /health. Las
+escrituras crean sus propias peliculas y los DELETE borran solo esas."""
+import asyncio
+import io
+import json
+import random
+import time
+from typing import Awaitable, Callable
+
+import httpx
+
+from .dataset import make_rows
+from .measure import PeakAllocations, summarize
+
+PREFIX = "/api/v1/movies"
+BULK_SIZE = 10
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+def movie_payload(row: dict) -> dict:
+    return {k: v for k, v in row.items() if v is not None}
+
+
+def scenarios(movies: int, rng: random.Random) -> dict[str, Request]:
+    ids = [rng.randint(1, movies) for _ in range(10_000)]
+    pick = lambda i: ids[i % len(ids)]
+    serial = iter(range(movies * 100, movies * 1000))
+    new_row = lambda: movie_payload(make_rows(rng, next(serial), 1)[0])
+    created: list[int] = []
+    bulk_ids: list[list[int]] = []
+
+    async def create(client, i):
+        response = await client.post(f"{PREFIX}/", json=new_row())
+        if response.status_code == 200:
+            created.append(response.json()["data"]["id"])
+        return response
+
+    async def delete(client, i):
+        return await client.delete(f"{PREFIX}/{created.pop()}")
+
+    async def bulk_create(client, i):
+        response = await client.post(f"{PREFIX}/bulk", json=[new_row() for _ in range(BULK_SIZE)])
+        if response.status_code == 200:
+            bulk_ids.append([item["id"] for item in response.json()["data"]["items"] if item["id"] is not None])
+        return response
+
+    async def import_ndjson(client, i):
+        body = "".join(json.dumps(new_row()) + "\n" for _ in range(BULK_SIZE)).encode()
+        return await client.post(
+            f"{PREFIX}/import", files={"file": ("movies.ndjson", io.BytesIO(body), "application/x-ndjson")}
+        )
+
+    return {
+        "GET /health": lambda client, i: client.get("/health"),
+        "GET /hello": lambda client, i: client.get(f"{PREFIX}/hello"),
+        "GET / (pagina 20)": lambda client, i: client.get(f"{PREFIX}/", params={"limit": 20}),
+        "GET / (filtros)": lambda client, i: client.get(
+            f"{PREFIX}/", params={"genre": "Drama", "year_min": 1990, "year_max": 2010, "limit": 50}
+        ),
+        "GET /{id}": lambda client, i: client.get(f"{PREFIX}/{pick(i)}"),
+        "GET /?ids= (20)": lambda client, i: client.get(
+            f"{PREFIX}/", params={"ids": ",".join(str(pick(i + k)) for k in range(20))}
+        ),
+        "POST /batch-get (100)": lambda client, i: client.post(
+            f"{PREFIX}/batch-get", json={"ids": [pick(i + k) for k in range(100)]}
+        ),
+        "GET /search": lambda client, i: client.get(f"{PREFIX}/search", params={"q": "amor", "limit": 20}),
+        "GET /suggest": lambda client, i: client.get(f"{PREFIX}/suggest", params={"q": "noch"}),
+        "GET /stats": lambda client, i: client.get(f"{PREFIX}/stats"),
+        "GET /export": lambda client, i: client.get(
+            f"{PREFIX}/export", params={"year_min": 2000, "year_max": 2000, "genre": "Drama"}
+        ),
+        "POST /": create,
+        "PATCH /{id}": lambda client, i: client.patch(f"{PREFIX}/{created[i % len(created)]}", json={"rating": i % 11}),
+        "DELETE /{id}": delete,
+        "POST /bulk": bulk_create,
+        "PATCH /bulk": lambda client, i: client.patch(
+            f"{PREFIX}/bulk", json=[{"id": id, "price": 1 + i % 20} for id in bulk_ids[i % len(bulk_ids)]]
+        ),
+        "DELETE /bulk": lambda client, i: client.request("DELETE", f"{PREFIX}/bulk", json={"ids": bulk_ids.pop()}),
+        "POST /import": import_ndjson,
+    }
+
+
+async def load(client: httpx.AsyncClient, request: Request, total: int, concurrency: int, start_at: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(start_at, start_at + total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            t = time.perf_counter()
+            response = await request(client, i)
+            latencies.append(time.perf_counter() - t)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+async def allocations(client: httpx.AsyncClient, request: Request, samples: int, offset: int) -> dict:
+    with PeakAllocations() as tracker:
+        for i in range(samples):
+            with tracker.sample():
+                await request(client, offset + i)
+    return tracker.summary()
+
+
+async def check_route_labels(client: httpx.AsyncClient) -> None:
+    """Las series de /metrics deben usar la plantilla completa de la ruta,
+    con el prefijo de include_router, y no la relativa a su router."""
+    expected = f'route="{PREFIX}/{{movie_id}}"'
+    if expected not in (await client.get("/metrics")).text:
+        raise RuntimeError(f"/metrics no tiene series con {expected}")
+
+
+async def run_async(app, movies: int, requests: int, concurrency: int, alloc_samples: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    # ASGITransport no corre el lifespan: se entra a mano para cargar los indices en memoria
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, request in scenarios(movies, rng).items():
+                # cada escenario hace requests + alloc_samples llamadas: los DELETE
+                # borran exactamente lo que crearon los POST
+                result = await load(client, request, requests, concurrency, 0)
+                result.update(await allocations(client, request, alloc_samples, requests))
+                results[f"http.{name}"] = result
+                print(
+                    f"  http.{name:20s} {result['throughput']:9.1f} req/s  p50 {result['p50_ms']:8.3f} ms"
+                    f"  p99 {result['p99_ms']:8.3f} ms  errores {result['errors']}"
+                )
+            await check_route_labels(client)
+    return results
+
+
+def run(app, movies: int, requests: int, concurrency: int, alloc_samples: int, seed: int) -> dict:
+    return asyncio.run(run_async(app, movies, requests, concurrency, alloc_samples, seed))
@@ -0,0 +1,75 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def summarize(latencies: list[float], elapsed: float, errors: int = 0) -> dict:
+    """latencies en segundos; el resultado en operaciones/s y milisegundos."""
+    return {
+        "ops": len(latencies),
+        "errors": errors,
+        "throughput": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+def timed(fn: Callable[[int], object], ops: int, warmup: int = 10) -> dict:
+    for i in range(warmup):
+        fn(i)
+    latencies = []
+    start = time.perf_counter()
+    for i in range(ops):
+        t = time.perf_counter()
+        fn(warmup + i)
+        latencies.append(time.perf_counter() - t)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+class PeakAllocations:
+    """Pico de memoria asignada por operacion (KiB) medido con tracemalloc:
+    lo que la operacion reserva de forma transitoria, aunque lo libere al
+    terminar. Se mide en una pasada aparte y secuencial porque tracemalloc
+    la hace mas lenta y para atribuir la memoria a cada operacion."""
+
+    def __init__(self):
+        self.peaks: list[int] = []
+
+    def __enter__(self):
+        tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc):
+        tracemalloc.stop()
+
+    @contextmanager
+    def sample(self):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        yield
+        self.peaks.append(tracemalloc.get_traced_memory()[1] - current)
+
+    def summary(self) -> dict:
+        if not self.peaks:
+            return {}
+        return {
+            "alloc_peak_kib_p50": round(percentile(self.peaks, 0.5) / 1024, 1),
+            "alloc_peak_kib_max": round(max(self.peaks) / 1024, 1),
+        }
+
+
+def allocations(fn: Callable[[int], object], samples: int, offset: int = 0) -> dict:
+    with PeakAllocations() as tracker:
+        for i in range(samples):
+            with tracker.sample():
+                fn(offset + i)
+    return tracker.summary()
@@ -0,0 +1,63 @@
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Optional
+
+import sqlalchemy
+
+# metricas donde mas es mejor; en el resto (latencias, memoria) menos es mejor
+HIGHER_IS_BETTER = {"throughput"}
+COMPARED = ("throughput", "p50_ms", "p95_ms", "p99_ms", "alloc_peak_kib_p50")
+
+
+def git_revision() -> Optional[str]:
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout
+        return revision + ("-dirty" if dirty.strip() else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build(results: dict, **meta) -> dict:
+    return {
+        "meta": {
+            "commit": git_revision(),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "machine": platform.machine(),
+            **meta,
+        },
+        "results": results,
+    }
+
+
+def write(report: dict, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"reporte guardado en {path}")
+
+
+def compare(report: dict, path: str, threshold: float = 0.1) -> None:
+    """Imprime la variacion de cada metrica contra un reporte anterior y marca
+    con ! las que empeoraron mas de threshold."""
+    with open(path) as f:
+        base = json.load(f)
+    print(f"comparacion contra {path} (commit {base['meta'].get('commit')}):")
+    for name, current in report["results"].items():
+        previous = base["results"].get(name)
+        if previous is None:
+            continue
+        changes = []
+        for metric in COMPARED:
+            before, after = previous.get(metric), current.get(metric)
+            if not before or after is None:
+                continue
+            delta = (after - before) / before
+            worse = -delta if metric in HIGHER_IS_BETTER else delta
+            changes.append(f"{metric} {delta:+.0%}{' !' if worse > threshold else ''}")
+        print(f"  {name:26s} {'  '.join(changes)}")
@@ -0,0 +1,70 @@
+"""Micro-benchmarks de los metodos del repositorio sobre el dataset sembrado.
+
+Las escrituras trabajan sobre filas propias (se crean y se borran en la
+misma corrida), asi el dataset queda igual para la siguiente."""
+import random
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from app.core.database.repositories.movie_repository import MovieRepository
+from .dataset import make_rows
+from .measure import allocations, timed
+
+BULK_SIZE = 100
+WARMUP = 5
+
+
+def cases(repo: MovieRepository, movies: int, rng: random.Random) -> dict[str, Callable[[int], object]]:
+    ids = [rng.randint(1, movies) for _ in range(10_000)]
+    pick = lambda i: ids[i % len(ids)]
+    created: list[int] = []
+    bulk_ids: list[list[int]] = []
+    serial = iter(range(movies, movies * 100))
+    # filas nuevas numeradas fuera del rango del dataset, asi no chocan con la clave natural
+    new_row = lambda: make_rows(rng, next(serial), 1)[0]
+
+    def create(i):
+        created.append(repo.create(new_row()).id)
+
+    def bulk_create(i):
+        bulk_ids.append(repo.bulk_create([new_row() for _ in range(BULK_SIZE)]))
+
+    return {
+        "get_by_id": lambda i: repo.get_by_id(pick(i)),
+        "read_by_id": lambda i: repo.read_by_id(pick(i)),
+        "read_version": lambda i: repo.read_version(pick(i)),
+        "get_many_rows_100": lambda i: repo.get_many_rows([pick(i + k) for k in range(100)]),
+        "get_all_100": lambda i: repo.get_all(skip=(i * 100) % max(1, movies - 100), limit=100),
+        "page_rows_100": lambda i: repo.get_page_rows_after(limit=100),
+        "search_rows_genre": lambda i: repo.search_rows({"genre": "Drama"}, limit=100),
+        "search_rows_range": lambda i: repo.search_rows(
+            {"year_min": 1990, "year_max": 2000, "rating_min": 7}, limit=100, order_by="year"
+        ),
+        "search_text": lambda i: repo.search_text("amor", {}, limit=20),
+        "count": lambda i: repo.count(),
+        "count_genre": lambda i: repo.count(genre="Drama"),
+        "create": create,
+        "update_by_id": lambda i: repo.update_by_id(created[i % len(created)], {"rating": i % 11}),
+        "delete_by_id": lambda i: repo.delete_by_id(created.pop()),
+        "bulk_create_100": bulk_create,
+        "bulk_update_100": lambda i: repo.bulk_update(
+            [{"id": id, "price": 1 + i % 20} for id in bulk_ids[i % len(bulk_ids)]]
+        ),
+        "bulk_delete_100": lambda i: repo.bulk_delete(bulk_ids.pop()),
+    }
+
+
+def run(session: Session, movies: int, ops: int, alloc_samples: int, seed: int) -> dict:
+    repo = MovieRepository(session)
+    rng = random.Random(seed)
+    results = {}
+    for name, fn in cases(repo, movies, rng).items():
+        # todos los casos hacen la misma cantidad de llamadas: los borrados
+        # consumen exactamente lo que crearon create / bulk_create
+        result = timed(fn, ops, warmup=WARMUP)
+        result.update(allocations(fn, alloc_samples, offset=WARMUP + ops))
+        session.expunge_all()
+        results[f"repo.{name}"] = result
+        print(f"  repo.{name:20s} {result['throughput']:9.1f} ops/s  p50 {result['p50_ms']:8.3f} ms  p99 {result['p99_ms']:8.3f} ms")
+    return results
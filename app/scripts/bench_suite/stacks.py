@@ -0,0 +1,118 @@
+"""Comparacion async vs sync: las rutas que tienen version async
+(movies_async.py) medidas con la app sync y con DB_ASYNC, subiendo la
+concurrencia por escalones. De cada ruta se informa el throughput del
+escalon mas rapido cuyo p99 no supera --p99-ms: req/s a igual p99.
+
+Cada stack corre en un proceso aparte, porque DB_ASYNC decide que router
+se importa al cargar app.api.main.
+
+    python -m app.scripts.bench_suite --suite async --p99-ms 50 --levels 1,4,16,64
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+
+import httpx
+from sqlalchemy.engine import make_url
+
+from .http import load, scenarios
+
+ROUTES = (
+    "GET /{id}",
+    "GET / (pagina 20)",
+    "GET / (filtros)",
+    "POST /batch-get (100)",
+    "GET /search",
+    "POST /",
+    "PATCH /{id}",
+    "DELETE /{id}",
+)
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "mysql": "mysql+aiomysql"}
+
+
+def async_url(url: str) -> str:
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS[parsed.get_backend_name()]).render_as_string(hide_password=False)
+
+
+def at_p99(curve: list[dict], p99_ms: float) -> dict:
+    within = [point for point in curve if point["p99_ms"] <= p99_ms]
+    best = max(within, key=lambda point: point["throughput"]) if within else None
+    return {
+        "throughput": best["throughput"] if best else 0.0,
+        "p99_ms": best["p99_ms"] if best else None,
+        "concurrency": best["concurrency"] if best else None,
+        "curve": curve,
+    }
+
+
+async def sweep(movies: int, requests: int, levels: list[int], seed: int) -> dict[str, list[dict]]:
+    from app.api.main import create_app
+
+    app = create_app()
+    available = scenarios(movies, random.Random(seed))
+    curves = {}
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for name in ROUTES:
+                # todos los escalones en todas las rutas: los DELETE borran lo que crearon los POST
+                curve = []
+                for step, concurrency in enumerate(levels):
+                    result = await load(client, available[name], requests, concurrency, step * requests)
+                    curve.append({
+                        "concurrency": concurrency,
+                        "throughput": result["throughput"],
+                        "p99_ms": result["p99_ms"],
+                        "errors": result["errors"],
+                    })
+                curves[name] = curve
+    return curves
+
+
+def run(movies: int, requests: int, levels: list[int], p99_ms: float, seed: int) -> dict:
+    """Corre sweep() en un proceso por stack, con el entorno ya configurado
+    por __main__ (DB_URL apunta al dataset sembrado)."""
+    results = {}
+    for stack in ("sync", "async"):
+        env = {
+            **os.environ,
+            "DB_ASYNC": "true" if stack == "async" else "false",
+            "DB_ASYNC_URL": async_url(os.environ["DB_URL"]),
+        }
+        command = [
+            sys.executable, "-m", __name__, "--movies", str(movies), "--requests", str(requests),
+            "--levels", ",".join(map(str, levels)), "--seed", str(seed),
+        ]
+        output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+        for name, curve in json.loads(output.splitlines()[-1]).items():
+            results[f"async.{stack}.{name}"] = at_p99(curve, p99_ms)
+
+    print(f"async vs sync (req/s con p99 <= {p99_ms} ms):")
+    for name in ROUTES:
+        sync, async_ = results[f"async.sync.{name}"], results[f"async.async.{name}"]
+        ratio = f"x{async_['throughput'] / sync['throughput']:.2f}" if sync["throughput"] else "-"
+        print(
+            f"  {name:22s} sync {sync['throughput']:9.1f} (c={sync['concurrency']})"
+            f"  async {async_['throughput']:9.1f} (c={async_['concurrency']})  {ratio}"
+        )
+    return results
+
+
+def main():
+    # proceso hijo de run(): imprime las curvas como JSON en la ultima linea
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--movies", type=int, required=True)
+    parser.add_argument("--requests", type=int, required=True)
+    parser.add_argument("--levels", required=True)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    levels = [int(level) for level in args.levels.split(",")]
+    print(json.dumps(asyncio.run(sweep(args.movies, args.requests, levels, args.seed))))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,30 @@
-from sqlalchemy import desc
 from app.core.database.connection import db_connection
 from app.core.database.repositories.movie_repository import MovieRepository
-from app.core.database.models.models import Movie
 
 def main():
     with db_connection.get_session() as db:
         repo = MovieRepository(db)
 
-        movie = Movie(
-            title="Alien",
-            director="Ridley Scott",
-            year=1979,
-            genre="Sci-Fi",
-            duration=117,
-            rating=9,
-            description="Sci-fi horror",
-            price=9.99,
-        )
-
-        repo.create(movie)
-        db.commit()
+        # create / update_by_id / delete_by_id hacen su propio commit
+        movie = repo.create({
+            "title": "Alien",
+            "director": "Ridley Scott",
+            "year": 1979,
+            "genre": "Sci-Fi",
+            "duration": 117,
+            "rating": 9,
+            "description": "Sci-fi horror",
+            "price": 9.99,
+        })
         print("CREATED:", movie.id)
 
         fetched = repo.get_by_id(movie.id)
         print("FETCHED:", fetched.title)
 
-        fetched.rating = 10
-        repo.update(fetched)
-        db.commit()
-        print("UPDATED:", fetched.rating)
+        updated = repo.update_by_id(movie.id, {"rating": 10})
+        print("UPDATED:", updated.rating)
 
-        repo.delete(fetched)
-        db.commit()
+        repo.delete_by_id(movie.id)
         print("DELETED")
 
 if __name__ == "__main__":
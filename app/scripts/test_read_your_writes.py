@@ -0,0 +1,130 @@
+"""Read-your-writes con replicas y el cache de lecturas habilitado.
+
+Una replica "atrasada" es una copia del archivo SQLite hecha antes de la
+escritura. Despues de que un cliente modifica una pelicula, otro cliente la
+lee (y lista la pagina) desde la replica dentro de la ventana de lag: eso no
+puede quedar en el cache, porque la lectura siguiente del que escribio (con
+la cookie, pinneado al primario) pasaria primero por el cache. Tampoco
+puede sumarse, por el single-flight, a una lectura en curso de la replica.
+
+    python -m app.scripts.test_read_your_writes
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+# antes de importar la app: config y los indices en memoria se crean al importarse
+os.environ.setdefault("ENVIRONMENT", "testing")
+os.environ.setdefault("PERSIST_PATH", tempfile.gettempdir())
+os.environ["CACHE_ENABLED"] = "true"
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database.models import Base
+from app.core.database.replicas import ReplicaRouter, RoutingSession
+from app.core.database.repositories.movie_repository import MovieRepository, movie_cache, movie_flights
+
+MOVIE = {
+    "title": "Alien",
+    "director": "Ridley Scott",
+    "year": 1979,
+    "genre": "Sci-Fi",
+    "duration": 117,
+    "rating": 9,
+    "description": "Sci-fi horror",
+    "price": 9.99,
+}
+
+
+def check_flights(SessionLocal, id: int) -> None:
+    """Con una lectura de la replica en curso (retenida antes del SELECT), la
+    del cliente que escribio no la espera: hace su propia consulta al primario."""
+    if movie_flights is None:
+        return
+    release = threading.Event()
+    results = {}
+
+    def replica_read():
+        with SessionLocal() as other:
+            repo = MovieRepository(other)
+            get_by_id = repo.get_by_id
+            repo.get_by_id = lambda id: release.wait() and get_by_id(id)
+            results["replica"] = repo.read_by_id(id).title
+
+    def writer_read():
+        with SessionLocal() as writer:
+            writer.info["primary"] = True
+            results["writer"] = MovieRepository(writer).read_by_id(id).title
+
+    leader = threading.Thread(target=replica_read)
+    leader.start()
+    while not movie_flights.info()["in_flight"]:
+        time.sleep(0.01)
+    follower = threading.Thread(target=writer_read)
+    follower.start()
+    follower.join(timeout=5)
+    release.set()
+    leader.join()
+    assert results.get("writer") == "Aliens", "la lectura del que escribio se sumo a la de la replica"
+    print("FLIGHTS: replica", results["replica"], "/ writer", results["writer"])
+
+
+def main():
+    workdir = tempfile.mkdtemp()
+    primary_path = os.path.join(workdir, "primary.db")
+    replica_path = os.path.join(workdir, "replica.db")
+
+    engine = create_engine(f"sqlite:///{primary_path}")
+    Base.metadata.create_all(engine)
+    router = None
+    try:
+        with sessionmaker(bind=engine)() as setup:
+            movie = MovieRepository(setup).create(MOVIE)
+        # la replica queda con el estado previo a la escritura
+        shutil.copyfile(primary_path, replica_path)
+
+        router = ReplicaRouter([f"sqlite:///{replica_path}"], health_interval=0, max_lag_seconds=30)
+        router.start()
+        SessionLocal = sessionmaker(class_=RoutingSession, router=router, autoflush=False, bind=engine)
+        movie_cache.backend.clear()
+
+        # el cliente que escribe: request de escritura, va al primario
+        with SessionLocal() as writer:
+            writer.info["primary"] = True
+            MovieRepository(writer).update_by_id(movie.id, {"title": "Aliens"})
+        print("WRITE: Aliens")
+
+        # otro cliente lee de la replica atrasada mientras tanto
+        with SessionLocal() as other:
+            repo = MovieRepository(other)
+            stale = repo.read_by_id(movie.id)
+            rows, _ = repo.search_rows({}, limit=10)
+            many, _ = repo.get_many_rows([movie.id])
+            assert other.info.get("replica_read"), "la lectura no fue a la replica"
+            assert stale.title == rows[0]["title"] == many[0]["title"] == "Alien", "la replica no esta atrasada"
+        print("REPLICA READ:", stale.title)
+
+        check_flights(SessionLocal, movie.id)
+
+        # el que escribio vuelve con la cookie: su sesion va al primario, pero
+        # antes pasa por el cache
+        with SessionLocal() as writer:
+            writer.info["primary"] = True
+            repo = MovieRepository(writer)
+            fresh = repo.read_by_id(movie.id)
+            rows, _ = repo.search_rows({}, limit=10)
+            many, _ = repo.get_many_rows([movie.id])
+            assert fresh.title == rows[0]["title"] == many[0]["title"] == "Aliens", "el cache devolvio la fila de la replica"
+        print("WRITER READ:", fresh.title)
+    finally:
+        if router is not None:
+            router.close()
+        engine.dispose()
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()